@@ -1,4 +1,4 @@
-import RPi.GPIO as GPIO
+from hardware.backends import GPIO
 import time
 
 class GPIOSetup:
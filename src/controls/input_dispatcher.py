@@ -0,0 +1,191 @@
+import time
+import queue
+import logging
+import threading
+
+# Input event kinds
+ROTATE = "rotate"
+PRESS = "press"
+LONG_PRESS = "long_press"
+CALL = "call"  # a callable to run on the dispatcher thread, whatever the mode
+
+# Handlers slower than this are logged; they hold up every input behind them
+SLOW_HANDLER = 0.1
+
+
+class InputEvent:
+    __slots__ = ('kind', 'value', 'created_at', 'count')
+
+    def __init__(self, kind, value=None):
+        self.kind = kind
+        self.value = value
+        self.created_at = time.monotonic()
+        self.count = 1  # hardware events folded into this one
+
+
+class InputDispatcher:
+    """
+    Queue between the hardware threads and the UI handlers.
+
+    GPIO callbacks only post() a timestamped event, so a slow render, socket
+    emit or HTTP request in a handler never delays reading the encoder. One
+    dispatcher thread takes events in order and routes each to the handler
+    registered for its kind and the current mode. Rotations still queued
+    behind each other are folded into one event carrying the net number of
+    detents. call_soon()/call_later() run other UI work, such as the
+    trailing scroll of a ListScroller, on the same thread. stats() reports
+    queueing delay and handler time per kind.
+
+    enter_submode() overlays a sub-mode on the current mode, such as seek
+    scrubbing on a playback screen: events are routed to handlers
+    registered for "<mode>:<submode>" first. It ends with leave_submode(),
+    a mode change, or `timeout` seconds without input.
+    """
+
+    def __init__(self, get_mode, name="InputDispatcher"):
+        self.logger = logging.getLogger("InputDispatcher")
+        self.get_mode = get_mode
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._routes = {}  # (kind, mode) -> handler; mode None is the fallback for a kind
+        self._held = None  # event taken from the queue while coalescing, dispatched next
+        self._submode = None  # (name, mode it overlays, timeout, last input); dispatcher thread only
+        self._running = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def route(self, kind, mode, handler):
+        """Send `kind` events to `handler` while in `mode`; mode None handles every unrouted mode."""
+        self._routes[(kind, mode)] = handler
+
+    def enter_submode(self, name, timeout=None):
+        """Route input to "<mode>:<name>" handlers until left, the mode changes, or `timeout` idle seconds."""
+        mode = self.get_mode()
+        self._submode = (name, mode, timeout, time.monotonic())
+        self.logger.info(f"InputDispatcher: Entered '{name}' sub-mode of '{mode}'.")
+
+    def leave_submode(self):
+        if self._submode is not None:
+            self.logger.info(f"InputDispatcher: Left '{self._submode[0]}' sub-mode.")
+            self._submode = None
+
+    def _route_mode(self, mode, now):
+        """The route key for `mode`: "<mode>:<submode>" while a sub-mode is active on it."""
+        if self._submode is None:
+            return mode
+        name, submode_of, timeout, last_input = self._submode
+        if mode != submode_of or (timeout is not None and now - last_input > timeout):
+            self.leave_submode()
+            return mode
+        self._submode = (name, submode_of, timeout, now)
+        return f"{mode}:{name}"
+
+    def post(self, kind, value=None):
+        """Queue an input event; safe to call from any thread and never blocks."""
+        self._queue.put(InputEvent(kind, value))
+
+    def call_soon(self, callback):
+        """Run `callback()` on the dispatcher thread, in order with the input events."""
+        self.post(CALL, callback)
+
+    def call_later(self, delay, callback):
+        """Run `callback()` on the dispatcher thread after `delay` seconds."""
+        timer = threading.Timer(delay, self.call_soon, args=(callback,))
+        timer.daemon = True
+        timer.start()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._queue.put(None)
+
+    def _next_event(self):
+        if self._held is not None:
+            event, self._held = self._held, None
+            return event
+        return self._queue.get()
+
+    def _run(self):
+        while self._running:
+            event = self._next_event()
+            if event is None:
+                break
+            if event.kind == ROTATE:
+                event = self._coalesce(event)
+            self._dispatch(event)
+
+    def _coalesce(self, event):
+        """Fold rotations already waiting in the queue into `event`."""
+        while True:
+            try:
+                following = self._queue.get_nowait()
+            except queue.Empty:
+                return event
+            if following is None or following.kind != ROTATE:
+                self._held = following
+                if following is None:
+                    self._running = False
+                return event
+            event.value += following.value
+            event.count += 1
+
+    def _dispatch(self, event):
+        mode = self.get_mode()
+        if event.kind == CALL:
+            handler, args = event.value, ()
+        else:
+            route_mode = self._route_mode(mode, time.monotonic())
+            handler = (self._routes.get((event.kind, route_mode)) or self._routes.get((event.kind, mode))
+                       or self._routes.get((event.kind, None)))
+            args = () if event.value is None else (event.value,)
+        started = time.monotonic()
+        delay = started - event.created_at
+
+        if handler is None:
+            self.logger.warning(f"InputDispatcher: Unhandled mode: {mode}. No {event.kind} action performed.")
+        elif event.kind != ROTATE or event.value:
+            try:
+                handler(*args)
+            except Exception as e:
+                self.logger.exception(f"InputDispatcher: {event.kind} handler for mode '{mode}' failed: {e}")
+
+        handler_time = time.monotonic() - started
+        if handler_time > SLOW_HANDLER:
+            self.logger.warning(f"InputDispatcher: {event.kind} handler for mode '{mode}' took {handler_time * 1000:.0f} ms.")
+        self._record(event, delay, handler_time)
+
+    def _record(self, event, delay, handler_time):
+        with self._lock:
+            stats = self._stats.setdefault(event.kind, {'events': 0, 'dispatched': 0, 'delay_total': 0.0,
+                                                        'delay_max': 0.0, 'handler_total': 0.0, 'handler_max': 0.0})
+            stats['events'] += event.count
+            stats['dispatched'] += 1
+            stats['delay_total'] += delay
+            stats['delay_max'] = max(stats['delay_max'], delay)
+            stats['handler_total'] += handler_time
+            stats['handler_max'] = max(stats['handler_max'], handler_time)
+
+    def stats(self):
+        """Per kind: events posted, dispatches after coalescing, and avg/max queueing delay and handler time."""
+        with self._lock:
+            result = {}
+            for kind, stats in self._stats.items():
+                dispatched = stats['dispatched']
+                result[kind] = {
+                    'events': stats['events'],
+                    'dispatched': dispatched,
+                    'avg_delay': stats['delay_total'] / dispatched,
+                    'max_delay': stats['delay_max'],
+                    'avg_handler_time': stats['handler_total'] / dispatched,
+                    'max_handler_time': stats['handler_max'],
+                }
+            result['queued'] = self._queue.qsize()
+            return result
@@ -1,8 +1,28 @@
 import logging
 import time
-import RPi.GPIO as GPIO
+import threading
+from hardware.backends import GPIO
 from .gpio_setup_module import GPIOSetup  # Import the GPIO setup module
 
+# Quadrature steps indexed by (previous << 2) | current, with states encoded
+# as (CLK << 1) | DT. +1 is a clockwise transition, -1 counter-clockwise, 0 no
+# movement (a bounce back to the same state). None marks a jump over a state:
+# both lines changed between two reads, so a transition was missed.
+TRANSITIONS = (
+    0, -1, 1, None,
+    1, 0, None, -1,
+    -1, None, 0, 1,
+    None, 1, -1, 0,
+)
+STEPS_PER_DETENT = 4
+
+# Presses shorter than this are contact bounce
+BUTTON_DEBOUNCE = 0.03
+
+DECODER_INTERRUPT = "interrupt"
+DECODER_POLL = "poll"
+
+
 class RotaryControl:
     def __init__(
         self,
@@ -10,10 +30,18 @@ class RotaryControl:
         rotation_callback=None,
         button_callback=None,
         long_press_callback=None,
-        long_press_threshold=2.5  # Long press threshold in seconds
+        long_press_threshold=2.5,  # Long press threshold in seconds
+        decoder=DECODER_INTERRUPT,
+        poll_interval=0.01
     ):
         """
         Initializes the RotaryControl with GPIO setup already provided.
+
+        With the "interrupt" decoder, edges on CLK and DT feed a table-driven
+        quadrature state machine from RPi.GPIO's event thread and the button
+        is timed with a timer, so nothing runs while the knob is idle. The
+        "poll" decoder reads the pins every `poll_interval` seconds on its own
+        thread instead; it is kept for comparison (see stats()).
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs
@@ -26,6 +54,8 @@ class RotaryControl:
         self.button_callback = button_callback
         self.long_press_callback = long_press_callback
         self.long_press_threshold = long_press_threshold
+        self.decoder = decoder
+        self.poll_interval = poll_interval
 
         # Use GPIO pins from the provided gpio_setup
         self.CLK_PIN = self.gpio_setup.CLK_PIN
@@ -33,11 +63,30 @@ class RotaryControl:
         self.SW_PIN = self.gpio_setup.SW_PIN
 
         # Variables for rotary state
+        self._lock = threading.Lock()
         self.last_encoded = self._read_encoder()  # To track the previous state of CLK and DT
-        self.full_cycle = 0  # To track full quadrature cycles
-        self.button_last_state = self._read_button_state()  # Save the initial state of the button
+        self.full_cycle = 0  # Quadrature steps since the last detent
+
+        # Button state
+        self.button_pressed = False
+        self.press_started = None
+        self.long_press_fired = False
+        self.long_press_timer = None
+
+        self._running = False
+        self._poll_thread = None
+
+        # Counters for comparing decoders
+        self.edges = 0
+        self.transitions = 0
+        self.missed_transitions = 0
+        self.detents = 0
+        self.short_presses = 0
+        self.long_presses = 0
+        self.started_at = None
+        self.cpu_started_at = None
 
-        self.logger.debug("RotaryControl initialized using GPIO setup.")
+        self.logger.debug(f"RotaryControl initialized using GPIO setup ({self.decoder} decoder).")
 
     def _read_encoder(self):
         """Read the current state of the rotary encoder."""
@@ -50,65 +99,136 @@ class RotaryControl:
         return GPIO.input(self.SW_PIN)
 
     def start(self):
-        """Start listening to rotary events."""
-        self.logger.debug("RotaryControl started listening to rotary events.")
-        try:
-            # Read the initial encoder state
-            self.last_encoded = self._read_encoder()
-
-            while True:
-                # Read the current encoder state
-                current_encoded = self._read_encoder()
-
-                # Detect changes in state
-                if current_encoded != self.last_encoded:
-                    # Determine direction based on state transitions
-                    if (self.last_encoded == 0b00 and current_encoded == 0b10) or \
-                       (self.last_encoded == 0b10 and current_encoded == 0b11) or \
-                       (self.last_encoded == 0b11 and current_encoded == 0b01) or \
-                       (self.last_encoded == 0b01 and current_encoded == 0b00):
-                        self.full_cycle += 1  # Clockwise step
-                    elif (self.last_encoded == 0b00 and current_encoded == 0b01) or \
-                         (self.last_encoded == 0b01 and current_encoded == 0b11) or \
-                         (self.last_encoded == 0b11 and current_encoded == 0b10) or \
-                         (self.last_encoded == 0b10 and current_encoded == 0b00):
-                        self.full_cycle -= 1  # Counter-clockwise step
-
-                    # Register a single detent after a full cycle
-                    if abs(self.full_cycle) == 4:  # Full quadrature cycle detected
-                        direction = 1 if self.full_cycle > 0 else -1
-                        self.logger.debug(f"Scrolling in direction: {direction}")
-                        if self.rotation_callback:
-                            self.rotation_callback(direction)
-                        self.full_cycle = 0  # Reset cycle counter
-
-                    self.last_encoded = current_encoded  # Update last state
-
-                # Poll the button state
-                button_state = self._read_button_state()
-                if button_state == GPIO.LOW and self.button_last_state == GPIO.HIGH:
-                    press_start_time = time.time()
-                    while GPIO.input(self.SW_PIN) == GPIO.LOW:
-                        if time.time() - press_start_time > self.long_press_threshold:
-                            if self.long_press_callback:
-                                self.long_press_callback()
-                            break
-                    else:
-                        if time.time() - press_start_time < self.long_press_threshold:
-                            if self.button_callback:
-                                self.button_callback()
-
-                # Update the last state for the button
-                self.button_last_state = button_state
-
-                # Add a small delay to avoid CPU overuse
-                time.sleep(0.01)
-
-        except KeyboardInterrupt:
-            self.logger.info("RotaryControl terminated by user.")
-            self.stop()
+        """Start listening to rotary events; returns straight away."""
+        self.logger.debug(f"RotaryControl started listening to rotary events ({self.decoder} decoder).")
+        self._running = True
+        self.started_at = time.monotonic()
+        self.cpu_started_at = time.process_time()
+        self.last_encoded = self._read_encoder()
+        self.button_pressed = self._read_button_state() == GPIO.LOW
+
+        if self.decoder == DECODER_POLL:
+            self._poll_thread = threading.Thread(target=self._poll_loop, name="RotaryPoll", daemon=True)
+            self._poll_thread.start()
+            return
+
+        # No bouncetime on the encoder: the state table absorbs bounce, and
+        # RPi.GPIO's bouncetime would drop real transitions on fast turns
+        GPIO.add_event_detect(self.CLK_PIN, GPIO.BOTH, callback=self._on_encoder_edge)
+        GPIO.add_event_detect(self.DT_PIN, GPIO.BOTH, callback=self._on_encoder_edge)
+        GPIO.add_event_detect(self.SW_PIN, GPIO.BOTH, callback=self._on_button_edge)
+
+    def _on_encoder_edge(self, channel):
+        self.edges += 1
+        self._update_encoder(self._read_encoder())
+
+    def _update_encoder(self, current_encoded):
+        """Feed one encoder state into the quadrature state machine."""
+        with self._lock:
+            step = TRANSITIONS[(self.last_encoded << 2) | current_encoded]
+            self.last_encoded = current_encoded
+            if step is None:
+                self.missed_transitions += 1
+                return
+            if step == 0:
+                return
+            self.transitions += 1
+            self.full_cycle += step
+
+            # Register a single detent after a full cycle
+            if abs(self.full_cycle) < STEPS_PER_DETENT:
+                return
+            direction = 1 if self.full_cycle > 0 else -1
+            self.full_cycle = 0
+            self.detents += 1
+
+        self.logger.debug(f"Scrolling in direction: {direction}")
+        if self.rotation_callback:
+            self.rotation_callback(direction)
+
+    def _on_button_edge(self, channel):
+        self.edges += 1
+        self._update_button(self._read_button_state())
+
+    def _update_button(self, button_state):
+        """Track press and release; long presses fire from a timer while the button is still held."""
+        now = time.monotonic()
+        with self._lock:
+            if button_state == GPIO.LOW and not self.button_pressed:
+                self.button_pressed = True
+                self.press_started = now
+                self.long_press_fired = False
+                self.long_press_timer = threading.Timer(self.long_press_threshold, self._on_long_press_timer)
+                self.long_press_timer.daemon = True
+                self.long_press_timer.start()
+                return
+            if button_state != GPIO.HIGH or not self.button_pressed:
+                return
+            self.button_pressed = False
+            if self.long_press_timer:
+                self.long_press_timer.cancel()
+                self.long_press_timer = None
+            if self.long_press_fired or now - self.press_started < BUTTON_DEBOUNCE:
+                return
+            self.short_presses += 1
+
+        if self.button_callback:
+            self.button_callback()
+
+    def _on_long_press_timer(self):
+        with self._lock:
+            # Released (or released and pressed again) before the timer ran
+            if not self.button_pressed or self.long_press_fired:
+                return
+            if GPIO.input(self.SW_PIN) != GPIO.LOW:
+                return
+            self.long_press_fired = True
+            self.long_press_timer = None
+            self.long_presses += 1
+
+        self.logger.debug("Long button press detected.")
+        if self.long_press_callback:
+            self.long_press_callback()
+
+    def _poll_loop(self):
+        """The polling decoder: same state machine, fed every poll_interval seconds."""
+        while self._running:
+            current_encoded = self._read_encoder()
+            if current_encoded != self.last_encoded:
+                self._update_encoder(current_encoded)
+
+            button_state = self._read_button_state()
+            if (button_state == GPIO.LOW) != self.button_pressed:
+                self._update_button(button_state)
+
+            # Add a small delay to avoid CPU overuse
+            time.sleep(self.poll_interval)
+
+    def stats(self):
+        """Decoder counters and the process CPU share since start(), for comparing decoders."""
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        cpu = time.process_time() - self.cpu_started_at if self.cpu_started_at is not None else 0.0
+        return {
+            'decoder': self.decoder,
+            'edges': self.edges,
+            'transitions': self.transitions,
+            'missed_transitions': self.missed_transitions,
+            'detents': self.detents,
+            'short_presses': self.short_presses,
+            'long_presses': self.long_presses,
+            'cpu_percent': 100.0 * cpu / elapsed if elapsed else 0.0,
+        }
 
     def stop(self):
         """Cleans up GPIO resources using the GPIOSetup instance."""
+        self._running = False
+        if self.long_press_timer:
+            self.long_press_timer.cancel()
+        if self.decoder == DECODER_INTERRUPT:
+            for pin in (self.CLK_PIN, self.DT_PIN, self.SW_PIN):
+                try:
+                    GPIO.remove_event_detect(pin)
+                except RuntimeError:
+                    pass
         self.gpio_setup.cleanup()
         self.logger.info("GPIO cleanup complete.")
@@ -0,0 +1,232 @@
+# src/controls/testing/input_latency_benchmark.py
+#
+# Measures input latency without a Pi, on the simulated GPIO and MCP23017
+# backends (QUADIFY_FAKE_HARDWARE=1, set here before anything is imported).
+#
+# Rotary: FakeRotaryEncoder turns one detent at a time through RotaryControl
+# and the InputDispatcher to a volume handler. Buttons: the MCP23017 model
+# closes a matrix switch and ButtonsLEDController scans it (on its INTB
+# interrupt, or by polling with --buttons poll) and emits 'next'. Every
+# emit goes to a fake socket that schedules a redraw taking --render-ms on a
+# render thread. Latency is reported from the last edge of each input to
+# the handler, the emit and the rendered frame.
+#
+# Usage (from the src directory):
+#   python -m controls.testing.input_latency_benchmark
+#   python -m controls.testing.input_latency_benchmark --turns 200 --presses 50 --render-ms 15 --buttons poll
+
+import os
+import sys
+import time
+import queue
+import argparse
+import tempfile
+import threading
+
+os.environ["QUADIFY_FAKE_HARDWARE"] = "1"
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from hardware import fake_gpio, fake_smbus
+from hardware.fake_gpio import FakeRotaryEncoder
+from hardware.fake_smbus import FakeMCP23017, PORT_B
+from controls.gpio_setup_module import GPIOSetup
+from controls.rotary_control import RotaryControl
+from controls.input_dispatcher import InputDispatcher, ROTATE, PRESS
+from hardware.buttonsleds import ButtonsLEDController
+
+MCP23017_ADDRESS = 0x20
+INTB_PIN = 17
+# Button 3 ('next') sits on matrix row 1 (GPB3) and column 0 (GPB0)
+NEXT_BUTTON = (8, 11)
+
+
+class FakeSignal:
+    def connect(self, receiver):
+        pass
+
+
+class Timeline:
+    """Timestamps of one input as it moves through the pipeline."""
+
+    def __init__(self):
+        self.marks = {}
+        self.done = threading.Event()
+
+    def mark(self, stage):
+        self.marks.setdefault(stage, time.monotonic())
+        if stage == 'frame':
+            self.done.set()
+
+
+class FakeRenderer:
+    """Render thread: each request takes render_ms, like drawing and pushing an OLED frame."""
+
+    def __init__(self, render_ms):
+        self.render_seconds = render_ms / 1000.0
+        self._requests = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def request(self, timeline):
+        self._requests.put(timeline)
+
+    def _run(self):
+        while True:
+            timeline = self._requests.get()
+            time.sleep(self.render_seconds)
+            timeline.mark('frame')
+
+
+class FakeSocket:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.timeline = None
+        self.emits = 0
+
+    def emit(self, event, *args, **kwargs):
+        self.emits += 1
+        timeline = self.timeline
+        if timeline:
+            timeline.mark('emit')
+            self.renderer.request(timeline)
+
+
+class FakeVolumioListener:
+    def __init__(self, socket):
+        self.socketIO = socket
+        self.status_changed = FakeSignal()
+        self.connected = FakeSignal()
+        self.disconnected = FakeSignal()
+
+    def play(self):
+        self.socketIO.emit('play')
+
+    def pause(self):
+        self.socketIO.emit('pause')
+
+    def toggle_repeat(self):
+        self.socketIO.emit('setRepeat')
+
+    def toggle_random(self):
+        self.socketIO.emit('setRandom')
+
+
+def run_one(socket, action, timeout=2.0):
+    timeline = Timeline()
+    socket.timeline = timeline
+    timeline.marks['edge'] = action()
+    if not timeline.done.wait(timeout):
+        return None
+    return timeline
+
+
+def measure_rotary(socket, turns, step_interval, bounce):
+    encoder = FakeRotaryEncoder(13, 5, 6)
+    dispatcher = InputDispatcher(lambda: "playback")
+
+    def on_rotate(steps):
+        socket.timeline.mark('handler')
+        socket.emit('volume', '+' if steps > 0 else '-')
+
+    dispatcher.route(ROTATE, "playback", on_rotate)
+    dispatcher.route(PRESS, "playback", lambda: None)
+    dispatcher.start()
+    rotary = RotaryControl(gpio_setup=GPIOSetup(13, 5, 6),
+                           rotation_callback=lambda direction: dispatcher.post(ROTATE, direction),
+                           button_callback=lambda: dispatcher.post(PRESS))
+    rotary.start()
+
+    timelines = []
+    for n in range(turns):
+        direction = 1 if n % 2 == 0 else -1
+        timelines.append(run_one(socket, lambda: encoder.turn(direction, step_interval, bounce)))
+        fake_gpio.board.wait_idle()
+
+    rotary.stop()
+    dispatcher.stop()
+    return timelines, rotary.stats()
+
+
+def measure_buttons(socket, presses, interrupt, transaction_time):
+    fake_smbus.TRANSACTION_TIME = transaction_time
+    mcp = fake_smbus.attach(MCP23017_ADDRESS, FakeMCP23017())
+    fake_gpio.setmode(fake_gpio.BCM)
+    fake_gpio.setup(INTB_PIN, fake_gpio.IN, pull_up_down=fake_gpio.PUD_UP)
+    mcp.wire_interrupt(PORT_B, lambda active: fake_gpio.board.set_level(INTB_PIN, 0 if active else 1))
+
+    config_dir = tempfile.mkdtemp(prefix="quadify-latency-")
+    config_path = os.path.join(config_dir, "config.yaml")
+    with open(config_path, "w") as f:
+        f.write(f"mcp23017_address: {MCP23017_ADDRESS}\n")
+        if interrupt:
+            f.write(f"mcp23017_intb_pin: {INTB_PIN}\n")
+
+    controller = ButtonsLEDController(FakeVolumioListener(socket), config_path=config_path)
+    controller.start()
+    time.sleep(0.2)
+
+    idle_before = controller.bus.transactions
+    time.sleep(1.0)
+    idle_transactions = controller.bus.transactions - idle_before
+
+    def press():
+        mcp.press(*NEXT_BUTTON)
+        return time.monotonic()
+
+    timelines = []
+    for _ in range(presses):
+        timelines.append(run_one(socket, press))
+        mcp.release(*NEXT_BUTTON)
+        time.sleep(0.15)  # let the scan burst see the release
+
+    controller.stop()
+    os.unlink(config_path)
+    os.rmdir(config_dir)
+    return timelines, idle_transactions
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(name, timelines, stages):
+    done = [t for t in timelines if t is not None]
+    print(f"{name}: {len(done)}/{len(timelines)} inputs reached a frame")
+    if not done:
+        return
+    print(f"  {'edge to':<10} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for stage in stages:
+        values = [(t.marks[stage] - t.marks['edge']) * 1000 for t in done if stage in t.marks]
+        if values:
+            print(f"  {stage:<10} {percentile(values, 0.5):>8.2f} {percentile(values, 0.95):>8.2f} {max(values):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Input latency on simulated GPIO and MCP23017 backends.")
+    parser.add_argument("--turns", type=int, default=100, help="Rotary detents to measure.")
+    parser.add_argument("--presses", type=int, default=30, help="Button presses to measure.")
+    parser.add_argument("--render-ms", type=float, default=10.0, help="Simulated time to render a frame.")
+    parser.add_argument("--step-interval", type=float, default=0.001, help="Seconds between quadrature edges.")
+    parser.add_argument("--bounce", type=int, default=0, help="Contact bounce toggles per encoder edge.")
+    parser.add_argument("--buttons", choices=["interrupt", "poll"], default="interrupt",
+                        help="Button scanning mode of ButtonsLEDController.")
+    parser.add_argument("--i2c-ms", type=float, default=0.3, help="Simulated time of one I2C transaction.")
+    args = parser.parse_args()
+
+    socket = FakeSocket(FakeRenderer(args.render_ms))
+
+    timelines, rotary_stats = measure_rotary(socket, args.turns, args.step_interval, args.bounce)
+    report("rotary", timelines, ('handler', 'emit', 'frame'))
+    print(f"  detents {rotary_stats['detents']}, missed transitions {rotary_stats['missed_transitions']}")
+
+    timelines, idle_transactions = measure_buttons(socket, args.presses, args.buttons == "interrupt",
+                                                   args.i2c_ms / 1000.0)
+    report(f"buttons ({args.buttons})", timelines, ('emit', 'frame'))
+    print(f"  idle I2C transactions per second: {idle_transactions}")
+
+
+if __name__ == "__main__":
+    main()
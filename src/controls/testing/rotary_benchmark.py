@@ -0,0 +1,61 @@
+# src/controls/testing/rotary_benchmark.py
+#
+# Compares the interrupt and polling rotary decoders on the Pi: process CPU
+# while the knob is idle, and detents versus missed quadrature transitions
+# while it is turned. Stop Quadify first, since both need the GPIO pins.
+#
+# Each decoder runs for two phases: an idle phase (leave the knob alone) and
+# a spin phase (turn the knob fast, back and forth, for the whole phase).
+#
+# Usage (from the src directory):
+#   python -m controls.testing.rotary_benchmark
+#   python -m controls.testing.rotary_benchmark --idle 30 --spin 15 --decoder poll
+
+import os
+import sys
+import time
+import argparse
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from controls.gpio_setup_module import GPIOSetup
+from controls.rotary_control import RotaryControl, DECODER_INTERRUPT, DECODER_POLL
+
+
+def run_phase(decoder, seconds, prompt, pins):
+    rotary = RotaryControl(gpio_setup=GPIOSetup(*pins), decoder=decoder)
+    input(f"[{decoder}] {prompt} for {seconds}s; press Enter to start.")
+    rotary.start()
+    time.sleep(seconds)
+    stats = rotary.stats()
+    rotary.stop()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle CPU and missed steps of the rotary decoders.")
+    parser.add_argument("--decoder", choices=[DECODER_INTERRUPT, DECODER_POLL], action="append",
+                        help="Decoder(s) to measure; both by default.")
+    parser.add_argument("--idle", type=float, default=20.0, help="Seconds of the idle phase.")
+    parser.add_argument("--spin", type=float, default=10.0, help="Seconds of the spin phase.")
+    parser.add_argument("--pins", type=int, nargs=3, default=[13, 5, 6], metavar=("CLK", "DT", "SW"))
+    args = parser.parse_args()
+
+    results = []
+    for decoder in args.decoder or [DECODER_INTERRUPT, DECODER_POLL]:
+        idle = run_phase(decoder, args.idle, "Leave the knob alone", args.pins)
+        spin = run_phase(decoder, args.spin, "Spin the knob fast, back and forth,", args.pins)
+        results.append((decoder, idle, spin))
+
+    print(f"{'decoder':<10} {'idle cpu':>9} {'spin cpu':>9} {'edges':>7} {'detents':>8} {'missed':>7} {'missed %':>9}")
+    for decoder, idle, spin in results:
+        steps = spin['transitions'] + spin['missed_transitions']
+        missed = 100.0 * spin['missed_transitions'] / steps if steps else 0.0
+        print(f"{decoder:<10} {idle['cpu_percent']:8.2f}% {spin['cpu_percent']:8.2f}% {spin['edges']:>7} "
+              f"{spin['detents']:>8} {spin['missed_transitions']:>7} {missed:8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,18 @@ import logging
 from PIL import Image, ImageDraw, ImageFont
 import threading
 import time
-import os
 
-FIFO_PATH = "/tmp/display.fifo"  # Path to the FIFO for CAVA
+from display.spectrum_source import SpectrumSource
 
 class ModernScreen(BaseManager):
-    def __init__(self, display_manager, volumio_listener, mode_manager):
+    def __init__(self, display_manager, volumio_listener, mode_manager, spectrum_source=None):
         super().__init__(display_manager, volumio_listener, mode_manager)
         self.mode_name = "modern"  # Use "modern" to align with ModeManager's state
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.DEBUG)
         self.spectrum_bars = []
-        self.running_spectrum = False
-        self.spectrum_thread = None
+        # The CAVA FIFO is shared with other spectrum consumers (the LED VU meter)
+        self.spectrum_source = spectrum_source or SpectrumSource()
 
         # Fonts
         self.font_title = self.display_manager.fonts.get('song_font', ImageFont.load_default())
@@ -32,7 +31,8 @@ class ModernScreen(BaseManager):
 
         # State attributes
         self.latest_state = None
-        self.current_state = None  # Persistent current state
+        self.current_state = None  # Persistent current state (immutable PlaybackState)
+        self.current_seek = 0  # Locally advanced seek in ms, since the shared state is never mutated
         self.state_lock = threading.Lock()
         self.update_event = threading.Event()
         self.stop_event = threading.Event()
@@ -42,26 +42,17 @@ class ModernScreen(BaseManager):
         self.update_thread.start()
         self.logger.info("ModernScreen: Started background update thread.")
 
-        # Volumio state change listener
-        self.volumio_listener.state_changed.connect(self.on_volumio_state_change)
+        # Volumio change listeners; pushes that change nothing are skipped
+        self._last_state_seen = None
+        for signal in (self.volumio_listener.volume_changed, self.volumio_listener.status_changed,
+                       self.volumio_listener.track_changed, self.volumio_listener.format_changed,
+                       self.volumio_listener.seek_changed):
+            signal.connect(self.on_volumio_state_change)
         self.logger.info("ModernScreen initialized.")
 
-    def _read_fifo(self):
-        """Read spectrum data from FIFO."""
-        if not os.path.exists(FIFO_PATH):
-            self.logger.error(f"FIFO {FIFO_PATH} does not exist.")
-            return
-
-        self.logger.info("Starting spectrum visualisation thread.")
-        try:
-            with open(FIFO_PATH, "r") as fifo:
-                while self.running_spectrum:
-                    line = fifo.readline().strip()
-                    if line:
-                        bars = [int(x) for x in line.split(";") if x.isdigit()]
-                        self.spectrum_bars = bars
-        except Exception as e:
-            self.logger.error(f"Error reading spectrum data: {e}")
+    def _on_spectrum(self, bars):
+        """Latest spectrum frame from the shared FIFO reader."""
+        self.spectrum_bars = bars
 
     def _draw_spectrum(self, draw):
         """Draw spectrum bars on the screen."""
@@ -116,26 +107,32 @@ class ModernScreen(BaseManager):
                 if triggered:
                     # State change received, update current_state
                     if self.latest_state:
-                        self.current_state = self.latest_state.copy()
+                        previous_state = self.current_state
+                        self.current_state = self.latest_state
+                        # Predicted states repeat the last pushed seek; only a new value resets progress
+                        if previous_state is None or self.current_state.seek != previous_state.seek:
+                            self.current_seek = self.current_state.seek
+                            last_update_time = time.time()  # Reset time for smooth progress
                         self.latest_state = None
-                        last_update_time = time.time()  # Reset time for smooth progress
                         self.update_event.clear()
                 elif self.current_state and "seek" in self.current_state and "duration" in self.current_state:
                     # Simulate seek progress
                     elapsed_time = time.time() - last_update_time
-                    self.current_state["seek"] += int(elapsed_time * 1000)  # Increment seek by elapsed ms
+                    self.current_seek += int(elapsed_time * 1000)  # Increment seek by elapsed ms
                     last_update_time = time.time()
 
             # Check if mode_manager mode is 'modern'
             if self.is_active and self.mode_manager.get_mode() == "modern" and self.current_state:
                 self.logger.debug("ModernScreen: Redrawing playback screen.")
-                self.draw_display(self.current_state)
+                self.draw_display(self.current_state, seek_ms=self.current_seek)
 
-    def draw_display(self, data):
+    def draw_display(self, data, seek_ms=None):
         """Draw the ModernScreen display with smooth and continuous scrolling."""
         if data is None:
             self.logger.warning("ModernScreen: No data provided for display.")
             return
+        # Show pending user intents (volume, play/pause) ahead of Volumio's echo
+        data = self.volumio_listener.optimistic.apply(data)
 
         base_image = Image.new("RGB", self.display_manager.oled.size, "black")
         draw = ImageDraw.Draw(base_image)
@@ -144,15 +141,15 @@ class ModernScreen(BaseManager):
         self._draw_spectrum(draw)
 
         # Extract information
-        song_title = data.get("title", "Unknown Title")
-        artist_name = data.get("artist", "Unknown Artist")
-        seek = data.get("seek", 0) / 1000  # Convert from ms to seconds
-        duration = data.get("duration", 1)  # Avoid division by zero
+        song_title = data.title or "Unknown Title"
+        artist_name = data.artist or "Unknown Artist"
+        seek = (data.seek if seek_ms is None else seek_ms) / 1000  # Convert from ms to seconds
+        duration = data.duration or 1  # Avoid division by zero
         progress = max(0, min(seek / duration, 1))
-        service = data.get("service", "default")
-        samplerate = data.get("samplerate", "N/A")
-        bitdepth = data.get("bitdepth", "N/A")
-        volume = data.get("volume", 50)
+        service = data.service or "default"
+        samplerate = data.samplerate or "N/A"
+        bitdepth = data.bitdepth or "N/A"
+        volume = data.volume
 
         # Convert seek and duration to mm:ss format
         current_minutes = int(seek // 60)
@@ -233,7 +230,7 @@ class ModernScreen(BaseManager):
         draw.line([indicator_x, progress_y - 2, indicator_x, progress_y + 2], fill="white", width=1)
 
         # Track type icon
-        track_type = data.get('trackType', 'default')
+        track_type = data.track_type or 'default'
         right_icon = self.display_manager.icons.get(track_type, self.display_manager.default_icon)
         right_icon = right_icon.resize((16, 16), Image.LANCZOS)
         right_icon_x = progress_x + progress_width + 15
@@ -244,8 +241,13 @@ class ModernScreen(BaseManager):
         self.display_manager.oled.display(base_image)
         self.logger.info("Updated display with playback details and spectrum visualisation.")
 
-    def on_volumio_state_change(self, sender, state):
+    def on_volumio_state_change(self, sender, state=None, **kwargs):
         """Handle state changes from Volumio."""
+        # One push can fire several change signals; handle it once
+        if state is None or state is self._last_state_seen:
+            return
+        self._last_state_seen = state
+
         # Process only if active and mode is 'modern'
         if not self.is_active or self.mode_manager.get_mode() != "modern":
             self.logger.debug("ModernScreen: Ignoring state change; not active or wrong mode.")
@@ -256,6 +258,25 @@ class ModernScreen(BaseManager):
             self.latest_state = state
         self.update_event.set()
 
+    def adjust_volume(self, volume_change):
+        """Adjust the volume; detents are coalesced into absolute volume commands by the listener."""
+        new_volume = self.volumio_listener.change_volume(volume_change)
+        self.logger.debug(f"ModernScreen: Volume target is now {new_volume}.")
+
+    def scrub(self, seconds):
+        """Move the playback position by `seconds`; the progress bar jumps to the target at once."""
+        position = self.volumio_listener.change_seek(seconds)
+        with self.state_lock:
+            self.current_seek = position * 1000
+        self.logger.debug(f"ModernScreen: Seek target is now {position}s.")
+
+    def toggle_play_pause(self):
+        """Toggle playback; the new status is drawn before Volumio confirms it."""
+        if not self.volumio_listener.is_connected():
+            self.logger.warning("ModernScreen: Cannot toggle playback - not connected to Volumio.")
+            return
+        self.volumio_listener.toggle_play_pause()
+
     def start_mode(self):
         """Activate ModernScreen mode with spectrum visualisation."""
         if self.mode_manager.get_mode() != "modern":
@@ -265,12 +286,9 @@ class ModernScreen(BaseManager):
         self.is_active = True
         self.reset_scrolling()
 
-        # Start spectrum thread
-        if not self.spectrum_thread or not self.spectrum_thread.is_alive():
-            self.running_spectrum = True
-            self.spectrum_thread = threading.Thread(target=self._read_fifo, daemon=True)
-            self.spectrum_thread.start()
-            self.logger.info("Spectrum thread started.")
+        # Receive spectrum frames
+        self.spectrum_source.add_listener(self._on_spectrum)
+        self.logger.info("Spectrum listener added.")
 
         # Ensure update thread is running
         if not self.update_thread.is_alive():
@@ -287,11 +305,9 @@ class ModernScreen(BaseManager):
         self.is_active = False
         self.stop_event.set()
 
-        # Stop spectrum thread
-        self.running_spectrum = False
-        if self.spectrum_thread and self.spectrum_thread.is_alive():
-            self.spectrum_thread.join(timeout=1)
-            self.logger.info("Spectrum thread stopped.")
+        # Stop receiving spectrum frames
+        self.spectrum_source.remove_listener(self._on_spectrum)
+        self.logger.info("Spectrum listener removed.")
 
         # Stop update thread
         if self.update_thread.is_alive():
@@ -9,7 +9,6 @@ import hashlib
 import os
 import threading
 import time
-import re
 
 class OriginalScreen(BaseManager):
     def __init__(self, display_manager, volumio_listener, mode_manager):
@@ -31,21 +30,29 @@ class OriginalScreen(BaseManager):
         self.update_thread.start()
         self.logger.info("OriginalScreen: Started background update thread.")
 
-        # Register a callback for Volumio state changes
-        self.volumio_listener.state_changed.connect(self.on_volumio_state_change)
+        # Register for the changes this screen renders; seek-only pushes are ignored
+        self._last_state_seen = None
+        for signal in (self.volumio_listener.volume_changed, self.volumio_listener.status_changed,
+                       self.volumio_listener.track_changed, self.volumio_listener.format_changed):
+            signal.connect(self.on_volumio_state_change)
         self.logger.info("OriginalScreen initialized.")
 
-    def on_volumio_state_change(self, sender, state):
+    def on_volumio_state_change(self, sender, state=None, **kwargs):
         """
         Callback to handle state changes from VolumioListener.
         Only process state changes when this manager is active and the mode is 'original'.
         """
+        # One push can fire several change signals; handle it once
+        if state is None or state is self._last_state_seen:
+            return
+        self._last_state_seen = state
+
         if not self.is_active or self.mode_manager.get_mode() != "original":
             self.logger.debug("OriginalScreen: Ignoring state change since not active or not in 'original' mode.")
             return
 
         # Check if the service is webradio, and ignore it in OriginalScreen
-        if state.get("service", "").lower() == "webradio":
+        if state.service == "webradio":
             self.logger.debug("OriginalScreen: Ignoring state change for webradio service.")
             return
 
@@ -87,29 +94,15 @@ class OriginalScreen(BaseManager):
     def adjust_volume(self, volume_change):
         """
         Adjust the volume based on the volume_change parameter.
+        Detents are coalesced into absolute volume commands by the listener.
         """
-        if self.latest_state is None:
-            self.logger.warning("[OriginalScreen] latest_state is None, initializing with default volume of 100.")
-            self.latest_state = {"volume": 100}
-
-        with self.state_lock:
-            current_volume = self.latest_state.get("volume", 100)
-            new_volume = max(0, min(int(current_volume) + volume_change, 100))
+        new_volume = self.volumio_listener.change_volume(volume_change)
+        self.logger.debug(f"OriginalScreen: Volume target is now {new_volume}.")
 
-        self.logger.info(f"OriginalScreen: Adjusting volume from {current_volume} to {new_volume}.")
-
-        try:
-            if volume_change > 0:
-                self.volumio_listener.socketIO.emit("volume", "+")
-                self.logger.info("OriginalScreen: Emitted volume increase command.")
-            elif volume_change < 0:
-                self.volumio_listener.socketIO.emit("volume", "-")
-                self.logger.info("OriginalScreen: Emitted volume decrease command.")
-            else:
-                self.volumio_listener.socketIO.emit("volume", new_volume)
-                self.logger.info(f"OriginalScreen: Emitted volume set command with value {new_volume}.")
-        except Exception as e:
-            self.logger.error(f"OriginalScreen: Failed to adjust volume - {e}")
+    def scrub(self, seconds):
+        """Move the playback position by `seconds`; detents are coalesced into seeks by the listener."""
+        position = self.volumio_listener.change_seek(seconds)
+        self.logger.debug(f"OriginalScreen: Seek target is now {position}s.")
 
     def display_playback_info(self):
         """Initialize playback display based on the current state."""
@@ -120,10 +113,12 @@ class OriginalScreen(BaseManager):
             self.logger.warning("OriginalScreen: No current state available to display.")
 
     def draw_display(self, data):
-        """Draw the display based on the Volumio state."""
-        track_type = data.get("trackType", "").lower()
-        service = data.get("service", "").lower()
-        status = data.get("status", "").lower()
+        """Draw the display based on the Volumio PlaybackState."""
+        # Show pending user intents (volume, play/pause) ahead of Volumio's echo
+        data = self.volumio_listener.optimistic.apply(data)
+        track_type = data.track_type
+        service = data.service
+        status = data.status
 
         # Determine current_service
         if service == "mpd":
@@ -149,8 +144,7 @@ class OriginalScreen(BaseManager):
         draw = ImageDraw.Draw(base_image)
 
         # Draw volume indicator
-        volume = max(0, min(int(data.get("volume", 0)), 100))
-        filled_squares = round((volume / 100) * 6)
+        filled_squares = round((data.volume / 100) * 6)
         square_size = 3
         row_spacing = 5
         padding_bottom = 6
@@ -168,33 +162,15 @@ class OriginalScreen(BaseManager):
         self.logger.info("OriginalScreen: Display updated.")
 
     def draw_general_playback(self, draw, base_image, data, current_service):
-        samplerate = data.get("samplerate", "")
         self.logger.debug(f"Received data: {data}")
 
-        # Parse sample rate
-        try:
-            if samplerate:
-                match = re.match(r"([\d\.]+)\s*(\w+)", samplerate)
-                if match:
-                    sample_rate_value = float(match.group(1))
-                    sample_rate_unit_text = match.group(2).lower()
-                    sample_rate_num = int(sample_rate_value)
-                else:
-                    raise ValueError("Sample rate format is unexpected")
-            else:
-                raise ValueError("Empty samplerate string")
-        except (ValueError, IndexError) as e:
-            self.logger.warning(f"OriginalScreen: Failed to parse sample rate: '{samplerate}' - Error: {e}")
-            sample_rate_num = "N/A"
-            sample_rate_unit_text = ""
-
-        # Normalize the unit text
-        if sample_rate_unit_text in ["khz", "hz"]:
-            sample_rate_unit_text = sample_rate_unit_text.upper()
-        elif sample_rate_unit_text == "kbps":
-            sample_rate_unit_text = "kbps"
+        # Sample rate is parsed once per push by PlaybackState
+        if data.samplerate_value is not None:
+            sample_rate_num = int(data.samplerate_value)
         else:
-            sample_rate_unit_text = "kHz"  # default fallback
+            self.logger.debug(f"OriginalScreen: No parsable sample rate in '{data.samplerate}'.")
+            sample_rate_num = "N/A"
+        sample_rate_unit_text = data.samplerate_unit
 
         sample_rate_num_text = str(sample_rate_num)
         font_sample_num = self.display_manager.fonts.get('sample_rate', ImageFont.load_default())
@@ -244,7 +220,7 @@ class OriginalScreen(BaseManager):
                 self.logger.warning("OriginalScreen: No default icon available.")
 
         # Draw Bit Depth
-        bitdepth = data.get("bitdepth", "N/A")
+        bitdepth = data.bitdepth or "N/A"
         format_bitdepth_text = f"{bitdepth}"
         font_info = self.display_manager.fonts.get('playback_small', ImageFont.load_default())
         padding = 15
@@ -296,7 +272,7 @@ class OriginalScreen(BaseManager):
             return
 
         try:
-            self.volumio_listener.socketIO.emit("toggle", {})
+            self.volumio_listener.toggle_play_pause()
             self.logger.debug("OriginalScreen: 'toggle' event emitted successfully.")
         except Exception as e:
             self.logger.error(f"OriginalScreen: Failed to emit 'toggle' event - {e}")
@@ -306,9 +282,9 @@ class OriginalScreen(BaseManager):
         """Update the playback metrics (sample rate, bit depth, and volume) on the display."""
         self.logger.info("OriginalScreen: Updating playback metrics display.")
 
-        sample_rate = state.get("samplerate", "Unknown Sample Rate")
-        bitdepth = state.get("bitdepth", "Unknown Bit Depth")
-        volume = state.get("volume", "Unknown Volume")
+        sample_rate = state.samplerate or "Unknown Sample Rate"
+        bitdepth = state.bitdepth or "Unknown Bit Depth"
+        volume = state.volume
 
         # Update internal state variables or trigger a refresh of the display
         self.latest_sample_rate = sample_rate
@@ -41,14 +41,19 @@ class CavaOLEDDisplayCircular(BaseManager):
 
         # Create rotating file handler for detailed logs
         log_file = os.path.join('/home/volumio/Quadify/logs', 'cava_oled_display_circular.log')  # Adjust path as needed
-        file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=3)  # 5MB per file, 3 backups
-        file_handler.setLevel(logging.INFO)  # Capture all logs in the file
-        file_handler.setFormatter(formatter)
+        try:
+            file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=3)  # 5MB per file, 3 backups
+            file_handler.setLevel(logging.INFO)  # Capture all logs in the file
+            file_handler.setFormatter(formatter)
+        except OSError:
+            # Log directory missing (e.g. benchmarking off the Pi); console logging only
+            file_handler = None
 
         # Add handlers to the logger
         if not self.logger.handlers:
             self.logger.addHandler(console_handler)
-            self.logger.addHandler(file_handler)
+            if file_handler:
+                self.logger.addHandler(file_handler)
 
         self.logger.info("CavaOLEDDisplayCircular initialized.")
 
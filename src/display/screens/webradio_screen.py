@@ -40,13 +40,21 @@ class WebRadioScreen(BaseManager):
         self.update_thread.start()
         self.logger.info("WebRadioScreen: Started background update thread.")
 
-        # Register a callback for Volumio state changes
-        self.volumio_listener.state_changed.connect(self.on_volumio_state_change)
+        # Register for the changes this screen renders; seek-only pushes are ignored
+        self._last_state_seen = None
+        for signal in (self.volumio_listener.volume_changed, self.volumio_listener.status_changed,
+                       self.volumio_listener.track_changed, self.volumio_listener.format_changed):
+            signal.connect(self.on_volumio_state_change)
         self.logger.info("WebRadioScreen initialized.")
 
-    def on_volumio_state_change(self, sender, state):
+    def on_volumio_state_change(self, sender, state=None, **kwargs):
         """Handle state changes from Volumio."""
-        if state.get("service", "").lower() != "webradio":
+        # One push can fire several change signals; handle it once
+        if state is None or state is self._last_state_seen:
+            return
+        self._last_state_seen = state
+
+        if state.service != "webradio":
             self.logger.debug("WebRadioScreen: Ignoring state change for non-webradio service.")
             return
 
@@ -73,6 +81,18 @@ class WebRadioScreen(BaseManager):
                 if state_to_process:
                     self.draw_display(state_to_process)
 
+    def adjust_volume(self, volume_change):
+        """Adjust the volume; detents are coalesced into absolute volume commands by the listener."""
+        new_volume = self.volumio_listener.change_volume(volume_change)
+        self.logger.debug(f"WebRadioScreen: Volume target is now {new_volume}.")
+
+    def toggle_play_pause(self):
+        """Toggle playback; the new status is drawn before Volumio confirms it."""
+        if not self.volumio_listener.is_connected():
+            self.logger.warning("WebRadioScreen: Cannot toggle playback - not connected to Volumio.")
+            return
+        self.volumio_listener.toggle_play_pause()
+
     def start_mode(self):
         """Activate the WebRadioScreen display mode."""
         if self.mode_manager.get_mode() != "webradio":
@@ -197,7 +217,7 @@ class WebRadioScreen(BaseManager):
             self.logger.warning("WebRadioScreen: No album art available to display.")
 
         # Draw volume bars
-        volume = max(0, min(int(data.get("volume", 0)), 100))
+        volume = data.volume
         self.draw_volume_bars(draw, volume)
 
     def draw_display(self, data):
@@ -205,6 +225,8 @@ class WebRadioScreen(BaseManager):
         if not self.is_active:
             self.logger.info("WebRadioScreen: draw_display called, but mode is not active.")
             return
+        # Show pending user intents (volume, play/pause) ahead of Volumio's echo
+        data = self.volumio_listener.optimistic.apply(data)
 
         # Create an image to draw on
         base_image = Image.new("RGB", self.display_manager.oled.size, "black")
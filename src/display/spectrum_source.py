@@ -0,0 +1,105 @@
+# src/display/spectrum_source.py
+
+import os
+import time
+import logging
+import threading
+
+FIFO_PATH = "/tmp/display.fifo"  # Path to the FIFO for CAVA
+
+# Wait before reopening the FIFO after CAVA closed it
+REOPEN_DELAY = 0.5
+
+
+def parse_line(line):
+    """Parse one CAVA ASCII frame ("12;40;255;...") into a list of ints."""
+    return [int(x) for x in line.strip().split(";") if x.isdigit()]
+
+
+class SpectrumSource:
+    """
+    The single reader of the CAVA FIFO.
+
+    A FIFO hands each chunk to one reader only, so two consumers reading it
+    directly would tear frames between them. Consumers register a listener
+    instead; the reader thread runs while at least one is registered and
+    calls every listener with each parsed frame (a list of 0-255 bar
+    values). Listeners run on the reader thread and must only store the
+    frame.
+    """
+
+    def __init__(self, fifo_path=FIFO_PATH):
+        self.logger = logging.getLogger("SpectrumSource")
+        self.fifo_path = fifo_path
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.bars = []
+        self.frames = 0
+        self.updated_at = None
+
+    def add_listener(self, callback):
+        """Register `callback(bars)`; starts reading the FIFO if it is the first listener."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+            # A reader still blocked on its last line sees the new listener and carries on
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._read_fifo, name="SpectrumSource", daemon=True)
+                self._thread.start()
+
+    def remove_listener(self, callback):
+        """Unregister `callback`; the reader stops after its next line once none are left."""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _active_listeners(self):
+        """
+        Listeners for the calling reader to serve. With none left it gives up
+        its slot under the same lock; a reader that has given up its slot (and
+        may have been replaced by a new one) gets none and must stop.
+        """
+        with self._lock:
+            if self._thread is not threading.current_thread():
+                return []
+            if not self._listeners:
+                self._thread = None
+            return list(self._listeners)
+
+    def _read_fifo(self):
+        try:
+            self._read_frames()
+        finally:
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _read_frames(self):
+        if not os.path.exists(self.fifo_path):
+            self.logger.error(f"SpectrumSource: FIFO {self.fifo_path} does not exist.")
+            return
+
+        self.logger.info("SpectrumSource: Starting spectrum reader thread.")
+        try:
+            while self._active_listeners():
+                with open(self.fifo_path, "r") as fifo:
+                    for line in fifo:
+                        listeners = self._active_listeners()
+                        if not listeners:
+                            break
+                        bars = parse_line(line)
+                        if not bars:
+                            continue
+                        self.bars = bars
+                        self.frames += 1
+                        self.updated_at = time.monotonic()
+                        for callback in listeners:
+                            callback(bars)
+                    else:
+                        # CAVA closed its end; wait for it to come back
+                        time.sleep(REOPEN_DELAY)
+        except Exception as e:
+            self.logger.error(f"SpectrumSource: Error reading spectrum data: {e}")
+        self.logger.info("SpectrumSource: Spectrum reader thread stopped.")
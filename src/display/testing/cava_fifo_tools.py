@@ -0,0 +1,220 @@
+# src/display/testing/cava_fifo_tools.py
+
+import os
+import sys
+import time
+import struct
+import random
+import logging
+import argparse
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from display.spectrum_source import FIFO_PATH, parse_line
+
+# Recording file layout:
+#   header: magic (4 bytes) + version (uint8)
+#   frame:  timestamp offset in seconds (float64) + bar count (uint16) + one uint8 per bar
+RECORDING_MAGIC = b"QCAV"
+RECORDING_VERSION = 1
+FRAME_HEADER = struct.Struct("<dH")
+
+DEFAULT_BAR_COUNT = 36
+MAX_BAR_VALUE = 255
+
+logger = logging.getLogger("CavaFifoTools")
+
+
+def parse_cava_line(line):
+    """Parse one CAVA ASCII frame ("12;40;255;...") into a list of ints, as SpectrumSource does."""
+    return parse_line(line)
+
+
+def format_cava_line(bars):
+    """Format a list of bar values as a CAVA ASCII frame."""
+    return ";".join(str(int(bar)) for bar in bars) + ";\n"
+
+
+def ensure_fifo(path):
+    """Create the FIFO at path if it does not exist yet."""
+    if not os.path.exists(path):
+        os.mkfifo(path)
+        logger.info(f"CavaFifoTools: Created FIFO at {path}.")
+
+
+class RecordingWriter:
+    """Writes timestamped spectrum frames to a compact binary file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(RECORDING_MAGIC + bytes([RECORDING_VERSION]))
+        self.start_time = None
+        self.frame_count = 0
+
+    def write(self, bars, timestamp=None):
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if self.start_time is None:
+            self.start_time = timestamp
+        values = bytes(max(0, min(int(bar), MAX_BAR_VALUE)) for bar in bars)
+        self.file.write(FRAME_HEADER.pack(timestamp - self.start_time, len(values)))
+        self.file.write(values)
+        self.frame_count += 1
+
+    def close(self):
+        self.file.close()
+
+
+def read_recording(path):
+    """Yield (offset_seconds, bars) tuples from a recording file."""
+    with open(path, "rb") as f:
+        header = f.read(len(RECORDING_MAGIC) + 1)
+        if header[:len(RECORDING_MAGIC)] != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not a CAVA recording.")
+        if header[-1] != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version {header[-1]} in {path}.")
+
+        while True:
+            frame_header = f.read(FRAME_HEADER.size)
+            if len(frame_header) < FRAME_HEADER.size:
+                return
+            offset, count = FRAME_HEADER.unpack(frame_header)
+            values = f.read(count)
+            if len(values) < count:
+                return
+            yield offset, list(values)
+
+
+def record_fifo(fifo_path, out_path, duration=None, max_frames=None):
+    """Record frames from the CAVA FIFO to out_path. Returns the frame count."""
+    writer = RecordingWriter(out_path)
+    started = time.monotonic()
+    logger.info(f"CavaFifoTools: Recording {fifo_path} to {out_path}.")
+    try:
+        with open(fifo_path, "r") as fifo:
+            while True:
+                if duration is not None and time.monotonic() - started >= duration:
+                    break
+                if max_frames is not None and writer.frame_count >= max_frames:
+                    break
+                line = fifo.readline()
+                if not line:
+                    break  # Writer closed the FIFO
+                bars = parse_cava_line(line)
+                if bars:
+                    writer.write(bars)
+    except KeyboardInterrupt:
+        logger.info("CavaFifoTools: Recording stopped by user.")
+    finally:
+        writer.close()
+    logger.info(f"CavaFifoTools: Recorded {writer.frame_count} frames.")
+    return writer.frame_count
+
+
+def synth_frames(pattern, bars=DEFAULT_BAR_COUNT, rate=60, duration=10.0, seed=None):
+    """
+    Yield (offset_seconds, bars) tuples for a synthetic pattern.
+
+    Patterns: 'silence', 'full', 'sweep' (a peak travelling across the bars),
+    'noise' (random values, worst case for change-only renderers).
+    """
+    rng = random.Random(seed)
+    total = max(1, int(rate * duration))
+    for n in range(total):
+        offset = n / rate
+        if pattern == "silence":
+            frame = [0] * bars
+        elif pattern == "full":
+            frame = [MAX_BAR_VALUE] * bars
+        elif pattern == "sweep":
+            peak = (n % (bars * 2)) if bars else 0
+            peak = peak if peak < bars else (bars * 2 - 1 - peak)
+            frame = [
+                int(MAX_BAR_VALUE * max(0.0, 1.0 - abs(i - peak) / 4.0))
+                for i in range(bars)
+            ]
+        elif pattern == "noise":
+            frame = [rng.randint(0, MAX_BAR_VALUE) for _ in range(bars)]
+        else:
+            raise ValueError(f"Unknown pattern '{pattern}'.")
+        yield offset, frame
+
+
+def play_frames(frames, fifo_path, rate=None, loop=False):
+    """
+    Write frames into fifo_path in real time.
+
+    With rate=None the recorded offsets are honoured; otherwise frames are
+    paced at a fixed rate. Returns the number of frames written.
+    """
+    ensure_fifo(fifo_path)
+    frames = list(frames)
+    if not frames:
+        return 0
+
+    written = 0
+    logger.info(f"CavaFifoTools: Opening {fifo_path} for writing (blocks until a reader connects).")
+    try:
+        with open(fifo_path, "w") as fifo:
+            while True:
+                start = time.monotonic()
+                for i, (offset, bars) in enumerate(frames):
+                    due = start + (i / rate if rate else offset)
+                    delay = due - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    fifo.write(format_cava_line(bars))
+                    fifo.flush()
+                    written += 1
+                if not loop:
+                    break
+    except BrokenPipeError:
+        logger.info("CavaFifoTools: Reader closed the FIFO.")
+    except KeyboardInterrupt:
+        logger.info("CavaFifoTools: Playback stopped by user.")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record, replay or synthesise CAVA FIFO spectrum data.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Record frames from a FIFO to a file.")
+    rec.add_argument("output")
+    rec.add_argument("--fifo", default=FIFO_PATH)
+    rec.add_argument("--duration", type=float, default=None)
+    rec.add_argument("--frames", type=int, default=None)
+
+    rep = sub.add_parser("replay", help="Replay a recording into a FIFO.")
+    rep.add_argument("input")
+    rep.add_argument("--fifo", default=FIFO_PATH)
+    rep.add_argument("--rate", type=float, default=None, help="Override recorded timing (frames per second).")
+    rep.add_argument("--loop", action="store_true")
+
+    syn = sub.add_parser("synth", help="Write a synthetic pattern into a FIFO.")
+    syn.add_argument("pattern", choices=["silence", "full", "sweep", "noise"])
+    syn.add_argument("--fifo", default=FIFO_PATH)
+    syn.add_argument("--rate", type=float, default=60)
+    syn.add_argument("--duration", type=float, default=10.0)
+    syn.add_argument("--bars", type=int, default=DEFAULT_BAR_COUNT)
+    syn.add_argument("--loop", action="store_true")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == "record":
+        record_fifo(args.fifo, args.output, duration=args.duration, max_frames=args.frames)
+    elif args.command == "replay":
+        count = play_frames(read_recording(args.input), args.fifo, rate=args.rate, loop=args.loop)
+        print(f"Replayed {count} frames.")
+    elif args.command == "synth":
+        frames = synth_frames(args.pattern, bars=args.bars, rate=args.rate, duration=args.duration)
+        count = play_frames(frames, args.fifo, rate=args.rate, loop=args.loop)
+        print(f"Wrote {count} frames.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+# src/display/testing/spectrum_benchmark.py
+#
+# Measures spectrum FPS, parse cost and render cost for ModernScreen and
+# CavaOLEDDisplayCircular without CAVA, audio or an OLED panel attached.
+#
+# Usage (from the src directory):
+#   python -m display.testing.spectrum_benchmark --pattern sweep --rate 60 --duration 5
+#   python -m display.testing.spectrum_benchmark --recording capture.qcav --renderer circular
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from PIL import Image
+from blinker import Signal
+
+from display.testing.cava_fifo_tools import (
+    DEFAULT_BAR_COUNT,
+    format_cava_line,
+    play_frames,
+    read_recording,
+    synth_frames,
+)
+from display.spectrum_source import parse_line
+from network.playback_state import EMPTY_STATE
+from network.optimistic_state import OptimisticState
+
+
+class FakeOLED:
+    """Stand-in for the luma ssd1322 device; counts frames instead of pushing SPI."""
+
+    def __init__(self, width=256, height=64, mode="RGB"):
+        self.width = width
+        self.height = height
+        self.size = (width, height)
+        self.mode = mode
+        self.frames_displayed = 0
+
+    def display(self, image):
+        self.frames_displayed += 1
+
+
+class FakeDisplayManager:
+    """Minimal DisplayManager surface used by the playback screens."""
+
+    def __init__(self, width=256, height=64):
+        self.oled = FakeOLED(width, height)
+        self.config = {}
+        self.fonts = {}
+        self.icons = {}
+        self.default_icon = Image.new("RGB", (35, 35), "grey")
+        self.lock = threading.Lock()
+
+    def clear_screen(self):
+        pass
+
+
+class FakeVolumioListener:
+    def __init__(self):
+        self.state_changed = Signal('state_changed')
+        self.volume_changed = Signal('volume_changed')
+        self.status_changed = Signal('status_changed')
+        self.track_changed = Signal('track_changed')
+        self.format_changed = Signal('format_changed')
+        self.seek_changed = Signal('seek_changed')
+        self.options_changed = Signal('options_changed')
+        self.optimistic = OptimisticState(self)
+
+    def get_current_state(self):
+        return EMPTY_STATE
+
+
+class FakeModeManager:
+    def __init__(self, mode):
+        self.mode = mode
+
+    def get_mode(self):
+        return self.mode
+
+    def is_state_change_suppressed(self):
+        return False
+
+
+SAMPLE_STATE = {
+    "status": "play",
+    "title": "Benchmark Track With A Long Enough Title To Scroll",
+    "artist": "Quadify",
+    "seek": 42000,
+    "duration": 240,
+    "service": "mpd",
+    "trackType": "flac",
+    "samplerate": "44.1 kHz",
+    "bitdepth": "16 bit",
+    "volume": 50,
+}
+
+
+def build_renderer(name, display_manager):
+    """Return a callable(bars) that renders one spectrum frame with the named screen."""
+    if name == "modern":
+        from display.screens.modern_screen import ModernScreen
+
+        screen = ModernScreen(display_manager, FakeVolumioListener(), FakeModeManager("modern"))
+        # Only the render path is under test; stop the screen's own redraw loop.
+        screen.stop_event.set()
+        screen.update_thread.join(timeout=1)
+
+        def render(bars):
+            screen.spectrum_bars = bars
+            screen.draw_display(SAMPLE_STATE)
+        return render
+
+    if name == "circular":
+        from display.screens.round_icon import CavaOLEDDisplayCircular
+
+        # A very high frame rate disables the built-in frame skipping.
+        screen = CavaOLEDDisplayCircular(display_manager, frame_rate=1_000_000)
+        screen.set_current_service("mpd")
+
+        def render(bars):
+            screen.last_render_time = 0
+            screen._draw_circular_spectrum(bars)
+        return render
+
+    raise ValueError(f"Unknown renderer '{name}'.")
+
+
+class SpectrumStats:
+    def __init__(self):
+        self.frames = 0
+        self.parse_time = 0.0
+        self.render_time = 0.0
+        self.started = None
+        self.finished = None
+
+    def report(self, label):
+        elapsed = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        frames = max(self.frames, 1)
+        fps = self.frames / elapsed if elapsed > 0 else 0.0
+        return (
+            f"{label}: {self.frames} frames in {elapsed:.2f}s -> {fps:.1f} FPS | "
+            f"parse {self.parse_time / frames * 1e6:.1f} us/frame | "
+            f"render {self.render_time / frames * 1e3:.2f} ms/frame"
+        )
+
+
+def run_offline(frames, render):
+    """Parse and render pre-formatted lines back to back to find the pipeline ceiling."""
+    lines = [format_cava_line(bars) for _, bars in frames]
+    stats = SpectrumStats()
+    stats.started = time.perf_counter()
+    for line in lines:
+        t0 = time.perf_counter()
+        bars = parse_line(line)
+        t1 = time.perf_counter()
+        render(bars)
+        t2 = time.perf_counter()
+        stats.parse_time += t1 - t0
+        stats.render_time += t2 - t1
+        stats.frames += 1
+    stats.finished = time.perf_counter()
+    return stats
+
+
+def run_fifo(frames, render, rate=None):
+    """Feed frames through a real FIFO at the chosen pace and measure delivered FPS."""
+    fifo_dir = tempfile.mkdtemp(prefix="quadify-spectrum-")
+    fifo_path = os.path.join(fifo_dir, "display.fifo")
+    os.mkfifo(fifo_path)
+
+    writer = threading.Thread(target=play_frames, args=(frames, fifo_path), kwargs={"rate": rate}, daemon=True)
+    writer.start()
+
+    stats = SpectrumStats()
+    try:
+        with open(fifo_path, "r") as fifo:
+            stats.started = time.perf_counter()
+            for line in fifo:
+                t0 = time.perf_counter()
+                bars = parse_line(line)
+                t1 = time.perf_counter()
+                if bars:
+                    render(bars)
+                t2 = time.perf_counter()
+                stats.parse_time += t1 - t0
+                stats.render_time += t2 - t1
+                stats.frames += 1
+            stats.finished = time.perf_counter()
+    finally:
+        writer.join(timeout=1)
+        os.unlink(fifo_path)
+        os.rmdir(fifo_dir)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the spectrum rendering pipeline.")
+    parser.add_argument("--renderer", choices=["modern", "circular", "all"], default="all")
+    parser.add_argument("--pattern", choices=["silence", "full", "sweep", "noise"], default="sweep")
+    parser.add_argument("--recording", help="Replay a recording made with cava_fifo_tools instead of a pattern.")
+    parser.add_argument("--rate", type=float, default=60, help="Frames per second fed into the FIFO.")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--bars", type=int, default=DEFAULT_BAR_COUNT)
+    parser.add_argument("--offline", action="store_true", help="Skip the FIFO and render as fast as possible.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    # The screens log every frame at INFO/DEBUG; keep that out of the timings.
+    logging.disable(logging.INFO)
+
+    if args.recording:
+        frames = list(read_recording(args.recording))
+        rate = None
+    else:
+        frames = list(synth_frames(args.pattern, bars=args.bars, rate=args.rate, duration=args.duration))
+        rate = args.rate
+
+    renderers = ["modern", "circular"] if args.renderer == "all" else [args.renderer]
+    for name in renderers:
+        display_manager = FakeDisplayManager()
+        render = build_renderer(name, display_manager)
+        if args.offline:
+            stats = run_offline(frames, render)
+        else:
+            stats = run_fifo(frames, render, rate=rate)
+        print(stats.report(name))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+# src/hardware/backends.py
+#
+# GPIO and I2C backends for the whole input path. On the Pi these are
+# RPi.GPIO and smbus2; with QUADIFY_FAKE_HARDWARE=1 in the environment
+# (set before Quadify modules are imported) they are the simulated pin
+# and MCP23017 models in hardware.fake_gpio and hardware.fake_smbus, so
+# the controls run and can be measured on any Linux machine.
+
+import os
+
+FAKE_HARDWARE = os.environ.get("QUADIFY_FAKE_HARDWARE", "").lower() in ("1", "true", "yes")
+
+if FAKE_HARDWARE:
+    from hardware import fake_gpio as GPIO
+    from hardware.fake_smbus import FakeSMBus as SMBus
+else:
+    import RPi.GPIO as GPIO
+    from smbus2 import SMBus
@@ -1,6 +1,6 @@
 # src/hardware/buttonsleds.py
 
-import smbus2
+from hardware.backends import GPIO
 import time
 import threading
 import logging
@@ -8,6 +8,10 @@ from enum import IntEnum
 import yaml
 from pathlib import Path
 
+from hardware.i2c_bus import I2CBus
+from hardware.led_effects import LEDEngine, LEDMeter, TICK
+from display.spectrum_source import SpectrumSource
+
 # MCP23017 Register Definitions
 MCP23017_IODIRA = 0x00
 MCP23017_IODIRB = 0x01
@@ -15,10 +19,22 @@ MCP23017_GPIOA = 0x12
 MCP23017_GPIOB = 0x13
 MCP23017_GPPUA = 0x0C
 MCP23017_GPPUB = 0x0D
+MCP23017_GPINTENB = 0x05
+MCP23017_INTCONB = 0x09
+MCP23017_INTCAPB = 0x11
+
+# Button matrix lines on GPIOB: B0/B1 drive the columns (active low), B2-B5 are the rows
+ROW_MASK = 0x3C
+INPUT_MASK = 0xFC
 
 # Default MCP23017 address if not provided in config.yaml
 DEFAULT_MCP23017_ADDRESS = 0x20
 
+# How long a button LED stays lit after a press
+BUTTON_FLASH = 0.5
+# How long the play/pause LED pulses waiting for Volumio to confirm the new status
+PENDING_TIMEOUT = 4.0
+
 # Define LED Constants using IntEnum for clarity
 class LED(IntEnum):
     LED1 = 0b10000000  # GPIOA7 - Play LED
@@ -31,7 +47,7 @@ class LED(IntEnum):
     LED8 = 0b00000001  # GPIOA0 - Button 6 LED
 
 class ButtonsLEDController:
-    def __init__(self, volumio_listener, config_path='config.yaml', debounce_delay=0.1):
+    def __init__(self, volumio_listener, config_path='config.yaml', debounce_delay=0.1, burst_interval=0.01, release_scans=3, i2c_bus=None, spectrum_source=None):
         # Configure the logger
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.ERROR)  # Set to DEBUG for comprehensive logging
@@ -50,47 +66,73 @@ class ButtonsLEDController:
 
         self.logger.debug("Initializing ButtonsLEDController.")
 
+        # Every register access goes through the shared I2CBus, which serialises the
+        # scan thread, LED timers and Volumio signal handlers
+        self._owns_bus = i2c_bus is None
         try:
-            self.bus = smbus2.SMBus(1)  # Instantiate SMBus directly
+            self.bus = i2c_bus or I2CBus(1)
             self.logger.debug("I2C bus initialized successfully.")
         except Exception as e:
             self.logger.error(f"Failed to initialize I2C bus: {e}")
             self.bus = None  # Disable bus to prevent further operations
 
         self.debounce_delay = debounce_delay
+        self.burst_interval = burst_interval  # Scan period while buttons are settling or held
+        self.release_scans = release_scans  # Identical all-released scans that end a burst
         self.prev_button_state = [[1, 1], [1, 1], [1, 1], [1, 1]]
         self.button_map = [[1, 2], [3, 4], [5, 6], [7, 8]]
         self.volumio_listener = volumio_listener
-        self.status_led_state = 0
-        self.current_button_led_state = 0
-        self.current_led_state = 0
 
         # Load the MCP23017 address from config file or use the default address
-        self.mcp23017_address = self._load_mcp_address(config_path)
+        config = self._load_config(config_path)
+        self.mcp23017_address = config.get('mcp23017_address', DEFAULT_MCP23017_ADDRESS)
+        self.logger.debug(f"MCP23017 address: 0x{self.mcp23017_address:02X}")
+
+        # Pi GPIO (BCM) wired to the MCP23017 INTB output. When set, the matrix is
+        # only scanned after a change; otherwise it is polled every debounce_delay.
+        self.intb_pin = config.get('mcp23017_intb_pin')
+        self._wake = threading.Event()
+        self.interrupt_driven = False
+        self.wakeups = 0
+        self.scans = 0
 
         # Initialize MCP23017
         self._initialize_mcp23017()
 
+        # Optional VU meter: while playing, the eight LEDs show the spectrum level,
+        # redrawn at `rate` frames per second and written only when they change
+        vu_config = config.get('led_vu_meter') or {}
+        self.vu_meter = None
+        self.spectrum_source = None
+        led_tick = TICK
+        if vu_config.get('enabled', False):
+            self.vu_meter = LEDMeter(list(LED), gain=vu_config.get('gain', 1.5))
+            self.spectrum_source = spectrum_source or SpectrumSource()
+            led_tick = 1.0 / vu_config.get('rate', 20)
+            self.logger.info(f"LED VU meter enabled at {vu_config.get('rate', 20)} Hz.")
+
+        # All LED output (GPIOA) goes through one effects engine: status, VU meter,
+        # pending command, button flash and connection alert layers
+        self.leds = None
+        if self.bus:
+            self.leds = LEDEngine(self.bus, self.mcp23017_address, MCP23017_GPIOA, tick=led_tick)
+
         # Register callbacks with Volumio listener
         self.register_volumio_callbacks()
 
-    def _load_mcp_address(self, config_path):
-        self.logger.debug(f"Loading MCP23017 address from config file: {config_path}")
+    def _load_config(self, config_path):
+        self.logger.debug(f"Loading MCP23017 settings from config file: {config_path}")
         config_file = Path(config_path)
         if config_file.is_file():
             self.logger.debug("Configuration file found.")
             with open(config_file, 'r') as f:
                 try:
-                    config = yaml.safe_load(f)
-                    address = config.get('mcp23017_address', DEFAULT_MCP23017_ADDRESS)
-                    self.logger.debug(f"MCP23017 address loaded: 0x{address:02X}")
-                    return address
+                    return yaml.safe_load(f) or {}
                 except yaml.YAMLError as e:
                     self.logger.error(f"Error reading config file: {e}")
         else:
-            self.logger.warning(f"Configuration file {config_path} not found. Using default MCP23017 address.")
-        self.logger.debug(f"Using default MCP23017 address: 0x{DEFAULT_MCP23017_ADDRESS:02X}")
-        return DEFAULT_MCP23017_ADDRESS
+            self.logger.warning(f"Configuration file {config_path} not found. Using default MCP23017 settings.")
+        return {}
 
     def _initialize_mcp23017(self):
         if not self.bus:
@@ -98,26 +140,20 @@ class ButtonsLEDController:
             return
 
         try:
-            # Configure GPIOA (IODIRA) as outputs for LEDs
-            self.bus.write_byte_data(self.mcp23017_address, MCP23017_IODIRA, 0x00)  # All GPIOA pins as outputs
+            # Configure GPIOA (IODIRA) as outputs for LEDs and GPIOB (IODIRB) in one block write:
+            # GPIOB0 and GPIOB1 as outputs for button columns, GPIOB2 to GPIOB7 as inputs for button rows
+            self.bus.write_block(self.mcp23017_address, MCP23017_IODIRA, [0x00, 0xFC])  # 0b11111100 on IODIRB
             self.logger.debug("Configured GPIOA as outputs for LEDs.")
-
-            # Configure GPIOB (IODIRB)
-            # Set GPIOB0 and GPIOB1 as outputs for button columns
-            # Set GPIOB2 to GPIOB7 as inputs for button rows
-            self.bus.write_byte_data(self.mcp23017_address, MCP23017_IODIRB, 0xFC)  # 0b11111100
             self.logger.debug("Configured GPIOB0 and GPIOB1 as outputs (button columns), GPIOB2-7 as inputs (button rows).")
 
             # Enable pull-up resistors on GPIOB2 to GPIOB7 (button rows)
-            self.bus.write_byte_data(self.mcp23017_address, MCP23017_GPPUB, 0xFC)  # 0b11111100
+            self.bus.write_byte(self.mcp23017_address, MCP23017_GPPUB, 0xFC)  # 0b11111100
             self.logger.debug("Enabled pull-up resistors on GPIOB2-7.")
 
-            # Initialize GPIOA outputs (LEDs) to 0 (all LEDs off)
-            self.bus.write_byte_data(self.mcp23017_address, MCP23017_GPIOA, 0x00)
+            # Initialize GPIOA outputs (LEDs) to 0 (all LEDs off) and
+            # GPIOB0 and GPIOB1 (button columns) to high (inactive)
+            self.bus.write_block(self.mcp23017_address, MCP23017_GPIOA, [0x00, 0x03])  # Set B0 and B1 high
             self.logger.debug("Initialized GPIOA outputs (LEDs) to 0 (all LEDs off).")
-
-            # Initialize GPIOB0 and GPIOB1 (button columns) to high (inactive)
-            self.bus.write_byte_data(self.mcp23017_address, MCP23017_GPIOB, 0x03)  # Set B0 and B1 high
             self.logger.debug("Initialized GPIOB0 and GPIOB1 (button columns) to high (inactive).")
 
             self.logger.info("MCP23017 initialized successfully.")
@@ -128,7 +164,7 @@ class ButtonsLEDController:
     def register_volumio_callbacks(self):
         self.logger.debug("Registering Volumio callbacks.")
         try:
-            self.volumio_listener.state_changed.connect(self.on_state)
+            self.volumio_listener.status_changed.connect(self.on_state)
             self.volumio_listener.connected.connect(self.on_connect)
             self.volumio_listener.disconnected.connect(self.on_disconnect)
             self.logger.debug("Volumio callbacks registered successfully.")
@@ -137,12 +173,17 @@ class ButtonsLEDController:
 
     def on_connect(self, sender, **kwargs):
         self.logger.info("Connected to Volumio via SocketIO.")
+        if self.leds:
+            self.leds.clear('alert')
 
     def on_disconnect(self, sender, **kwargs):
         self.logger.warning("Disconnected from Volumio's SocketIO server.")
+        if self.leds:
+            # Play and Pause blink together until the connection is back
+            self.leds.blink('alert', LED.LED1 | LED.LED2)
 
-    def on_state(self, sender, state):
-        new_status = state.get("status")
+    def on_state(self, sender, changes=None, state=None, **kwargs):
+        new_status = (changes or {}).get("status")
         if new_status:
             self.logger.debug(f"Volumio status changed to: {new_status.upper()}")
         else:
@@ -153,19 +194,110 @@ class ButtonsLEDController:
         """Starts the button monitoring loop."""
         self.logger.debug("Starting button monitoring thread.")
         self.running = True
-        self.thread = threading.Thread(target=self.check_buttons_and_update_leds, name="ButtonMonitorThread")
+        self.interrupt_driven = self.intb_pin is not None and self._setup_interrupt()
+        monitor = self.wait_for_button_interrupts if self.interrupt_driven else self.check_buttons_and_update_leds
+        self.thread = threading.Thread(target=monitor, name="ButtonMonitorThread")
         self.thread.start()
+        if self.leds:
+            self.leds.start()
         self.logger.info("ButtonsLEDController started.")
 
     def stop(self):
         """Stops the button monitoring loop."""
         self.logger.debug("Stopping button monitoring thread.")
         self.running = False
+        self._wake.set()
         if hasattr(self, 'thread') and self.thread.is_alive():
             self.thread.join()
             self.logger.debug("Button monitoring thread joined successfully.")
+        self._show_vu_meter(False)
+        if self.leds:
+            self.leds.stop()
+        if self.interrupt_driven:
+            try:
+                GPIO.remove_event_detect(self.intb_pin)
+            except RuntimeError:
+                pass
         self.logger.info("ButtonsLEDController stopped.")
 
+    def _setup_interrupt(self):
+        """Enable interrupt-on-change for the button rows and watch INTB on the Pi."""
+        if not self.bus:
+            return False
+        try:
+            # Any change on a row raises INTB (active low) until GPIOB or INTCAPB is read
+            self.bus.write_byte(self.mcp23017_address, MCP23017_INTCONB, 0x00)
+            self.bus.write_byte(self.mcp23017_address, MCP23017_GPINTENB, ROW_MASK)
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(self.intb_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(self.intb_pin, GPIO.FALLING, callback=lambda channel: self._wake.set())
+            self.logger.info(f"Button scanning driven by MCP23017 INTB on GPIO {self.intb_pin}.")
+            return True
+        except Exception as e:
+            self.logger.error(f"Could not set up INTB interrupt on GPIO {self.intb_pin}, polling instead: {e}")
+            return False
+
+    def _arm_interrupt(self):
+        """Drive both columns low so a press on any button changes its row, then clear the interrupt."""
+        # Rows toggle while a held button is scanned; those edges are not new presses
+        self._wake.clear()
+        self.bus.write_byte(self.mcp23017_address, MCP23017_GPIOB, INPUT_MASK)
+        self.bus.read_byte(self.mcp23017_address, MCP23017_INTCAPB)
+
+    def wait_for_button_interrupts(self):
+        """
+        Sleep until INTB reports a change on a row, then scan in a fast burst
+        until every button has been released. No I2C traffic while idle.
+        """
+        self.logger.debug("Button interrupt loop started.")
+        while self.running:
+            try:
+                self._arm_interrupt()
+                # A change between the last scan and re-arming holds INTB low without a new edge
+                if GPIO.input(self.intb_pin) == GPIO.HIGH:
+                    self._wake.wait()
+                if not self.running:
+                    break
+                self.wakeups += 1
+                self._scan_burst()
+            except Exception as e:
+                self.logger.error(f"Error in button interrupt loop: {e}")
+                time.sleep(1)  # Prevent tight loop on error
+
+        self.logger.debug("Button interrupt loop terminated.")
+
+    def stats(self):
+        """Matrix scans (4 I2C transactions each), INTB wake-ups since start and the I2C bus counters."""
+        return {
+            'mode': 'interrupt' if self.interrupt_driven else 'poll',
+            'scans': self.scans,
+            'wakeups': self.wakeups,
+            'leds': self.leds.stats() if self.leds else None,
+            'vu_meter_frames': self.vu_meter.frames if self.vu_meter else None,
+            'i2c': self.bus.stats() if self.bus else None,
+        }
+
+    def _scan_burst(self):
+        """
+        Scan every burst_interval, acting on a state once two scans agree
+        (debounce). Ends after release_scans agreeing scans with nothing
+        pressed; a held button is rescanned at the normal debounce_delay.
+        """
+        last_matrix = None
+        stable_scans = 0
+        while self.running:
+            button_matrix = self.read_button_matrix()
+            self.scans += 1
+            if button_matrix == last_matrix:
+                stable_scans += 1
+                self._process_button_matrix(button_matrix)
+                if stable_scans >= self.release_scans and all(all(row) for row in button_matrix):
+                    return
+            else:
+                stable_scans = 0
+            last_matrix = button_matrix
+            time.sleep(self.burst_interval if stable_scans < self.release_scans else self.debounce_delay)
+
     def read_button_matrix(self):
         button_matrix_state = [[1, 1], [1, 1], [1, 1], [1, 1]]
 
@@ -173,18 +305,21 @@ class ButtonsLEDController:
             self.logger.error("I2C bus not initialized. Cannot read button matrix.")
             return button_matrix_state
 
+        # Four transactions per scan, and they cannot be merged: each column has to
+        # be driven and settle before its rows are read, and the write and the
+        # read of GPIOB are separate I2C transfers.
         try:
             for col in range(2):
                 # Set one column low at a time on GPIOB0 and GPIOB1
                 # Columns are active low
                 col_output = ~(1 << col) & 0x03  # Only affecting B0 and B1
                 # Preserve B2-B7 as high (input pull-ups)
-                self.bus.write_byte_data(self.mcp23017_address, MCP23017_GPIOB, col_output | 0xFC)
+                self.bus.write_byte(self.mcp23017_address, MCP23017_GPIOB, col_output | 0xFC)
                 self.logger.debug(f"Set column {col} low: GPIOB = {bin(col_output | 0xFC)}")
                 time.sleep(0.005)  # Allow signals to stabilize
 
                 # Read rows from GPIOB2 to GPIOB5
-                row_input = self.bus.read_byte_data(self.mcp23017_address, MCP23017_GPIOB)
+                row_input = self.bus.read_byte(self.mcp23017_address, MCP23017_GPIOB)
                 self.logger.debug(f"Read GPIOB after setting column {col}: {bin(row_input)}")
                 for row in range(4):
                     # Extract the state of each row (active low)
@@ -205,20 +340,8 @@ class ButtonsLEDController:
 
             try:
                 button_matrix = self.read_button_matrix()
-                for row in range(4):
-                    for col in range(2):
-                        button_id = self.button_map[row][col]
-                        current_button_state = button_matrix[row][col]
-                        previous_state = self.prev_button_state[row][col]
-                        self.logger.debug(f"Checking Button {button_id}: Current State = {current_button_state}, Previous State = {previous_state}")
-
-                        if current_button_state == 0 and previous_state != current_button_state:
-                            # Button pressed
-                            self.logger.info(f"Button {button_id} pressed")
-                            self.handle_button_press(button_id)
-                            self.prev_button_state[row][col] = current_button_state
-                        else:
-                            self.prev_button_state[row][col] = current_button_state
+                self.scans += 1
+                self._process_button_matrix(button_matrix)
                 time.sleep(self.debounce_delay)
             except Exception as e:
                 self.logger.error(f"Error in button monitoring loop: {e}")
@@ -226,22 +349,36 @@ class ButtonsLEDController:
 
         self.logger.debug("Button monitoring loop terminated.")
 
+    def _process_button_matrix(self, button_matrix):
+        """Compare a scan with the previous one and handle new presses."""
+        for row in range(4):
+            for col in range(2):
+                button_id = self.button_map[row][col]
+                current_button_state = button_matrix[row][col]
+                previous_state = self.prev_button_state[row][col]
+                self.logger.debug(f"Checking Button {button_id}: Current State = {current_button_state}, Previous State = {previous_state}")
+
+                if current_button_state == 0 and previous_state != current_button_state:
+                    # Button pressed
+                    self.logger.info(f"Button {button_id} pressed")
+                    self.handle_button_press(button_id)
+                self.prev_button_state[row][col] = current_button_state
+
     def handle_button_press(self, button_id):
         self.logger.debug(f"Handling press for Button {button_id}")
         led_to_light = None
 
         try:
-            # Clear any previous button LEDs
-            self.current_button_led_state = 0
-
             if button_id == 1:
-                self.volumio_listener.socketIO.emit('pause')
+                self.volumio_listener.pause()
                 self.logger.debug("Emitted 'pause' command to Volumio.")
-                # Play/Pause LEDs are handled via Volumio state
+                # Play/Pause LEDs are handled via Volumio state; pulse until it arrives
+                self._show_pending(LED.LED2)
             elif button_id == 2:
-                self.volumio_listener.socketIO.emit('play')
+                self.volumio_listener.play()
                 self.logger.debug("Emitted 'play' command to Volumio.")
-                # Play/Pause LEDs are handled via Volumio state
+                # Play/Pause LEDs are handled via Volumio state; pulse until it arrives
+                self._show_pending(LED.LED1)
             elif button_id == 3:
                 self.volumio_listener.socketIO.emit('next')
                 self.logger.debug("Emitted 'next' command to Volumio.")
@@ -251,11 +388,11 @@ class ButtonsLEDController:
                 self.logger.debug("Emitted 'previous' command to Volumio.")
                 led_to_light = LED.LED3
             elif button_id == 5:
-                self.volumio_listener.socketIO.emit('repeat')
+                self.volumio_listener.toggle_repeat()
                 self.logger.debug("Emitted 'repeat' command to Volumio.")
                 led_to_light = LED.LED5
             elif button_id == 6:
-                self.volumio_listener.socketIO.emit('random')
+                self.volumio_listener.toggle_random()
                 self.logger.debug("Emitted 'random' command to Volumio.")
                 led_to_light = LED.LED6
             elif button_id == 7:
@@ -267,65 +404,57 @@ class ButtonsLEDController:
             else:
                 self.logger.warning(f"Unhandled button ID: {button_id}")
 
-            if led_to_light:
-                # Turn off any other button LEDs
-                self.current_button_led_state = 0
-                # Set the LED for the current button
-                self.current_button_led_state = led_to_light.value
-                self.logger.debug(f"Button LED state set to: {bin(self.current_button_led_state)}")
-                self.control_leds()
-
-                # Start a timer to reset the button LED after 0.5 seconds
-                threading.Timer(0.5, self.reset_button_led).start()
-            else:
-                self.control_leds()
+            if led_to_light and self.leds:
+                # A new press restarts the flash and replaces any other button LED
+                self.leds.flash('button', led_to_light.value, BUTTON_FLASH)
+                self.logger.debug(f"Button LED flashed: {bin(led_to_light.value)}")
         except Exception as e:
             self.logger.error(f"Error handling button press for Button {button_id}: {e}")
 
-    def reset_button_led(self):
-        self.logger.debug("Resetting button LED.")
-        self.current_button_led_state = 0
-        self.control_leds()
-
-    def control_leds(self):
-        # LEDs are controlled via GPIOA; button columns are on GPIOB0 and GPIOB1
-        total_state = self.status_led_state | self.current_button_led_state
-        self.logger.debug(f"Calculating total LED state: Status = {bin(self.status_led_state)}, Button = {bin(self.current_button_led_state)}, Total = {bin(total_state)}")
-
-        if total_state != self.current_led_state:
-            try:
-                self.bus.write_byte_data(self.mcp23017_address, MCP23017_GPIOA, total_state)
-                self.current_led_state = total_state
-                self.logger.info(f"LED state updated: {bin(total_state)}")
-            except Exception as e:
-                self.logger.error(f"Error setting LED state: {e}")
-        else:
-            self.logger.debug("LED state unchanged; no update required.")
+    def _show_pending(self, led):
+        if self.leds:
+            self.leds.pulse('pending', led.value, duration=PENDING_TIMEOUT)
 
     def update_status_leds(self, new_status):
         self.logger.debug(f"Updating status LEDs based on new status: {new_status}")
         if new_status == "play":
-            self.status_led_state = LED.LED1.value  # Play LED on
-            self.logger.debug("Set status_led_state to LED1 (Play).")
+            status_led_state = LED.LED1.value  # Play LED on
+            self.logger.debug("Set status LED to LED1 (Play).")
         elif new_status in ["pause", "stop"]:
-            self.status_led_state = LED.LED2.value  # Pause LED on
-            self.logger.debug("Set status_led_state to LED2 (Pause).")
+            status_led_state = LED.LED2.value  # Pause LED on
+            self.logger.debug("Set status LED to LED2 (Pause).")
         else:
-            self.status_led_state = 0  # Clear status LEDs
+            status_led_state = 0  # Clear status LEDs
             self.logger.debug("Cleared all status LEDs.")
-        self.control_leds()
+        if self.leds:
+            self.leds.set('status', status_led_state)
+            if new_status:
+                self.leds.clear('pending')
+        self._show_vu_meter(new_status == "play")
+
+    def _show_vu_meter(self, show):
+        """Run the VU meter (if enabled) only while playing, so the FIFO is not read otherwise."""
+        if not self.vu_meter or not self.leds:
+            return
+        if show:
+            self.spectrum_source.add_listener(self.vu_meter.feed)
+            if not self.leds.active('meter'):
+                self.vu_meter.reset()
+                self.leds.play('meter', self.vu_meter)
+        else:
+            self.spectrum_source.remove_listener(self.vu_meter.feed)
+            self.leds.clear('meter')
 
     def clear_all_leds(self):
         """
         Turn off all LEDs.
         """
-        try:
-            self.bus.write_byte_data(self.mcp23017_address, MCP23017_GPIOA, 0x00)
-            self.current_led_state = 0
+        if self.leds:
+            self.leds.clear()
             self.logger.debug("All LEDs cleared.")
-        except Exception as e:
-            self.logger.error(f"Error clearing all LEDs: {e}")
 
     def close(self):
-        self.bus.close()
-        self.logger.info("Closed SMBus")
+        # A bus passed in is shared; its owner closes it
+        if self.bus and self._owns_bus:
+            self.bus.close()
+            self.logger.info("Closed SMBus")
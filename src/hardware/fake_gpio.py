@@ -0,0 +1,238 @@
+# src/hardware/fake_gpio.py
+#
+# Simulated stand-in for RPi.GPIO, selected by hardware.backends when
+# QUADIFY_FAKE_HARDWARE=1. It implements the calls Quadify makes (setmode,
+# setup, input, output, add/remove_event_detect, cleanup) on an in-memory
+# pin model. Tests drive input pins with set_level() or FakeRotaryEncoder;
+# edge callbacks then run on one event thread, as with the real library.
+
+import time
+import queue
+import logging
+import threading
+
+BCM = 11
+BOARD = 10
+OUT = 0
+IN = 1
+LOW = 0
+HIGH = 1
+PUD_OFF = 20
+PUD_DOWN = 21
+PUD_UP = 22
+RISING = 31
+FALLING = 32
+BOTH = 33
+
+# Quadrature states (CLK << 1) | DT visited by one clockwise detent, from rest
+CLOCKWISE_STATES = (1, 0, 2, 3)
+COUNTER_CLOCKWISE_STATES = (2, 0, 1, 3)
+
+
+class FakeGPIOBoard:
+    """
+    Pin levels and edge detection for the simulated GPIO header.
+
+    An input pin reads the level a test drives on it, or its pull when
+    released (floating pins read LOW). A level change that matches a pin's
+    edge detection queues its callbacks with the time of the edge; one
+    daemon thread runs them in order, so a slow callback delays the ones
+    behind it just like RPi.GPIO's callback thread.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("FakeGPIO")
+        self._lock = threading.RLock()
+        self._events = queue.Queue()
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.mode = None
+            self.directions = {}  # pin -> IN / OUT
+            self.pulls = {}  # pin -> PUD_*
+            self.driven = {}  # pin -> level set by the test on an input
+            self.outputs = {}  # pin -> level written by the code
+            self.detects = {}  # pin -> [edge, bouncetime, [callbacks], last accepted edge]
+            self.edges = 0
+            self.last_edge_at = {}
+
+    def level(self, pin):
+        with self._lock:
+            if self.directions.get(pin) == OUT:
+                return self.outputs.get(pin, LOW)
+            if pin in self.driven:
+                return self.driven[pin]
+            return HIGH if self.pulls.get(pin) == PUD_UP else LOW
+
+    def set_level(self, pin, level):
+        """Drive input `pin` to `level` from outside, firing edge detection on a change."""
+        with self._lock:
+            previous = self.level(pin)
+            self.driven[pin] = HIGH if level else LOW
+            self._changed(pin, previous)
+
+    def release(self, pin):
+        """Stop driving `pin`; it returns to its pull level."""
+        with self._lock:
+            previous = self.level(pin)
+            self.driven.pop(pin, None)
+            self._changed(pin, previous)
+
+    def _changed(self, pin, previous):
+        current = self.level(pin)
+        if current == previous:
+            return
+        now = time.monotonic()
+        self.edges += 1
+        self.last_edge_at[pin] = now
+        detect = self.detects.get(pin)
+        if detect is None:
+            return
+        edge, bouncetime, callbacks, last_accepted = detect
+        if edge == RISING and current != HIGH or edge == FALLING and current != LOW:
+            return
+        if bouncetime and last_accepted is not None and (now - last_accepted) * 1000 < bouncetime:
+            return
+        detect[3] = now
+        for callback in callbacks:
+            self._events.put((callback, pin))
+        self._ensure_thread()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run_callbacks, name="FakeGPIOEvents", daemon=True)
+            self._thread.start()
+
+    def _run_callbacks(self):
+        while True:
+            callback, pin = self._events.get()
+            try:
+                callback(pin)
+            except Exception as e:
+                self.logger.exception(f"FakeGPIO: Callback for GPIO {pin} failed: {e}")
+            finally:
+                self._events.task_done()
+
+    def wait_idle(self):
+        """Block until every queued edge callback has run."""
+        self._events.join()
+
+
+board = FakeGPIOBoard()
+
+
+def _channels(channel):
+    return channel if isinstance(channel, (list, tuple)) else [channel]
+
+
+def setmode(mode):
+    board.mode = mode
+
+
+def getmode():
+    return board.mode
+
+
+def setwarnings(flag):
+    pass
+
+
+def setup(channel, direction, pull_up_down=PUD_OFF, initial=None):
+    with board._lock:
+        for pin in _channels(channel):
+            board.directions[pin] = direction
+            board.pulls[pin] = pull_up_down
+            if direction == OUT:
+                board.outputs[pin] = LOW if initial is None else initial
+
+
+def input(channel):
+    return board.level(channel)
+
+
+def output(channel, value):
+    with board._lock:
+        for pin in _channels(channel):
+            if board.directions.get(pin) != OUT:
+                raise RuntimeError("The GPIO channel has not been set up as an OUTPUT")
+            board.outputs[pin] = HIGH if value else LOW
+
+
+def add_event_detect(channel, edge, callback=None, bouncetime=None):
+    with board._lock:
+        if board.directions.get(channel) != IN:
+            raise RuntimeError("You must setup() the GPIO channel as an input first")
+        if channel in board.detects:
+            raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+        board.detects[channel] = [edge, bouncetime, [callback] if callback else [], None]
+
+
+def add_event_callback(channel, callback):
+    with board._lock:
+        if channel not in board.detects:
+            raise RuntimeError("Add event detection using add_event_detect first before adding a callback")
+        board.detects[channel][2].append(callback)
+
+
+def remove_event_detect(channel):
+    with board._lock:
+        board.detects.pop(channel, None)
+
+
+def cleanup(channel=None):
+    with board._lock:
+        if channel is None:
+            board.reset()
+            return
+        for pin in _channels(channel):
+            for table in (board.directions, board.pulls, board.driven, board.outputs, board.detects):
+                table.pop(pin, None)
+
+
+class FakeRotaryEncoder:
+    """
+    Scriptable rotary encoder with push button on three simulated pins.
+
+    Lines idle HIGH (pulled up) and are pulled LOW by the contacts, like
+    the encoder on the Quadify board. turn() plays the quadrature sequence
+    of whole detents, one line change every `step_interval` seconds, with
+    `bounce` extra chatter on each change; press() holds the switch LOW.
+    """
+
+    def __init__(self, clk_pin=13, dt_pin=5, sw_pin=6, fake_board=None):
+        self.board = fake_board or board
+        self.clk_pin = clk_pin
+        self.dt_pin = dt_pin
+        self.sw_pin = sw_pin
+        self.state = 3
+        for pin in (clk_pin, dt_pin, sw_pin):
+            self.board.set_level(pin, HIGH)
+
+    def turn(self, detents, step_interval=0.001, bounce=0):
+        """Turn by `detents` (negative counter-clockwise); returns the time of the last edge."""
+        states = CLOCKWISE_STATES if detents > 0 else COUNTER_CLOCKWISE_STATES
+        last_edge = time.monotonic()
+        for _ in range(abs(detents)):
+            for state in states:
+                last_edge = self._move(state, bounce)
+                time.sleep(step_interval)
+        return last_edge
+
+    def _move(self, state, bounce):
+        changed = self.state ^ state
+        pin, level = (self.clk_pin, state >> 1) if changed & 0b10 else (self.dt_pin, state & 1)
+        for _ in range(bounce):
+            self.board.set_level(pin, level)
+            self.board.set_level(pin, 1 - level)
+        self.board.set_level(pin, level)
+        self.state = state
+        return time.monotonic()
+
+    def press(self, duration=0.1):
+        """Press and release the switch; returns the time of the release edge."""
+        self.board.set_level(self.sw_pin, LOW)
+        time.sleep(duration)
+        self.board.set_level(self.sw_pin, HIGH)
+        return time.monotonic()
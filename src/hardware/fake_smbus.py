@@ -0,0 +1,221 @@
+# src/hardware/fake_smbus.py
+#
+# Simulated stand-in for smbus2.SMBus, selected by hardware.backends when
+# QUADIFY_FAKE_HARDWARE=1, with a register model of the MCP23017 behind it.
+# Devices are attached to DEVICES by address; anything else answers with
+# the same "Remote I/O error" a missing chip gives on the Pi.
+
+import time
+import errno
+import threading
+
+# MCP23017 registers with IOCON.BANK = 0: port A at even, port B at odd addresses
+IODIR = 0x00
+IPOL = 0x02
+GPINTEN = 0x04
+DEFVAL = 0x06
+INTCON = 0x08
+IOCON = 0x0A
+GPPU = 0x0C
+INTF = 0x0E
+INTCAP = 0x10
+GPIO = 0x12
+OLAT = 0x14
+REGISTER_COUNT = 0x16
+
+PORT_A = 0
+PORT_B = 1
+
+# Address -> device model shared by every FakeSMBus
+DEVICES = {}
+
+# Default delay of one simulated transaction, in seconds
+TRANSACTION_TIME = 0.0
+
+
+def attach(address, device):
+    """Put `device` on the simulated bus at `address` and return it."""
+    DEVICES[address] = device
+    return device
+
+
+class FakeMCP23017:
+    """
+    Register model of the MCP23017 port expander.
+
+    Pins are numbered 0-7 for GPA0-7 and 8-15 for GPB0-7. Output pins
+    follow OLAT; input pins read the level a test drives on them, or an
+    output pin they are switched to (press() closes a switch between two
+    pins, as in a button matrix), or their pull-up. Interrupt-on-change is
+    modelled per port: a change on an enabled pin latches INTF and INTCAP
+    and asserts the port's INT line (active low) until GPIO or INTCAP of
+    that port is read. Wire a line to a simulated Pi pin with
+    wire_interrupt().
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.registers = [0] * REGISTER_COUNT
+        self.registers[IODIR + PORT_A] = 0xFF
+        self.registers[IODIR + PORT_B] = 0xFF
+        self.driven = {}  # pin -> level driven from outside
+        self.switches = set()  # frozenset({pin, pin}) of closed switches
+        self._levels = [self._port_levels(PORT_A), self._port_levels(PORT_B)]
+        self._interrupt_lines = [None, None]  # port -> callback(active)
+        self.reads = 0
+        self.writes = 0
+
+    # Pin model
+
+    def _pin_level(self, pin):
+        port, bit = divmod(pin, 8)
+        if not (self.registers[IODIR + port] >> bit) & 1:
+            return (self.registers[OLAT + port] >> bit) & 1
+        if pin in self.driven:
+            return self.driven[pin]
+        for switch in self.switches:
+            if pin in switch:
+                (other,) = switch - {pin}
+                other_port, other_bit = divmod(other, 8)
+                if not (self.registers[IODIR + other_port] >> other_bit) & 1:
+                    return (self.registers[OLAT + other_port] >> other_bit) & 1
+        return (self.registers[GPPU + port] >> bit) & 1
+
+    def _port_levels(self, port):
+        value = 0
+        for bit in range(8):
+            value |= self._pin_level(port * 8 + bit) << bit
+        return value
+
+    def set_level(self, pin, level):
+        with self._lock:
+            self.driven[pin] = 1 if level else 0
+            self._update()
+
+    def release_pin(self, pin):
+        with self._lock:
+            self.driven.pop(pin, None)
+            self._update()
+
+    def press(self, pin_a, pin_b):
+        """Close the switch between two pins."""
+        with self._lock:
+            self.switches.add(frozenset((pin_a, pin_b)))
+            self._update()
+
+    def release(self, pin_a, pin_b):
+        with self._lock:
+            self.switches.discard(frozenset((pin_a, pin_b)))
+            self._update()
+
+    def wire_interrupt(self, port, callback):
+        """Call `callback(active)` when the INT line of `port` is asserted or released."""
+        self._interrupt_lines[port] = callback
+
+    # Interrupts
+
+    def _update(self):
+        for port in (PORT_A, PORT_B):
+            levels = self._port_levels(port)
+            previous, self._levels[port] = self._levels[port], levels
+            enabled = self.registers[GPINTEN + port] & self.registers[IODIR + port]
+            if not enabled or self.registers[INTF + port]:
+                continue
+            compare = self.registers[INTCON + port]
+            reference = (self.registers[DEFVAL + port] & compare) | (previous & ~compare)
+            triggered = (levels ^ reference) & enabled
+            if triggered:
+                self.registers[INTF + port] = triggered & -triggered  # the first pin to change
+                self.registers[INTCAP + port] = levels
+                self._signal(port, True)
+
+    def _clear_interrupt(self, port):
+        if not self.registers[INTF + port]:
+            return
+        self.registers[INTF + port] = 0
+        self._signal(port, False)
+        # Against DEFVAL the interrupt fires again while the condition holds
+        self._levels[port] = self._port_levels(port)
+        compare = self.registers[INTCON + port] & self.registers[GPINTEN + port] & self.registers[IODIR + port]
+        triggered = (self._levels[port] ^ self.registers[DEFVAL + port]) & compare
+        if triggered:
+            self.registers[INTF + port] = triggered & -triggered
+            self.registers[INTCAP + port] = self._levels[port]
+            self._signal(port, True)
+
+    def _signal(self, port, active):
+        callback = self._interrupt_lines[port]
+        if callback:
+            callback(active)
+
+    # Register access
+
+    def read_register(self, register):
+        with self._lock:
+            self.reads += 1
+            base, port = register & ~1, register & 1
+            if base == GPIO:
+                value = self._port_levels(port) ^ (self.registers[IPOL + port] & self.registers[IODIR + port])
+                self._clear_interrupt(port)
+                return value
+            if base == INTCAP:
+                value = self.registers[register]
+                self._clear_interrupt(port)
+                return value
+            return self.registers[register]
+
+    def write_register(self, register, value):
+        with self._lock:
+            self.writes += 1
+            base, port = register & ~1, register & 1
+            if base in (INTF, INTCAP):
+                return  # read-only
+            if base == GPIO:
+                register = OLAT + port
+            if base == IOCON:
+                self.registers[IOCON + PORT_A] = self.registers[IOCON + PORT_B] = value & 0xFF
+            else:
+                self.registers[register] = value & 0xFF
+            self._update()
+
+
+class FakeSMBus:
+    """
+    smbus2.SMBus look-alike over the DEVICES models. Register pointers
+    auto-increment for block transfers. `transaction_time` adds the delay a
+    real transfer takes (about 0.3 ms for a byte write at 100 kHz);
+    TRANSACTION_TIME sets it for buses the code under test opens itself.
+    """
+
+    def __init__(self, bus=None, devices=None, transaction_time=None):
+        self.bus = bus
+        self.devices = DEVICES if devices is None else devices
+        self.transaction_time = TRANSACTION_TIME if transaction_time is None else transaction_time
+        self.transactions = 0
+
+    def _device(self, address):
+        self.transactions += 1
+        if self.transaction_time:
+            time.sleep(self.transaction_time)
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(errno.EREMOTEIO, "Remote I/O error")
+        return device
+
+    def read_byte_data(self, i2c_addr, register, force=None):
+        return self._device(i2c_addr).read_register(register)
+
+    def write_byte_data(self, i2c_addr, register, value, force=None):
+        self._device(i2c_addr).write_register(register, value)
+
+    def read_i2c_block_data(self, i2c_addr, register, length, force=None):
+        device = self._device(i2c_addr)
+        return [device.read_register((register + offset) % REGISTER_COUNT) for offset in range(length)]
+
+    def write_i2c_block_data(self, i2c_addr, register, data, force=None):
+        device = self._device(i2c_addr)
+        for offset, value in enumerate(data):
+            device.write_register((register + offset) % REGISTER_COUNT, value)
+
+    def close(self):
+        pass
@@ -0,0 +1,139 @@
+# src/hardware/i2c_bus.py
+
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from hardware.backends import SMBus
+
+# Seconds of history behind the per-second rates in stats()
+RATE_WINDOW = 5
+
+
+class I2CBus:
+    """
+    Owner of one SMBus handle, shared by every thread that talks to I2C.
+
+    Every call is one transaction and holds the bus lock, so the button scan
+    thread, LED timers and Volumio signal handlers can no longer interleave
+    on the bus. locked() holds it across a sequence that must not be split,
+    such as reading a shadow value and writing the register it describes.
+
+    Writes can also be staged: stage() keeps the latest value per register
+    and flush() sends them, skipping registers that already hold the value
+    and merging consecutive registers of a device into one block write
+    (devices that auto-increment the register pointer, like the MCP23017 in
+    its default IOCON mode). Several LED changes in one tick then cost at
+    most one transaction.
+
+    stats() counts transactions, bytes and errors in total and per second
+    over the last RATE_WINDOW seconds.
+    """
+
+    def __init__(self, bus_number=1):
+        self.logger = logging.getLogger("I2CBus")
+        self.bus_number = bus_number
+        self._lock = threading.RLock()
+        self._bus = SMBus(bus_number)
+
+        self._shadow = {}  # (address, register) -> last value written
+        self._staged = {}  # (address, register) -> value waiting for flush()
+
+        self.transactions = 0
+        self.errors = 0
+        self.bytes = 0
+        self._seconds = deque(maxlen=RATE_WINDOW + 1)  # [second, transactions, errors]
+
+    @contextmanager
+    def locked(self):
+        """Hold the bus for several transactions in a row."""
+        with self._lock:
+            yield self
+
+    def read_byte(self, address, register):
+        return self._transfer(1, self._bus.read_byte_data, address, register)
+
+    def write_byte(self, address, register, value):
+        with self._lock:
+            self._shadow.pop((address, register), None)
+            self._transfer(1, self._bus.write_byte_data, address, register, value)
+            self._shadow[(address, register)] = value
+
+    def write_block(self, address, register, values):
+        """Write consecutive registers starting at `register` in one transaction."""
+        values = list(values)
+        with self._lock:
+            for offset in range(len(values)):
+                self._shadow.pop((address, register + offset), None)
+            self._transfer(len(values), self._bus.write_i2c_block_data, address, register, values)
+            for offset, value in enumerate(values):
+                self._shadow[(address, register + offset)] = value
+
+    def stage(self, address, register, value):
+        """Queue a register write for the next flush(); a later value replaces an earlier one."""
+        with self._lock:
+            self._staged[(address, register)] = value
+
+    def flush(self):
+        """Write the staged registers that changed, one transaction per run of consecutive registers."""
+        with self._lock:
+            changed = sorted(
+                (key, value) for key, value in self._staged.items() if self._shadow.get(key) != value
+            )
+            self._staged.clear()
+
+            runs = []
+            for (address, register), value in changed:
+                if runs and runs[-1][0] == address and runs[-1][1] + len(runs[-1][2]) == register:
+                    runs[-1][2].append(value)
+                else:
+                    runs.append((address, register, [value]))
+
+            for address, register, values in runs:
+                if len(values) == 1:
+                    self.write_byte(address, register, values[0])
+                else:
+                    self.write_block(address, register, values)
+            return len(runs)
+
+    def _transfer(self, length, operation, *args):
+        with self._lock:
+            try:
+                result = operation(*args)
+            except Exception:
+                self._count(errors=1)
+                raise
+            self._count(length=length)
+            return result
+
+    def _count(self, length=0, errors=0):
+        second = int(time.monotonic())
+        if not self._seconds or self._seconds[-1][0] != second:
+            self._seconds.append([second, 0, 0])
+        bucket = self._seconds[-1]
+        bucket[1] += 1
+        bucket[2] += errors
+        self.transactions += 1
+        self.errors += errors
+        self.bytes += length
+
+    def stats(self):
+        """Totals, plus transactions and errors per second averaged over the last full RATE_WINDOW seconds."""
+        now = int(time.monotonic())
+        with self._lock:
+            recent = [bucket for bucket in self._seconds if now - RATE_WINDOW <= bucket[0] < now]
+            return {
+                'transactions': self.transactions,
+                'errors': self.errors,
+                'bytes': self.bytes,
+                'transactions_per_second': sum(bucket[1] for bucket in recent) / RATE_WINDOW,
+                'errors_per_second': sum(bucket[2] for bucket in recent) / RATE_WINDOW,
+                'staged': len(self._staged),
+            }
+
+    def close(self):
+        with self._lock:
+            self._bus.close()
+        self.logger.info(f"I2CBus: Closed SMBus {self.bus_number}.")
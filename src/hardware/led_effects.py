@@ -0,0 +1,238 @@
+# src/hardware/led_effects.py
+
+import time
+import logging
+import threading
+
+# Layers from bottom to top. An active effect owns the LEDs in its mask:
+# while it runs, lower layers do not show on those LEDs.
+LAYERS = ('status', 'meter', 'pending', 'button', 'alert')
+
+# Seconds between frames while an effect is animating
+TICK = 0.05
+
+# Heartbeat used for pulse(): two short blips, then a pause
+PULSE_STEPS = ((True, 0.1), (False, 0.1), (True, 0.1), (False, 0.7))
+
+# A level meter goes dark when no spectrum frame arrived for this long
+METER_STALE = 0.5
+
+
+class LEDEffect:
+    """
+    On/off pattern for a set of LEDs. `steps` is a sequence of (on, seconds);
+    with `repeat` it loops, otherwise the effect ends after the last step.
+    `duration` ends a repeating effect; None keeps it until it is replaced.
+    """
+
+    __slots__ = ('mask', 'steps', 'repeat', 'duration', 'cycle', 'started_at')
+
+    def __init__(self, mask, steps, repeat=False, duration=None):
+        self.mask = mask
+        self.steps = tuple(steps)
+        self.repeat = repeat
+        self.duration = duration
+        self.cycle = sum(seconds for _, seconds in self.steps)
+        self.started_at = time.monotonic()
+
+    @property
+    def steady(self):
+        """True when the value never changes, so it needs no frames."""
+        return self.repeat and self.duration is None and len({on for on, _ in self.steps}) == 1
+
+    def value(self, now):
+        """LED bits at `now`, or None once the effect has ended."""
+        elapsed = now - self.started_at
+        if self.duration is not None and elapsed >= self.duration:
+            return None
+        if self.repeat:
+            elapsed %= self.cycle
+        elif elapsed >= self.cycle:
+            return None
+        for on, seconds in self.steps:
+            if elapsed < seconds:
+                return self.mask if on else 0
+            elapsed -= seconds
+        return self.mask if self.steps[-1][0] else 0
+
+
+class LEDMeter:
+    """
+    Bar graph of the audio level, used as an effect on the 'meter' layer.
+
+    feed() takes spectrum frames (0-255 bars, e.g. as a SpectrumSource
+    listener) and keeps their mean. Each engine frame lights as many of
+    `leds` (bit masks, bottom LED first) as the level reaches, scaled by
+    `gain`. The shown level falls by at most `fall` of full scale per
+    second, so the meter decays instead of flickering, and the whole graph
+    goes dark when frames stop. With only nine possible values, most
+    frames compose to the value already written and cost no I2C write.
+    """
+
+    steady = False
+
+    def __init__(self, leds, gain=1.5, fall=2.0):
+        self.leds = tuple(leds)
+        self.mask = 0
+        for bit in self.leds:
+            self.mask |= bit
+        self.gain = gain
+        self.fall = fall
+
+        self.level = 0.0
+        self.updated_at = None
+        self.shown = 0.0
+        self.shown_at = None
+        self.frames = 0
+
+    def feed(self, bars):
+        if bars:
+            self.level = min(1.0, self.gain * sum(bars) / (255.0 * len(bars)))
+            self.updated_at = time.monotonic()
+            self.frames += 1
+
+    def reset(self):
+        self.level = 0.0
+        self.updated_at = None
+        self.shown = 0.0
+        self.shown_at = None
+
+    def value(self, now):
+        level = self.level if self.updated_at is not None and now - self.updated_at < METER_STALE else 0.0
+        if self.shown_at is not None:
+            level = max(level, self.shown - self.fall * (now - self.shown_at))
+        self.shown = level
+        self.shown_at = now
+
+        lit = int(round(level * len(self.leds)))
+        value = 0
+        for bit in self.leds[:lit]:
+            value |= bit
+        return value
+
+
+class LEDEngine:
+    """
+    Drives one 8-bit LED port from a single thread.
+
+    Callers put an effect on a layer (set, flash, blink, pulse, play); a new
+    effect replaces the one already on that layer, so rapid button presses
+    restart a flash instead of stacking timers that race to clear it. Each
+    frame the layers are composed bottom to top into one port value, which
+    is written through the I2CBus only when it differs from the last write.
+    The thread ticks every `tick` seconds while something animates and
+    sleeps until the next change otherwise.
+    """
+
+    def __init__(self, bus, address, register, tick=TICK):
+        self.logger = logging.getLogger("LEDEngine")
+        self.bus = bus
+        self.address = address
+        self.register = register
+        self.tick = tick
+
+        self._effects = {}  # layer -> LEDEffect
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+        self.value = None  # last value written to the port
+        self.frames = 0
+        self.writes = 0
+
+    def set(self, layer, mask):
+        """Light `mask` on `layer` until changed; 0 clears the layer."""
+        if mask:
+            self.play(layer, LEDEffect(mask, ((True, 1.0),), repeat=True))
+        else:
+            self.clear(layer)
+
+    def flash(self, layer, mask, duration=0.5):
+        """Light `mask` once for `duration` seconds."""
+        self.play(layer, LEDEffect(mask, ((True, duration),)))
+
+    def blink(self, layer, mask, period=1.0, duration=None):
+        """Blink `mask` on and off, half of every `period` each."""
+        self.play(layer, LEDEffect(mask, ((True, period / 2), (False, period / 2)), repeat=True, duration=duration))
+
+    def pulse(self, layer, mask, duration=None):
+        """Heartbeat on `mask`: a double blip every second."""
+        self.play(layer, LEDEffect(mask, PULSE_STEPS, repeat=True, duration=duration))
+
+    def clear(self, layer=None):
+        """Stop the effect on `layer`, or on every layer."""
+        with self._lock:
+            if layer is None:
+                self._effects.clear()
+            else:
+                self._effects.pop(layer, None)
+        self._wake.set()
+
+    def active(self, layer):
+        with self._lock:
+            return layer in self._effects
+
+    def play(self, layer, effect):
+        """Run any effect with `mask`, `steady` and `value(now)` (an LEDEffect or LEDMeter) on `layer`."""
+        if layer not in LAYERS:
+            raise ValueError(f"Unknown LED layer: {layer}")
+        with self._lock:
+            self._effects[layer] = effect
+        self._wake.set()
+
+    def compose(self, now=None):
+        """Port value at `now` and whether any effect still animates; drops ended effects."""
+        now = time.monotonic() if now is None else now
+        value = 0
+        animating = False
+        with self._lock:
+            for layer in LAYERS:
+                effect = self._effects.get(layer)
+                if effect is None:
+                    continue
+                bits = effect.value(now)
+                if bits is None:
+                    del self._effects[layer]
+                    continue
+                value = (value & ~effect.mask) | bits
+                animating = animating or not effect.steady
+        return value, animating
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="LEDEngine", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        while self._running:
+            # Cleared before composing, so a change made meanwhile wakes the next wait
+            self._wake.clear()
+            value, animating = self.compose()
+            self.frames += 1
+            if value != self.value:
+                self._write(value)
+            self._wake.wait(self.tick if animating else None)
+
+    def _write(self, value):
+        try:
+            self.bus.stage(self.address, self.register, value)
+            if self.bus.flush():
+                self.writes += 1
+            self.value = value
+            self.logger.debug(f"LEDEngine: LED state updated: {bin(value)}")
+        except Exception as e:
+            self.logger.error(f"LEDEngine: Error setting LED state: {e}")
+
+    def stats(self):
+        with self._lock:
+            layers = sorted(self._effects)
+        return {'frames': self.frames, 'writes': self.writes, 'value': self.value, 'layers': layers}
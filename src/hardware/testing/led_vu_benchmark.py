@@ -0,0 +1,100 @@
+# src/hardware/testing/led_vu_benchmark.py
+#
+# Measures the I2C load of the LED VU meter on the Pi: bus transactions and
+# GPIOA writes per second while synthetic spectrum frames are played into a
+# FIFO, next to the idle LED engine. Stop Quadify first, since it owns the
+# MCP23017. For scale, polling the button matrix costs 40 transactions per
+# second (4 per scan, 10 scans per second).
+#
+# Usage (from the src directory):
+#   python -m hardware.testing.led_vu_benchmark
+#   python -m hardware.testing.led_vu_benchmark --pattern noise --pattern sweep --rate 30 --duration 20
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from display.spectrum_source import SpectrumSource
+from display.testing.cava_fifo_tools import synth_frames, play_frames
+from hardware.i2c_bus import I2CBus
+from hardware.led_effects import LEDEngine, LEDMeter
+from hardware.buttonsleds import LED, MCP23017_GPIOA, MCP23017_IODIRA
+
+
+def run_phase(bus, address, rate, duration, pattern=None, cava_rate=60):
+    """Run the LED engine for `duration` seconds, with the meter fed `pattern` unless None."""
+    engine = LEDEngine(bus, address, MCP23017_GPIOA, tick=1.0 / rate)
+    meter = LEDMeter(list(LED))
+    source = None
+    fifo_dir = None
+
+    if pattern:
+        fifo_dir = tempfile.mkdtemp(prefix="quadify-vu-")
+        fifo_path = os.path.join(fifo_dir, "display.fifo")
+        os.mkfifo(fifo_path)
+        frames = list(synth_frames(pattern, rate=cava_rate, duration=2.0, seed=1))
+        threading.Thread(target=play_frames, args=(frames, fifo_path),
+                         kwargs={"rate": cava_rate, "loop": True}, daemon=True).start()
+        source = SpectrumSource(fifo_path)
+        source.add_listener(meter.feed)
+        engine.play('meter', meter)
+
+    engine.start()
+    time.sleep(0.5)  # let the FIFO connect and the first frames through
+    transactions, frames, writes = bus.transactions, engine.frames, engine.writes
+    started = time.monotonic()
+    time.sleep(duration)
+    elapsed = time.monotonic() - started
+    result = {
+        'transactions': (bus.transactions - transactions) / elapsed,
+        'frames': (engine.frames - frames) / elapsed,
+        'writes': (engine.writes - writes) / elapsed,
+        'spectrum': meter.frames / (elapsed + 0.5),
+        'errors': bus.errors,
+    }
+
+    if source:
+        source.remove_listener(meter.feed)
+    engine.clear()
+    time.sleep(2.0 / rate)
+    engine.stop()
+    if fifo_dir:
+        time.sleep(0.2)
+        os.unlink(fifo_path)
+        os.rmdir(fifo_dir)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="I2C load of the LED VU meter.")
+    parser.add_argument("--pattern", choices=["silence", "full", "sweep", "noise"], action="append",
+                        help="Spectrum pattern(s) to play; sweep and noise by default.")
+    parser.add_argument("--rate", type=float, default=20.0, help="LED frames per second.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase.")
+    parser.add_argument("--address", type=lambda value: int(value, 0), default=0x20, help="MCP23017 address.")
+    args = parser.parse_args()
+
+    bus = I2CBus(1)
+    bus.write_byte(args.address, MCP23017_IODIRA, 0x00)  # GPIOA as outputs
+
+    results = [("idle", run_phase(bus, args.address, args.rate, args.duration))]
+    for pattern in args.pattern or ["sweep", "noise"]:
+        results.append((pattern, run_phase(bus, args.address, args.rate, args.duration, pattern)))
+    bus.write_byte(args.address, MCP23017_GPIOA, 0x00)
+    bus.close()
+
+    print(f"{'phase':<10} {'spectrum/s':>11} {'frames/s':>9} {'writes/s':>9} {'i2c tx/s':>9} {'errors':>7}")
+    for name, result in results:
+        print(f"{name:<10} {result['spectrum']:>11.1f} {result['frames']:>9.1f} {result['writes']:>9.1f} "
+              f"{result['transactions']:>9.1f} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 # src/main.py
-import RPi.GPIO as GPIO
 import time
 import threading
 import logging
@@ -24,8 +23,11 @@ from managers.menus.spotify_manager import SpotifyManager
 from managers.menus.library_manager import LibraryManager
 from managers.menus.usb_library_manager import USBLibraryManager
 from controls.rotary_control import RotaryControl
+from controls.input_dispatcher import InputDispatcher, ROTATE, PRESS, LONG_PRESS
 from network.volumio_listener import VolumioListener
+from network.state_snapshot import StateSnapshotStore
 from hardware.buttonsleds import ButtonsLEDController
+from display.spectrum_source import SpectrumSource
 from handlers.state_handler import StateHandler
 from managers.manager_factory import ManagerFactory
 
@@ -64,11 +66,44 @@ def main():
     display_config = config.get('display', {})
     display_manager = DisplayManager(display_config)
 
-    # 4. Display logo for 5 seconds
-    logger.info("Displaying startup logo...")
-    display_manager.show_logo()
-    logger.info("Startup logo displayed for 5 seconds.")
-    time.sleep(5)  # Wait for 5 seconds to ensure the logo is visible
+    # 3b. Initialize VolumioListener. It connects in the background, and with a
+    # snapshot from the previous run it already holds the last known state.
+    snapshot_config = config.get('state_snapshot', {})
+    snapshot = None
+    if snapshot_config.get('enabled', True):
+        snapshot = StateSnapshotStore(
+            snapshot_config.get('path', os.path.join(script_dir, 'cache', 'last_state.json')),
+            min_interval=snapshot_config.get('min_interval', 10),
+        )
+    volumio_config = config.get('volumio', {})
+    volumio_host = volumio_config.get('host', 'localhost')
+    volumio_port = volumio_config.get('port', 3000)
+    volumio_listener = None
+    if volumio_config.get('transport', 'threaded') == 'asyncio':
+        try:
+            from network.async_volumio_listener import AsyncVolumioListener
+            volumio_listener = AsyncVolumioListener(
+                host=volumio_host,
+                port=volumio_port,
+                api_url=volumio_config.get('api_url'),
+                http_timeout=volumio_config.get('connection_timeout', 5),
+                request_deadline=volumio_config.get('request_deadline', 8),
+                snapshot=snapshot,
+            )
+        except ImportError as e:
+            logger.warning(f"Asyncio transport unavailable ({e}); falling back to the threaded listener.")
+    if volumio_listener is None:
+        volumio_listener = VolumioListener(host=volumio_host, port=volumio_port, snapshot=snapshot)
+    restored_from_snapshot = bool(volumio_listener.get_current_state())
+
+    # 4. Display logo for 5 seconds, unless the snapshot lets us draw the real screen straight away
+    if restored_from_snapshot:
+        logger.info(f"Restored state from snapshot (last mode: {volumio_listener.restored_mode}); skipping the startup logo.")
+    else:
+        logger.info("Displaying startup logo...")
+        display_manager.show_logo()
+        logger.info("Startup logo displayed for 5 seconds.")
+        time.sleep(5)  # Wait for 5 seconds to ensure the logo is visible
 
     # **A. Clear the Screen After Logo Display**
     display_manager.clear_screen()
@@ -85,9 +120,12 @@ def main():
         min_loading_event.set()
         logger.info("Minimum loading duration has elapsed.")
 
-    # Start the timer thread
-    timer_thread = threading.Thread(target=set_min_loading_event, daemon=True)
-    timer_thread.start()
+    # Start the timer thread; a restored snapshot needs no minimum loading time
+    if restored_from_snapshot:
+        min_loading_event.set()
+    else:
+        timer_thread = threading.Thread(target=set_min_loading_event, daemon=True)
+        timer_thread.start()
 
     # 7. Define a function to show loading GIF until both events are set
     def show_loading():
@@ -126,28 +164,25 @@ def main():
         logger.info("Loading GIF display thread exiting.")
 
     # 8. Start the loading GIF in a separate daemon thread
-    loading_thread = threading.Thread(target=show_loading, daemon=True)
-    loading_thread.start()
-
-    # 9. Initialize VolumioListener
-    volumio_config = config.get('volumio', {})
-    volumio_host = volumio_config.get('host', 'localhost')
-    volumio_port = volumio_config.get('port', 3000)
-    volumio_listener = VolumioListener(host=volumio_host, port=volumio_port)
+    if not restored_from_snapshot:
+        loading_thread = threading.Thread(target=show_loading, daemon=True)
+        loading_thread.start()
 
-    # 10. Define a callback for state_changed signal
-    def on_state_changed(sender, state):
-        logger.info(f"Volumio state changed: {state}")
+    # 10. Define a callback for status_changed signal
+    def on_state_changed(sender, changes=None, state=None, **kwargs):
+        logger.info(f"Volumio status changed: {changes}")
         # Define readiness criteria based on your requirements
-        if state.get('status') in ['play', 'stop', 'pause']:
+        if state is not None and state.status in ['play', 'stop', 'pause']:
             logger.info("Volumio is ready.")
             volumio_ready_event.set()
             # Optionally, disconnect the callback to prevent further triggers
-            volumio_listener.state_changed.disconnect(on_state_changed)
-            logger.info("ModeManager: Disconnected from state_changed signal.")
+            volumio_listener.status_changed.disconnect(on_state_changed)
+            logger.info("ModeManager: Disconnected from status_changed signal.")
 
-    # 11. Connect the callback to the state_changed signal
-    volumio_listener.state_changed.connect(on_state_changed)
+    # 11. Connect the callback to the status_changed signal
+    volumio_listener.status_changed.connect(on_state_changed)
+    # The first push may have arrived before the callback was connected
+    on_state_changed(volumio_listener, state=volumio_listener.get_current_state())
 
     # 12. Wait until both events are set
     logger.info("Waiting for Volumio to be ready and minimum loading duration to pass...")
@@ -168,17 +203,27 @@ def main():
         volumio_listener=volumio_listener,
     )
 
+    # One reader of the CAVA FIFO, shared by ModernScreen and the LED VU meter
+    spectrum_source = SpectrumSource()
+
     # Initialize ManagerFactory with the required dependencies
     manager_factory = ManagerFactory(
         display_manager=display_manager,
         volumio_listener=volumio_listener,
         mode_manager=mode_manager,  # Use the initialized ModeManager
-        config=config 
+        config=config,
+        spectrum_source=spectrum_source,
     )
 
     # Set up ModeManager with all components
     manager_factory.setup_mode_manager()
 
+    # ModeManager only reacts to changes, so apply the state received before it existed
+    mode_manager.process_state_change(volumio_listener, volumio_listener.get_current_state())
+    # Then return to the screen or menu that was open when Quadify last stopped
+    if restored_from_snapshot:
+        mode_manager.restore_mode(volumio_listener.restored_mode)
+
     # Access the managers via factory's attributes
     original_screen = manager_factory.original_screen
     webradio_screen = manager_factory.webradio_screen
@@ -197,140 +242,50 @@ def main():
     volumio_listener.mode_manager = mode_manager
 
     # 21. Initialize ButtonsLEDController
-    buttons_leds = ButtonsLEDController(volumio_listener=volumio_listener, config_path=config_path)
+    buttons_leds = ButtonsLEDController(volumio_listener=volumio_listener, config_path=config_path,
+                                        spectrum_source=spectrum_source)
     buttons_leds.start()
 
-    def on_rotate(direction):
-        current_mode = mode_manager.get_mode()
-
-        if current_mode == 'original':
-            # Adjust volume in OriginalScreen based on direction
-            volume_change = 10 if direction == 1 else -10
-            original_screen.adjust_volume(volume_change)
-            logger.debug(f"OriginalScreen: Adjusted volume by {volume_change}.")
-            
-        elif current_mode == 'playback':
-            # Adjust volume in Playback mode via OriginalScreen
-            volume_change = 10 if direction == 1 else -10
-            original_screen.adjust_volume(volume_change)
-            logger.debug(f"Playback: Adjusted volume by {volume_change}.")
-        
-        elif current_mode == 'modern':
-            # Adjust volume in ModernScreen based on direction
-            volume_change = 10 if direction == 1 else -10
-            modern_screen.adjust_volume(volume_change)
-            logger.debug(f"ModernScreen: Adjusted volume by {volume_change}.")
-        
-        elif current_mode == 'webradio':
-            # Adjust volume in WebRadioScreen based on direction
-            volume_change = 10 if direction == 1 else -10
-            webradio_screen.adjust_volume(volume_change)
-            logger.debug(f"WebRadioScreen: Adjusted volume by {volume_change}.")
-        
-        elif current_mode == 'menu':
-            # Only allow scrolling when explicitly in menu mode, prevent unintended menu activation
-            menu_manager.scroll_selection(direction)
-            logger.debug(f"Scrolled menu in mode: {current_mode} with direction: {direction}")
-        
-        elif current_mode == 'tidal':
-            tidal_manager.scroll_selection(direction)
-            logger.debug(f"Scrolled Tidal menu in mode: {current_mode} with direction: {direction}")
-        
-        elif current_mode == 'qobuz':
-            qobuz_manager.scroll_selection(direction)
-            logger.debug(f"Scrolled Qobuz menu in mode: {current_mode} with direction: {direction}")
-        
-        elif current_mode == 'spotify':
-            spotify_manager.scroll_selection(direction)
-            logger.debug(f"Scrolled Spotify menu in mode: {current_mode} with direction: {direction}")
-        
-        elif current_mode == 'playlists':
-            playlist_manager.scroll_selection(direction)
-            logger.debug(f"Scrolled Playlist menu in mode: {current_mode} with direction: {direction}")
-        
-        elif current_mode == 'radio':
-            radio_manager.scroll_selection(direction)
-            logger.debug(f"Scrolled Radio menu in mode: {current_mode} with direction: {direction}")
-        
-        elif current_mode == 'library':
-            library_manager.scroll_selection(direction)
-            logger.debug(f"Scrolled Library menu in mode: {current_mode} with direction: {direction}")
-        
-        elif current_mode == 'usblibrary':
-            usb_library_manager.scroll_selection(direction)
-            logger.debug(f"Scrolled USB Library menu in mode: {current_mode} with direction: {direction}")
-        
-        else:
-            logger.warning(f"Unhandled mode: {current_mode}. No rotary action performed.")
-
-
-
-
-    def on_button_press_inner():
-        current_mode = mode_manager.get_mode()
-
-        if current_mode == 'clock':
-            # Switch from clock mode to menu mode
-            mode_manager.to_menu()
-            logger.info("ModeManager: Switched to 'menu' mode from 'clock' mode.")
-        elif current_mode == 'menu':
-            # Select the currently highlighted menu item
-            menu_manager.select_item()
-            logger.debug(f"MenuManager: Selected item in 'menu' mode.")
-        elif current_mode == 'original':
-            # Toggle play/pause in OriginalScreen mode
-            original_screen.toggle_play_pause()
-            logger.debug("OriginalScreen: Toggled play/pause in 'original' mode.")
-        elif current_mode == 'modern':
-            # Toggle play/pause in ModernScreen mode
-            modern_screen.toggle_play_pause()
-            logger.debug("ModernScreen: Toggled play/pause in 'modern' mode.")
-        elif current_mode == 'webradio':
-            # Toggle play/pause in WebRadioScreen mode
-            webradio_screen.toggle_play_pause()
-            logger.debug("WebRadioScreen: Toggled play/pause in 'webradio' mode.")
-        elif current_mode == 'playback':
-            # Toggle play/pause in Playback mode (if separate)
-            # Assuming 'playback' is managed by OriginalScreen or another manager
-            original_screen.toggle_play_pause()
-            logger.debug("PlaybackManager: Toggled play/pause in 'playback' mode.")
-        elif current_mode == 'radioplayback':
-            # Toggle play/pause in Radioplayback mode (if separate)
-            # Assuming 'radioplayback' is managed by WebRadioScreen or another manager
-            webradio_screen.toggle_play_pause()
-            logger.debug("RadioPlaybackManager: Toggled play/pause in 'radioplayback' mode.")
-        elif current_mode == 'tidal':
-            # Select the currently highlighted item in the Tidal menu
-            tidal_manager.select_item()
-            logger.debug(f"TidalManager: Selected item in 'tidal' mode.")
-        elif current_mode == 'qobuz':
-            # Select the currently highlighted item in the Qobuz menu
-            qobuz_manager.select_item()
-            logger.debug(f"QobuzManager: Selected item in 'qobuz' mode.")
-        elif current_mode == 'spotify':
-            # Select the currently highlighted item in the Spotify menu
-            spotify_manager.select_item()
-            logger.debug(f"SpotifyManager: Selected item in 'spotify' mode.")
-        elif current_mode == 'playlists':
-            # Select the currently highlighted item in the Playlists menu
-            playlist_manager.select_item()
-            logger.debug(f"PlaylistManager: Selected item in 'playlists' mode.")
-        elif current_mode == 'radio':
-            # Select the currently highlighted item in the Radio menu
-            radio_manager.select_item()
-            logger.debug(f"RadioManager: Selected item in 'radio' mode.")
-        elif current_mode == 'library':
-            # Select the currently highlighted item in the Library menu
-            library_manager.select_item()
-            logger.debug(f"LibraryManager: Selected item in 'library' mode.")
-        elif current_mode == 'usblibrary':
-            # Select the currently highlighted item in the USB Library menu
-            usb_library_manager.select_item()
-            logger.debug(f"USBLibraryManager: Selected item in 'usblibrary' mode.")
-        else:
-            logger.warning(f"Unhandled mode: {current_mode}. No button action performed.")
-
-
+    # 22. Route rotary input per mode. GPIO callbacks only queue events; the
+    # dispatcher thread runs these handlers, folding queued rotations together.
+    input_dispatcher = InputDispatcher(mode_manager.get_mode)
+
+    def on_clock_press():
+        # Switch from clock mode to menu mode
+        mode_manager.to_menu()
+        logger.info("ModeManager: Switched to 'menu' mode from 'clock' mode.")
+
+    input_dispatcher.route(PRESS, 'clock', on_clock_press)
+
+    # Now-playing screens: rotation changes the volume, a press toggles play/pause
+    playback_screens = {
+        'original': original_screen,
+        'playback': original_screen,
+        'modern': modern_screen,
+        'webradio': webradio_screen,
+        'radioplayback': webradio_screen,
+    }
+    for mode, screen in playback_screens.items():
+        if mode != 'radioplayback':
+            input_dispatcher.route(ROTATE, mode, lambda steps, screen=screen: screen.adjust_volume(10 * steps))
+        input_dispatcher.route(PRESS, mode, screen.toggle_play_pause)
+
+    # Menus: rotation scrolls, a press selects the highlighted item
+    input_dispatcher.route(ROTATE, 'menu', menu_manager.scroll_selection)
+    input_dispatcher.route(PRESS, 'menu', menu_manager.select_item)
+    list_managers = {
+        'tidal': tidal_manager,
+        'qobuz': qobuz_manager,
+        'spotify': spotify_manager,
+        'playlists': playlist_manager,
+        'radio': radio_manager,
+        'library': library_manager,
+        'usblibrary': usb_library_manager,
+    }
+    for mode, manager in list_managers.items():
+        manager.run_on(input_dispatcher)
+        input_dispatcher.route(ROTATE, mode, manager.rotate)
+        input_dispatcher.route(PRESS, mode, manager.press)
 
     def on_long_press():
         logger.info("Long button press detected")
@@ -340,16 +295,35 @@ def main():
             mode_manager.to_clock()
             logger.info("ModeManager: Switched to 'clock' mode via long press.")
 
+    input_dispatcher.route(LONG_PRESS, None, on_long_press)
+
+    # Track screens: a long press turns the knob into a seek control, 5 s per detent,
+    # until a press, another long press (back to clock) or 5 s without input
+    def on_track_long_press():
+        if not volumio_listener.get_current_state().duration:
+            on_long_press()  # Nothing to scrub through, e.g. a stream
+            return
+        input_dispatcher.enter_submode('scrub', timeout=5.0)
+
+    for mode in ('original', 'playback', 'modern'):
+        screen = playback_screens[mode]
+        input_dispatcher.route(LONG_PRESS, mode, on_track_long_press)
+        input_dispatcher.route(ROTATE, f"{mode}:scrub", lambda steps, screen=screen: screen.scrub(5 * steps))
+        input_dispatcher.route(PRESS, f"{mode}:scrub", input_dispatcher.leave_submode)
+        input_dispatcher.route(LONG_PRESS, f"{mode}:scrub", on_long_press)
+    input_dispatcher.start()
 
     # 23. Initialize RotaryControl
+    rotary_config = config.get('rotary', {})
     rotary_control = RotaryControl(
-        rotation_callback=on_rotate,
-        button_callback=on_button_press_inner,
-        long_press_callback=on_long_press,
-        long_press_threshold=2.5
+        rotation_callback=lambda direction: input_dispatcher.post(ROTATE, direction),
+        button_callback=lambda: input_dispatcher.post(PRESS),
+        long_press_callback=lambda: input_dispatcher.post(LONG_PRESS),
+        long_press_threshold=rotary_config.get('long_press_threshold', 2.5),
+        decoder=rotary_config.get('decoder', 'interrupt')
     )
 
-    rotary_control.start()  # Start listening to rotary events
+    rotary_control.start()  # Start listening to rotary events; returns at once
 
     # 24. Run the Main Application Loop
     try:
@@ -360,7 +334,8 @@ def main():
     finally:
         buttons_leds.stop()
         rotary_control.stop()
-        volumio_listener.stop_listener()
+        input_dispatcher.stop()
+        volumio_listener.stop()
         clock.stop()
         display_manager.clear_screen()
         logger.info("Quadify has been shut down gracefully.")
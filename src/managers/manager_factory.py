@@ -14,11 +14,12 @@ from display.screens.original_screen import OriginalScreen
 
 
 class ManagerFactory:
-    def __init__(self, display_manager, volumio_listener, mode_manager, config):
+    def __init__(self, display_manager, volumio_listener, mode_manager, config, spectrum_source=None):
         self.display_manager = display_manager
         self.volumio_listener = volumio_listener
         self.mode_manager = mode_manager
         self.config = config
+        self.spectrum_source = spectrum_source
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.INFO)
         self.logger.info("ManagerFactory initialized.")
@@ -91,7 +92,11 @@ class ManagerFactory:
 
     def create_library_manager(self):
         volumio_config = self.config.get('volumio', {})
-        return LibraryManager(self.display_manager, volumio_config, self.mode_manager)
+        return LibraryManager(
+            self.display_manager, volumio_config, self.mode_manager,
+            browse_cache=self.volumio_listener.browse_cache,
+            rest=getattr(self.volumio_listener, 'rest', None)
+        )
 
     def create_usb_library_manager(self):
         return USBLibraryManager(self.display_manager, self.volumio_listener, self.mode_manager)
@@ -101,7 +106,7 @@ class ManagerFactory:
         return WebRadioScreen(self.display_manager, self.volumio_listener, self.mode_manager)
 
     def create_modern_screen(self):
-        return ModernScreen(self.display_manager, self.volumio_listener, self.mode_manager)
+        return ModernScreen(self.display_manager, self.volumio_listener, self.mode_manager, self.spectrum_source)
 
     def create_original_screen(self):
         return OriginalScreen(self.display_manager, self.volumio_listener, self.mode_manager)
@@ -3,6 +3,8 @@ from abc import ABC, abstractmethod
 import logging
 import threading
 
+from managers.menus.list_scroller import ListScroller
+
 class SingletonMeta(type):
     """
     A thread-safe implementation of Singleton.
@@ -26,6 +28,12 @@ class BaseManager(ABC):
         self.is_active = False
         self.on_mode_change_callbacks = []
 
+        # Rotary scrolling with acceleration and per-burst rendering
+        self.list_scroller = ListScroller(self)
+
+        # Thread that owns the menu state, set by run_on(); see on_ui()
+        self.ui_dispatcher = None
+
         # Initialize logger
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.INFO)  # Set to INFO or adjust as needed
@@ -54,6 +62,62 @@ class BaseManager(ABC):
             except Exception as e:
                 self.logger.error(f"Error in callback {callback}: {e}")
 
+    def selection_items(self):
+        """The list the rotary scrolls through; a BrowseList enables letter jumps."""
+        return getattr(self, 'current_menu_items', None) or []
+
+    def run_on(self, dispatcher):
+        """Run this menu's deferred work (trailing scrolls, loaded results) on `dispatcher`'s thread."""
+        self.ui_dispatcher = dispatcher
+        self.list_scroller.run_on(dispatcher)
+
+    def on_ui(self, callback, *args):
+        """
+        Run `callback(*args)` on the UI thread, in order with input events, so
+        results from worker threads never change the menu under a handler.
+        Runs it straight away when no dispatcher is attached.
+        """
+        if self.ui_dispatcher is None:
+            callback(*args)
+        else:
+            self.ui_dispatcher.call_soon(lambda: callback(*args))
+
+    def rotate(self, steps):
+        """Rotary detents: scroll_selection(), accelerated and coalesced by the ListScroller."""
+        if not self.is_active:
+            return
+        self.list_scroller.rotate(steps)
+
+    def press(self):
+        """Rotary press: select_item() on the row the knob reached, even if its scroll is still pending."""
+        if self.is_active:
+            self.list_scroller.flush()
+        self.select_item()
+
+    def is_navigable(self, item):
+        """Whether selecting `item` opens another listing; menus that browse override this."""
+        return False
+
+    def prefetch_selection(self):
+        """Prefetch the highlighted item's children when selecting it would navigate into it."""
+        uri = None
+        items = self.selection_items()
+        index = getattr(self, 'current_selection_index', 0)
+        if self.is_active and 0 <= index < len(items):
+            item = items[index]
+            if item.get("uri") and self.is_navigable(item):
+                uri = item["uri"]
+        self.prefetch_highlighted(uri)
+
+    def prefetch_highlighted(self, uri):
+        """
+        Tell the shared browse prefetcher the selection rests on `uri`.
+        Pass None when the highlighted item cannot be navigated into.
+        """
+        prefetcher = getattr(self.volumio_listener, 'prefetcher', None)
+        if prefetcher:
+            prefetcher.hover(uri)
+
     def clear_display(self):
         self.display_manager.clear_screen()
         self.logger.info("Cleared the display screen.")
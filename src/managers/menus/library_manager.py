@@ -2,30 +2,43 @@
 # src/managers/library_manager.py
 
 import os
+import time
 import logging
 import requests
 import threading
-from threading import Thread, Event
-from requests.adapters import HTTPAdapter
-from urllib.parse import quote
-from urllib3.util.retry import Retry
+from threading import Event
+from collections import OrderedDict
 from PIL import Image, ImageDraw, ImageFont
 from managers.menus.base_manager import BaseManager  # Adjust import based on your project structure
+from network.browse_cache import BrowseCache, STALE
+from network.browse_list import BrowseList
+from network.browse_prefetcher import BrowsePrefetcher
+from network.rest_worker import VolumioRestWorker, BACKGROUND, RequestCancelled, DeadlineExceeded
 
 class LibraryManager(BaseManager):
-    def __init__(self, display_manager, volumio_config, mode_manager, window_size=3, y_offset=0, line_spacing=16):
+    def __init__(self, display_manager, volumio_config, mode_manager, window_size=3, y_offset=0, line_spacing=16, browse_cache=None, rest=None):
         super().__init__(display_manager, volumio_config, mode_manager)
 
-        # REST API setup
+        # Browse cache, normally shared with the Socket.IO menu managers. A folder
+        # is fetched once and reused for album detection and for display.
+        self.browse_cache = browse_cache if browse_cache is not None else BrowseCache()
+
+        # Album/folder classification by URI, so revisits skip the check entirely
+        self.album_folder_cache = OrderedDict()
+        self.album_folder_cache_size = 1000
+
+        # REST API setup. Requests run on worker threads with deadlines, so a slow
+        # NAS or restarting Volumio never blocks the rotary/button thread. The
+        # asyncio transport passes its own client with the same interface.
         self.volumio_host = volumio_config.get('host', 'localhost')
         self.volumio_port = volumio_config.get('port', 3000)
         self.base_url = f"http://{self.volumio_host}:{self.volumio_port}"
+        self.rest = rest if rest is not None else VolumioRestWorker(
+            self.base_url, default_deadline=volumio_config.get('request_deadline', 8)
+        )
 
-        # Initialize session with retry logic
-        self.session = requests.Session()
-        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
-        self.session.mount('http://', HTTPAdapter(max_retries=retries))
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
+        # Warm the cache with the highlighted folder while the knob rests on it
+        self.prefetcher = BrowsePrefetcher(self._prefetch_navigation, self.browse_cache)
 
         self.mode_name = "library"
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -37,6 +50,9 @@ class LibraryManager(BaseManager):
 
         # Initialize state variables
         self.current_menu_items = []
+        self.loading_more = False  # True while only the first rows of a big folder are shown
+        self._load_started = None  # (uri, monotonic time) of the folder being loaded
+        self._folder_probe = None  # Future of the selected folder whose contents are being checked
         self.current_selection_index = 0
         self.window_start_index = 0
         self.is_active = False
@@ -114,25 +130,126 @@ class LibraryManager(BaseManager):
         self.is_active = False
         self.display_manager.clear_screen()
         self.logger.info("LibraryManager: Stopped Library mode and cleared display.")
+        self.prefetch_highlighted(None)
+        self.rest.cancel_pending()
 
     def fetch_navigation(self, uri):
-        """Fetch navigation data dynamically for any folder in the music library."""
+        """
+        Show the folder at `uri`. Cached listings are drawn immediately; otherwise the
+        listing is requested on the REST worker and drawn when it arrives, provided
+        the user is still on that folder.
+        """
         self.logger.info(f"LibraryManager: Fetching navigation data for URI: {uri}")
+        navigation, freshness = self.browse_cache.get(uri)
+        if navigation is not None:
+            self.logger.debug(f"LibraryManager: Using {freshness} cached navigation for URI: {uri}")
+            if freshness == STALE:
+                self._revalidate_navigation(uri, navigation)
+            self.show_navigation(navigation)
+            return
+
+        # A new destination supersedes whatever was still loading. Big folders are
+        # streamed, so their first rows are drawn while the rest is still arriving.
+        # A prefetch of the folder already on the wire is waited for instead.
+        self.rest.cancel_pending()
+        self._load_started = (uri, time.monotonic())
+        future = self.prefetcher.claim(uri) or self.rest.browse(
+            uri, on_first_items=lambda items, uri=uri: self.on_ui(self._on_first_items, uri, items)
+        )
+        future.add_done_callback(lambda done, uri=uri: self.on_ui(self._on_navigation_loaded, uri, done))
+
+    def _on_first_items(self, uri, items):
+        """UI-thread callback with the first rows of a folder that is still loading."""
+        if not self.is_active or self.current_path != uri:
+            return
+        self.current_menu_items = BrowseList(items, lower=True)
+        self.loading_more = True
+        self.logger.info(f"LibraryManager: First {len(items)} rows of {uri} after {self._load_time(uri)}.")
+        self.display_menu()
+        self.prefetch_selection()
+
+    def _on_navigation_loaded(self, uri, future):
+        """UI-thread callback for fetch_navigation()."""
+        navigation = self._navigation_result(uri, future)
+        if navigation is None:
+            return
+        if not self.is_active or self.current_path != uri:
+            self.logger.debug(f"LibraryManager: Navigated away from {uri}, not drawing it.")
+            return
+        self.logger.info(f"LibraryManager: Listing of {uri} complete after {self._load_time(uri)}.")
+        if self.loading_more and self.menu_stack and isinstance(self.menu_stack[-1], dict):
+            # Options were opened from the first rows; go back to the complete listing
+            items = (navigation.get("lists") or [{}])[0].get("items") or []
+            self.menu_stack[-1]["menu_items"] = BrowseList(items, lower=True)
+            self.loading_more = False
+            return
+        self.show_navigation(navigation)
+
+    def _load_time(self, uri):
+        if not self._load_started or self._load_started[0] != uri:
+            return "?"
+        return f"{(time.monotonic() - self._load_started[1]) * 1000:.0f} ms"
+
+    def _navigation_result(self, uri, future):
+        """
+        Unpack a browse future, caching the listing on success. Errors are shown
+        only while the user is still waiting on `uri`; returns None on failure.
+        """
+        if future.cancelled():
+            return None
         try:
-            # API request to fetch navigation data
-            response = self.session.get(f"{self.base_url}/api/v1/browse?uri={quote(uri)}")
-            self.logger.debug(f"LibraryManager: Received Status Code: {response.status_code}")
-            self.logger.debug(f"LibraryManager: Received Response: {response.text}")
-
-            # Handle non-200 status codes
-            if response.status_code != 200:
-                self.logger.error(f"LibraryManager: Failed to fetch data. Status Code: {response.status_code}")
-                self.display_error_message("Fetch Error", f"Failed to fetch data: {response.status_code}")
+            navigation = future.result()
+        except RequestCancelled:
+            self.logger.debug(f"LibraryManager: Request for {uri} superseded.")
+            return None
+        except Exception as e:
+            if self.is_active and self.current_path == uri:
+                self._display_fetch_error(e)
+            else:
+                self.logger.debug(f"LibraryManager: Ignoring failed request for {uri}: {e}")
+            return None
+
+        self.browse_cache.put(uri, navigation, 'library')
+        return navigation
+
+    def _display_fetch_error(self, error):
+        if isinstance(error, requests.HTTPError):
+            status_code = error.response.status_code if error.response is not None else "?"
+            self.logger.error(f"LibraryManager: Failed to fetch data. Status Code: {status_code}")
+            self.display_error_message("Fetch Error", f"Failed to fetch data: {status_code}")
+        elif isinstance(error, DeadlineExceeded):
+            self.logger.error(f"LibraryManager: {error}")
+            self.display_error_message("Fetch Error", "Volumio did not respond in time.")
+        elif isinstance(error, ValueError):
+            self.logger.error(f"LibraryManager: JSON decoding failed: {error}")
+            self.display_error_message("Fetch Error", f"Invalid response format: {error}")
+        else:
+            self.logger.error(f"LibraryManager: Exception occurred while fetching navigation: {str(error)}")
+            self.display_error_message("Fetch Error", f"An error occurred: {str(error)}")
+
+    def _revalidate_navigation(self, uri, cached_navigation):
+        """Refresh a stale cached listing in the background and redraw if it changed while still on screen."""
+        def on_done(future):
+            if future.cancelled() or future.exception() is not None:
+                self.logger.debug(f"LibraryManager: Revalidation of {uri} failed.")
+                return
+            navigation = future.result()
+            self.browse_cache.put(uri, navigation, 'library')
+            if navigation == cached_navigation:
                 return
+            self.album_folder_cache.pop(uri, None)
+            if self.is_active and self.current_path == uri:
+                self.logger.info(f"LibraryManager: Listing for {uri} changed, refreshing.")
+                self.show_navigation(navigation)
+
+        self.rest.browse(uri, priority=BACKGROUND, cancellable=False).add_done_callback(
+            lambda done: self.on_ui(on_done, done)
+        )
 
-            # Parse the response JSON
-            data = response.json()
-            navigation = data.get("navigation", {})
+    def show_navigation(self, navigation):
+        """Turn a navigation block into the current menu and draw it."""
+        self.loading_more = False
+        try:
             lists = navigation.get("lists", [])
 
             if not lists:
@@ -148,26 +265,15 @@ class LibraryManager(BaseManager):
                 return
 
             # Update current menu items
-            self.current_menu_items = [
-                {
-                    "title": item.get("title", "Untitled"),
-                    "uri": item.get("uri", ""),
-                    "type": item.get("type", "").lower(),
-                    "service": item.get("service", "").lower(),
-                    "albumart": item.get("albumart", None)
-                }
-                for item in items
-            ]
-
-            self.logger.info(f"LibraryManager: Fetched {len(self.current_menu_items)} items for URI: {uri}")
+            self.current_menu_items = BrowseList(items, lower=True)
+
+            self.logger.info(f"LibraryManager: Loaded {len(self.current_menu_items)} items for URI: {self.current_path}")
             if self.is_active:
                 self.display_menu()
+                self.prefetch_selection()
 
-        except ValueError as ve:
-            self.logger.error(f"LibraryManager: JSON decoding failed: {ve}")
-            self.display_error_message("Fetch Error", f"Invalid response format: {ve}")
         except Exception as e:
-            self.logger.error(f"LibraryManager: Exception occurred while fetching navigation: {str(e)}")
+            self.logger.error(f"LibraryManager: Exception occurred while showing navigation: {str(e)}")
             self.display_error_message("Fetch Error", f"An error occurred: {str(e)}")
 
     def select_item(self):
@@ -188,18 +294,21 @@ class LibraryManager(BaseManager):
             item_type = selected_item.get("type", "").lower()
 
             if item_type in ["folder", "streaming-category", "streaming-folder", "remdisk"]:
-                # Check if the selected item is an album
-                if self.is_album_folder(selected_item):
-                    # Display album options (submenu)
-                    self.logger.info(f"LibraryManager: Displaying options for album: {selected_item.get('title')}")
-                    self.display_folder_or_album_options(selected_item)
-                else:
-                    # Navigate into the folder
-                    self.logger.info(f"LibraryManager: Navigating into: {selected_item.get('title')}")
-                    self.menu_stack.append(self.current_path)  # Save the current path
-                    self.current_path = selected_item.get("uri")
+                if self.is_album_folder(selected_item) is None:
+                    # Contents unknown: load them off the input thread, then decide
+                    folder_uri = selected_item.get("uri")
                     self.display_loading_screen()
-                    self.fetch_navigation(self.current_path)
+                    # Only an earlier probe is superseded: the rest of this listing may
+                    # still be streaming in, and the menu stack needs all of it
+                    if self._folder_probe is not None:
+                        self._folder_probe.cancel()
+                    future = self.prefetcher.claim(folder_uri) or self.rest.browse(folder_uri)
+                    self._folder_probe = future
+                    future.add_done_callback(
+                        lambda done, item=selected_item, path=self.current_path: self.on_ui(self._on_folder_loaded, item, path, done)
+                    )
+                else:
+                    self.open_folder(selected_item)
 
             elif item_type == "song":
                 # Play the selected song
@@ -215,29 +324,75 @@ class LibraryManager(BaseManager):
                 self.logger.warning(f"LibraryManager: Unknown item type '{item_type}'.")
                 self.display_error_message("Invalid Selection", "Selected item is not recognized.")
 
+    def _on_folder_loaded(self, folder_item, from_path, future):
+        """UI-thread callback once a selected folder's contents are known."""
+        folder_uri = folder_item.get("uri")
+        if future is not self._folder_probe:
+            return
+        self._folder_probe = None
+        # Errors belong to the folder being opened, which is not current_path yet
+        if future.cancelled():
+            return
+        try:
+            navigation = future.result()
+        except RequestCancelled:
+            return
+        except Exception as e:
+            if self.is_active and self.current_path == from_path:
+                self._display_fetch_error(e)
+            return
+
+        self.browse_cache.put(folder_uri, navigation, 'library')
+        if not self.is_active or self.current_path != from_path:
+            self.logger.debug(f"LibraryManager: Navigated away before {folder_uri} loaded.")
+            return
+        self.open_folder(folder_item)
+
+    def open_folder(self, folder_item):
+        """Show album options for album folders, otherwise navigate into the folder."""
+        if self.is_album_folder(folder_item):
+            # Display album options (submenu)
+            self.logger.info(f"LibraryManager: Displaying options for album: {folder_item.get('title')}")
+            self.display_folder_or_album_options(folder_item)
+        else:
+            # Navigate into the folder
+            self.logger.info(f"LibraryManager: Navigating into: {folder_item.get('title')}")
+            self.menu_stack.append(self.current_path)  # Save the current path
+            self.current_path = folder_item.get("uri")
+            self.display_loading_screen()
+            self.fetch_navigation(self.current_path)
+
     def is_album_folder(self, item):
-        """Determine if the folder represents an album."""
+        """
+        Determine if the folder represents an album. Returns None when the
+        folder's contents are neither classified nor cached yet.
+        """
         # Adjust the logic based on your folder structure
         # For example, if albums are folders that contain only songs, we can check that
         folder_uri = item.get("uri")
         if not folder_uri:
             return False
 
-        try:
-            # Fetch the contents of the folder
-            response = self.session.get(f"{self.base_url}/api/v1/browse?uri={quote(folder_uri)}")
-            if response.status_code != 200:
-                self.logger.warning(f"LibraryManager: Failed to fetch contents for album check: {folder_uri}")
-                return False
+        if folder_uri in self.album_folder_cache:
+            self.album_folder_cache.move_to_end(folder_uri)
+            return self.album_folder_cache[folder_uri]
+
+        # Classify from the cached listing; it is reused when navigating into the folder
+        navigation, _ = self.browse_cache.get(folder_uri)
+        if navigation is None:
+            return None
 
-            folder_data = response.json()
-            items = folder_data.get("navigation", {}).get("lists", [{}])[0].get("items", [])
+        try:
+            items = (navigation.get("lists") or [{}])[0].get("items", [])
 
             # If all items are songs, or there are no subfolders, consider it an album
             has_songs = any(item.get("type", "").lower() == "song" for item in items)
             has_subfolders = any(item.get("type", "").lower() == "folder" for item in items)
 
             is_album = has_songs and not has_subfolders
+            self.album_folder_cache[folder_uri] = is_album
+            if len(self.album_folder_cache) > self.album_folder_cache_size:
+                self.album_folder_cache.popitem(last=False)
             return is_album
 
         except Exception as e:
@@ -285,30 +440,16 @@ class LibraryManager(BaseManager):
             return
 
         self.logger.info(f"LibraryManager: Playing all songs from folder: {folder_item.get('title')}")
-        Thread(target=self._play_album_or_folder_thread, args=(folder_uri, folder_item.get('title')), daemon=True).start()
-
-    def _play_album_or_folder_thread(self, folder_uri, album_title):
-        """Thread to handle playing all songs in a folder."""
-        try:
-            # Step 1: Replace current queue with album's tracks and start playback
-            replace_and_play_url = f"{self.base_url}/api/v1/replaceAndPlay"
-            data = {
-                "name": album_title,
-                "service": "mpd",
-                "uri": folder_uri
-            }
-            replace_response = self.session.post(replace_and_play_url, json=data)
-
-            if replace_response.status_code == 200:
-                self.logger.info(f"LibraryManager: Playback started successfully for the album: {album_title}")
-                self.display_success_message("Playback Started", f"Playing album: {album_title}")
-            else:
-                self.logger.error(f"LibraryManager: Failed to start playback for album: {album_title}. Status Code: {replace_response.status_code}, Response: {replace_response.text}")
-                self.display_error_message("Playback Error", f"Failed to start playback: {replace_response.status_code}")
-
-        except Exception as e:
-            self.logger.error(f"LibraryManager: Failed to play album: {str(e)}")
-            self.display_error_message("Playback Error", f"Could not play album: {str(e)}")
+        album_title = folder_item.get('title')
+        data = {
+            "name": album_title,
+            "service": "mpd",
+            "uri": folder_uri
+        }
+        # Replace current queue with album's tracks and start playback
+        self.rest.post("replaceAndPlay", data).add_done_callback(
+            lambda done: self.on_ui(self._on_playback_started, done, f"Playing album: {album_title}")
+        )
 
     def replace_and_play(self, item):
         """Replace current queue and play the selected item."""
@@ -319,25 +460,31 @@ class LibraryManager(BaseManager):
             return
 
         self.logger.info(f"LibraryManager: Replacing and playing item: {item.get('title')}")
-        try:
-            replace_and_play_url = f"{self.base_url}/api/v1/replaceAndPlay"
-            data = {
-                "name": item.get("title", "Untitled"),
-                "service": item.get("service", "mpd"),
-                "uri": song_uri
-            }
-            response = self.session.post(replace_and_play_url, json=data)
-
-            if response.status_code == 200:
-                self.logger.info(f"LibraryManager: Playback started successfully for: {item.get('title')}")
-                self.display_success_message("Playback Started", f"Playing: {item.get('title')}")
-            else:
-                self.logger.error(f"LibraryManager: Failed to start playback. Status Code: {response.status_code}, Response: {response.text}")
-                self.display_error_message("Playback Error", f"Failed to start playback: {response.status_code}")
+        data = {
+            "name": item.get("title", "Untitled"),
+            "service": item.get("service", "mpd"),
+            "uri": song_uri
+        }
+        self.rest.post("replaceAndPlay", data).add_done_callback(
+            lambda done: self.on_ui(self._on_playback_started, done, f"Playing: {item.get('title')}")
+        )
 
+    def _on_playback_started(self, future, message):
+        """UI-thread callback for replaceAndPlay requests."""
+        try:
+            future.result()
+        except requests.HTTPError as he:
+            status_code = he.response.status_code if he.response is not None else "?"
+            self.logger.error(f"LibraryManager: Failed to start playback. Status Code: {status_code}")
+            self.display_error_message("Playback Error", f"Failed to start playback: {status_code}")
+            return
         except Exception as e:
             self.logger.error(f"LibraryManager: Exception occurred while trying to play item: {str(e)}")
             self.display_error_message("Playback Error", f"Could not play item: {str(e)}")
+            return
+
+        self.logger.info(f"LibraryManager: Playback started successfully. {message}")
+        self.display_success_message("Playback Started", message)
 
     def display_loading_screen(self):
         """Show a loading screen."""
@@ -363,6 +510,8 @@ class LibraryManager(BaseManager):
         is_submenu = bool(self.menu_stack and isinstance(self.menu_stack[-1], dict) and "menu_title" in self.menu_stack[-1])
         if is_submenu:
             menu_title = self.menu_stack[-1].get("menu_title", menu_title)
+        elif self.loading_more:
+            menu_title = f"{menu_title[:17]}..."
 
         self.logger.info(f"LibraryManager: Displaying menu: {menu_title}")
 
@@ -463,6 +612,28 @@ class LibraryManager(BaseManager):
 
         self.logger.debug(f"LibraryManager: Scrolled from {previous_index} to {self.current_selection_index}.")
         self.display_menu()
+        self.prefetch_selection()
+
+    def is_navigable(self, item):
+        return item.get("type") in ["folder", "streaming-category", "streaming-folder", "remdisk"]
+
+    def prefetch_highlighted(self, uri):
+        self.prefetcher.hover(uri)
+
+    def _prefetch_navigation(self, uri):
+        """
+        Low-priority browse used by the prefetcher; the listing lands in the shared cache.
+        Not cancellable by cancel_pending(): opening the prefetched folder must not discard it.
+        The prefetcher cancels its own futures.
+        """
+        future = self.rest.browse(uri, priority=BACKGROUND, cancellable=False)
+
+        def store(done):
+            if not done.cancelled() and done.exception() is None:
+                self.browse_cache.put(uri, done.result(), 'library')
+
+        future.add_done_callback(store)
+        return future
 
     def display_no_items(self):
         """Display a message if no items are available."""
@@ -524,6 +695,8 @@ class LibraryManager(BaseManager):
 
     def go_back(self):
         """Handle going back to the previous navigation level."""
+        # Whatever was loading for the level being left is no longer wanted
+        self.rest.cancel_pending()
         if self.menu_stack:
             # Check if we're in a submenu
             if isinstance(self.menu_stack[-1], dict) and "menu_title" in self.menu_stack[-1]:
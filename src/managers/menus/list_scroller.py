@@ -0,0 +1,95 @@
+# src/managers/menus/list_scroller.py
+
+import time
+import logging
+from collections import deque
+
+from network.control_coalescer import ControlCoalescer
+
+
+class ListScroller:
+    """
+    Rotary input for a menu manager's list: accelerated and coalesced.
+
+    Detents are counted over the last `rate_window` seconds. Below
+    `letter_rate` detents per second each one moves a row; spun faster, each
+    detent jumps to the next (or previous) letter of lists that have a
+    letter index (BrowseList.jump), so a 3,000 entry artist folder is
+    crossed in a couple of turns. Moves go through a ControlCoalescer: the
+    first is drawn at once and the rest of a burst is folded into one
+    scroll_selection() every `interval` seconds, so only the positions the
+    screen can show are rendered. After run_on(dispatcher) the trailing
+    moves run on the InputDispatcher thread like every other menu action.
+
+    A target belongs to the list it was scrolled in: once the manager shows
+    another list, whatever was still pending is dropped instead of being
+    applied to the new one.
+    """
+
+    def __init__(self, manager, interval=0.06, letter_rate=12.0, rate_window=0.25):
+        self.logger = logging.getLogger("ListScroller")
+        self.manager = manager
+        self.letter_rate = letter_rate
+        self.rate_window = rate_window
+
+        self._detents = deque()
+        self._items = None  # the list the current target indexes
+        self.letter_jumps = 0
+
+        # Menus apply a move synchronously, so the target only needs to outlive one burst
+        self.coalescer = ControlCoalescer(
+            self._scroll_to, self._current_index, self._bounds,
+            interval=interval, settle_time=interval * 3, name=f"{manager.__class__.__name__} selection",
+        )
+
+    def run_on(self, dispatcher):
+        """Run trailing moves on `dispatcher`'s thread instead of a timer thread."""
+        self.coalescer.schedule = dispatcher.call_later
+
+    def rotate(self, steps):
+        """Handle `steps` detents of the rotary encoder (negative counter-clockwise)."""
+        if not steps:
+            return
+        now = time.monotonic()
+        self._detents.extend([now] * abs(steps))
+        while self._detents and now - self._detents[0] > self.rate_window:
+            self._detents.popleft()
+        rate = len(self._detents) / self.rate_window
+
+        items = self.manager.selection_items()
+        if items is not self._items:
+            self.coalescer.reset()
+            self._items = items
+        if rate >= self.letter_rate and hasattr(items, 'jump'):
+            target = self.coalescer.target
+            index = target if target is not None else self._current_index()
+            direction = 1 if steps > 0 else -1
+            for _ in range(abs(steps)):
+                index = items.jump(index, direction)
+            self.letter_jumps += abs(steps)
+            self.coalescer.set(index)
+        else:
+            self.coalescer.nudge(steps)
+
+    def _current_index(self):
+        return self.manager.current_selection_index
+
+    def _bounds(self):
+        return 0, max(0, len(self.manager.selection_items()) - 1)
+
+    def flush(self):
+        """Apply a move still waiting for its interval, e.g. before the highlighted item is selected."""
+        self.coalescer.flush()
+
+    def _scroll_to(self, index):
+        if self.manager.selection_items() is not self._items:
+            self.coalescer.reset()
+            return
+        delta = index - self.manager.current_selection_index
+        if delta:
+            self.manager.scroll_selection(delta)
+
+    def stats(self):
+        stats = self.coalescer.stats()
+        stats['letter_jumps'] = self.letter_jumps
+        return stats
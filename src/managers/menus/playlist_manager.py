@@ -1,7 +1,8 @@
 from managers.menus.base_manager import BaseManager
+from network.browse_list import BrowseList
 import logging
 from PIL import ImageFont
-import threading
+from network.command_pipeline import CommandStep, playing
 
 class PlaylistManager(BaseManager):
     def __init__(self, display_manager, volumio_listener, mode_manager, window_size=4, y_offset=5, line_spacing=15):
@@ -37,11 +38,12 @@ class PlaylistManager(BaseManager):
             self.logger.info("Exiting Playlist mode.")
             self.stop_mode()
 
-    def handle_track_change(self, sender, track, **kwargs):
+    def handle_track_change(self, sender, changes=None, state=None, **kwargs):
         """Handle track changes from Volumio."""
-        if track.get('service') == 'qobuz':
-            self.logger.info("QobuzManager: Track changed, updating display.")
-            self.update_song_info(track)
+        state = state if state is not None else self.volumio_listener.get_current_state()
+        if state.get('service') == 'qobuz':
+            self.logger.info("PlaylistManager: Track changed, updating display.")
+            self.update_song_info(state)
 
     def start_mode(self):
         if self.is_active:
@@ -132,15 +134,7 @@ class PlaylistManager(BaseManager):
             self.display_no_items()
             return
 
-        self.current_menu_items = [
-            {
-                "title": item.get("title", "Untitled"),
-                "uri": item.get("uri", ""),
-                "type": item.get("type", ""),
-                "service": item.get("service", "")
-            }
-            for item in combined_items
-        ]
+        self.current_menu_items = BrowseList(combined_items)
 
         self.logger.info(f"PlaylistManager: Updated menu with {len(self.current_menu_items)} items.")
 
@@ -176,15 +170,17 @@ class PlaylistManager(BaseManager):
         self.logger.info(f"PlaylistManager: Sending playPlaylist command for playlist name: {name}")
         if self.volumio_listener.is_connected():
             try:
-                # Suppress state changes
+                # Suppress state changes until the playlist is actually playing
                 self.mode_manager.suppress_state_change()
 
                 # Use playPlaylist to play the playlist by name
-                self.volumio_listener.socketIO.emit('playPlaylist', {'name': name})
+                self.volumio_listener.commands.run(
+                    "playlist play",
+                    [CommandStep('playPlaylist', {'name': name})],
+                    expect=playing(),
+                    on_settled=self.mode_manager.allow_state_change,
+                )
                 self.logger.info(f"PlaylistManager: Sent playPlaylist command for playlist name: {name}")
-
-                # Allow state changes after a short delay
-                threading.Timer(1.0, self.mode_manager.allow_state_change).start()
             except Exception as e:
                 self.logger.error(f"PlaylistManager: Failed to play playlist '{name}': {e}")
                 self.display_error_message("Playback Error", f"Could not play playlist: {e}")
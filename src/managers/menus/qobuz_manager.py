@@ -1,9 +1,10 @@
 # src/managers/qobuz_manager.py
 from managers.menus.base_manager import BaseManager
+from network.browse_list import BrowseList
 import logging
 from PIL import ImageFont
-import threading
 import time
+from network.command_pipeline import CommandStep, playing
 
 # src/managers/qobuz_manager.py
 
@@ -60,6 +61,7 @@ class QobuzManager(BaseManager):
         self.is_active = False
         self.display_manager.clear_screen()
         self.logger.info("QobuzManager: Stopped Qobuz mode and cleared display.")
+        self.prefetch_highlighted(None)
 
         # Disconnect signals
         self.volumio_listener.navigation_received.disconnect(self.handle_navigation)
@@ -118,11 +120,12 @@ class QobuzManager(BaseManager):
             self.logger.info("QobuzManager: State changed, updating display.")
             self.update_song_info(state)
     
-    def handle_track_change(self, sender, track, **kwargs):
+    def handle_track_change(self, sender, changes=None, state=None, **kwargs):
         """Handle track changes from Volumio."""
-        if track.get('service') == 'qobuz':
+        state = state if state is not None else self.volumio_listener.get_current_state()
+        if state.get('service') == 'qobuz':
             self.logger.info("QobuzManager: Track changed, updating display.")
-            self.update_song_info(track)
+            self.update_song_info(state)
 
     def display_loading_screen(self):
         """Display a loading screen."""
@@ -165,19 +168,13 @@ class QobuzManager(BaseManager):
             self.display_no_items()
             return
 
-        self.current_menu_items = [
-            {
-                "title": item.get("title", "Untitled"),
-                "uri": item.get("uri", ""),
-                "type": item.get("type", "")
-            }
-            for item in combined_items
-        ]
+        self.current_menu_items = BrowseList(combined_items)
 
         self.logger.info(f"QobuzManager: Updated menu with {len(self.current_menu_items)} items.")
 
         if self.is_active:
             self.display_menu()
+            self.prefetch_selection()
 
 
     def display_no_items(self):
@@ -225,6 +222,10 @@ class QobuzManager(BaseManager):
         self.current_selection_index = max(0, min(self.current_selection_index, len(self.current_menu_items) - 1))
         self.logger.debug(f"QobuzManager: Scrolled from {previous_index} to {self.current_selection_index}.")
         self.display_menu()
+        self.prefetch_selection()
+
+    def is_navigable(self, item):
+        return not item["uri"].startswith("qobuz://song/") and item.get("type", "").lower() != "song"
 
     def select_item(self):
         if not self.is_active or not self.current_menu_items:
@@ -262,21 +263,23 @@ class QobuzManager(BaseManager):
         self.logger.info(f"QobuzManager: Sending replaceAndPlay command for URI: {uri}")
         if self.volumio_listener.is_connected():
             try:
-                # Suppress state changes
+                # Suppress state changes until the song is actually playing
                 self.mode_manager.suppress_state_change()
 
                 # Use replaceAndPlay to directly play the song
                 selected_item = self.current_menu_items[self.current_selection_index]
                 song_title = selected_item.get("title", "Untitled")
-                self.volumio_listener.socketIO.emit('replaceAndPlay', {
-                    "service": "qobuz",
-                    "uri": uri,
-                    "title": song_title
-                })
+                self.volumio_listener.commands.run(
+                    "qobuz play",
+                    [CommandStep('replaceAndPlay', {
+                        "service": "qobuz",
+                        "uri": uri,
+                        "title": song_title
+                    })],
+                    expect=playing(uri, song_title),
+                    on_settled=self.mode_manager.allow_state_change,
+                )
                 self.logger.info(f"QobuzManager: Sent replaceAndPlay command for '{song_title}' to Volumio.")
-
-                # Allow state changes after a short delay
-                threading.Timer(1.0, self.mode_manager.allow_state_change).start()
             except Exception as e:
                 self.logger.error(f"QobuzManager: Failed to play track {uri}: {e}")
                 self.display_error_message("Playback Error", f"Could not play track: {e}")
@@ -313,6 +316,7 @@ class QobuzManager(BaseManager):
         self.window_start_index = previous_context["window_start_index"]
         self.logger.debug("QobuzManager: Restored previous menu context from stack.")
         self.display_menu()
+        self.prefetch_selection()
 
     def handle_toast_message(self, sender, message):
         """Handle toast messages from Volumio, especially errors."""
@@ -3,8 +3,9 @@
 from managers.menus.base_manager import BaseManager
 import logging
 from PIL import ImageFont
-import threading
 import time
+from network.browse_list import BrowseList
+from network.command_pipeline import CommandStep, playing
 
 
 class RadioManager(BaseManager):
@@ -21,10 +22,9 @@ class RadioManager(BaseManager):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs
 
-        # Radio categories list
-        self.categories = []
-        self.category_items = []  # Initialize category_items
-        self.stations = []
+        # Radio categories and stations, as compact BrowseLists
+        self.categories = BrowseList()
+        self.stations = BrowseList()
         self.current_selection_index = 0
         self.current_menu = "categories"  # Start in the categories menu
         self.font_key = 'menu_font'
@@ -82,7 +82,7 @@ class RadioManager(BaseManager):
         self.window_start_index = 0  # Reset window_start_index when starting mode
         self.current_menu = "categories"
         self.menu_stack.clear()
-        self.stations.clear()
+        self.stations = BrowseList()
 
         # Connect signals
         self.connect_signals()
@@ -98,6 +98,7 @@ class RadioManager(BaseManager):
             return
         self.is_active = False
         self.display_manager.clear_screen()
+        self.prefetch_highlighted(None)
 
         # Disconnect signals
         self.disconnect_signals()
@@ -111,7 +112,7 @@ class RadioManager(BaseManager):
             return
 
         def draw(draw_obj):
-            visible_categories = self.get_visible_window(self.categories)
+            visible_categories = self.get_visible_window(self.categories.titles)
             y_offset = self.y_offset
             x_offset_arrow = 5
 
@@ -138,7 +139,7 @@ class RadioManager(BaseManager):
             return
 
         def draw(draw_obj):
-            visible_stations = self.get_visible_window([station['title'] for station in self.stations])
+            visible_stations = self.get_visible_window(self.stations.titles)
             y_offset = self.y_offset
             x_offset_arrow = 5
 
@@ -164,6 +165,12 @@ class RadioManager(BaseManager):
                 self.logger.error("RadioManager: Received invalid navigation data.")
                 return
 
+            # Replies are correlated to their request, so skip ones meant for another menu
+            uri = kwargs.get("uri")
+            if uri and self.last_requested_uri and uri != self.last_requested_uri:
+                self.logger.debug(f"RadioManager: Ignoring navigation for '{uri}', waiting for '{self.last_requested_uri}'.")
+                return
+
             # Check if we're fetching categories
             if self.last_requested_uri == "radio":
                 self.update_radio_categories(navigation)
@@ -188,27 +195,18 @@ class RadioManager(BaseManager):
                 self.display_no_categories_message()
                 return
 
-            items = []
-            for lst in lists:
-                lst_items = lst.get("items", [])
-                if lst_items:
-                    items.extend(lst_items)
-
-            if not items:
+            categories = BrowseList.from_navigation(navigation)
+            if not categories:
                 self.logger.info("RadioManager: No categories in navigation. Displaying 'No Categories Available'.")
                 self.display_no_categories_message()
                 return
 
-            self.category_items = items  # Assign items to self.category_items
-
-            self.categories = [
-                item.get("title", item.get("name", "Untitled"))
-                for item in items
-            ]
+            self.categories = categories
             self.logger.info(f"RadioManager: Updated categories list with {len(self.categories)} items.")
             self.current_selection_index = 0
             self.window_start_index = 0
             self.display_categories()
+            self.prefetch_selection()
         except Exception as e:
             self.logger.exception(f"RadioManager: Exception in update_radio_categories - {e}")
             self.display_error_message("Error", "Failed to update categories.")
@@ -223,25 +221,13 @@ class RadioManager(BaseManager):
                 self.display_no_stations_message()
                 return
 
-            items = []
-            for lst in lists:
-                lst_items = lst.get("items", [])
-                if lst_items:
-                    items.extend(lst_items)
-
-            if not items:
+            stations = BrowseList.from_navigation(navigation)
+            if not stations:
                 self.logger.info("RadioManager: No stations in navigation. Displaying 'No Stations Available'.")
                 self.display_no_stations_message()
                 return
 
-            self.stations = [
-                {
-                    "title": item.get("title", item.get("name", "Untitled")),
-                    "uri": item.get("uri", item.get("link", "")),
-                    "albumart": item.get("albumart", ""),  # Include albumart
-                }
-                for item in items
-            ]
+            self.stations = stations
             self.logger.info(f"RadioManager: Updated stations list with {len(self.stations)} items.")
             self.current_selection_index = 0
             self.window_start_index = 0
@@ -288,53 +274,53 @@ class RadioManager(BaseManager):
         self.display_manager.draw_custom(draw)
         self.logger.debug("RadioManager: 'No Stations Available' message displayed.")
 
+    def selection_items(self):
+        if self.current_menu == "categories":
+            return self.categories
+        if self.current_menu == "stations":
+            return self.stations
+        return []
+
     def scroll_selection(self, direction):
-        """Scroll through the current menu, keeping selection centered."""
+        """
+        Move the selection by `direction` rows, keeping it centered. Rotary bursts
+        arrive already coalesced through rotate(), so there is no debounce here.
+        """
         if not self.is_active:
             self.logger.warning("RadioManager: Scroll attempted while inactive.")
             return
 
-        current_time = time.time()
-        if current_time - self.last_action_time < self.debounce_interval:
-            self.logger.debug("RadioManager: Scroll action ignored due to debounce.")
-            return
-        self.last_action_time = current_time
-
-        if self.current_menu == "categories":
-            options = self.categories
-        elif self.current_menu == "stations":
-            options = [station['title'] for station in self.stations]
-        else:
+        if self.current_menu not in ("categories", "stations"):
             self.logger.warning("RadioManager: Unknown menu state.")
             return
 
+        options = self.selection_items()
         if not options:
             self.logger.warning("RadioManager: No options available to scroll.")
             return
 
-        previous_index = self.current_selection_index
-
-        # Ensure direction is an integer and handle scroll up/down correctly
-        if isinstance(direction, int) and direction > 0:  # Scroll down
-            if self.current_selection_index < len(options) - 1:
-                self.current_selection_index += 1
-        elif isinstance(direction, int) and direction < 0:  # Scroll up
-            if self.current_selection_index > 0:
-                self.current_selection_index -= 1
-        else:
+        if not isinstance(direction, int) or direction == 0:
             self.logger.warning("RadioManager: Invalid scroll direction provided.")
             return
 
+        previous_index = self.current_selection_index
+        self.current_selection_index = max(0, min(self.current_selection_index + direction, len(options) - 1))
+
         # Update the window based on the new selection
         if previous_index != self.current_selection_index:
             self.logger.debug(f"RadioManager: Scrolled to index: {self.current_selection_index}")
             if self.current_menu == "categories":
                 self.display_categories()
+                self.prefetch_selection()
             elif self.current_menu == "stations":
                 self.display_radio_stations()
         else:
             self.logger.debug("RadioManager: Reached the end/start of the list. Scroll input ignored.")
 
+    def is_navigable(self, item):
+        # Categories open a station list; stations play
+        return self.current_menu == "categories"
+
     def select_item(self):
         """Handle the selection of the currently highlighted item."""
         if not self.is_active:
@@ -348,21 +334,23 @@ class RadioManager(BaseManager):
         self.last_action_time = current_time
 
         if self.current_menu == "categories":
-            selected_category = self.categories[self.current_selection_index]
+            selected_item = self.categories[self.current_selection_index]
+            selected_category = selected_item.title
             self.logger.info(f"RadioManager: Selected radio category: {selected_category}")
 
-            # Fetch the URI for the selected category
-            selected_item = self.get_category_item_by_title(selected_category)
-            uri = selected_item.get("uri") if selected_item else None
+            # The category's URI sits alongside its title
+            uri = selected_item.uri or None
 
             if uri:
                 self.logger.info(f"RadioManager: Fetching radio stations for category '{selected_category}' with URI '{uri}'")
-                self.fetch_radio_stations(uri)
-                # Push current menu to stack for back navigation
+                # Push current menu to stack for back navigation. Switch menus before
+                # fetching, since a cached or prefetched listing is delivered immediately.
                 self.menu_stack.append("categories")
                 self.current_menu = "stations"
                 self.current_selection_index = 0
                 self.window_start_index = 0
+                self.prefetch_highlighted(None)
+                self.fetch_radio_stations(uri)
             else:
                 self.logger.error(f"RadioManager: No URI found for category '{selected_category}'")
                 self.display_error_message("Error", f"No URI found for category '{selected_category}'")
@@ -405,6 +393,7 @@ class RadioManager(BaseManager):
         self.window_start_index = 0
         if self.current_menu == "categories":
             self.display_categories()
+            self.prefetch_selection()
         elif self.current_menu == "stations":
             self.display_radio_stations()
 
@@ -465,10 +454,10 @@ class RadioManager(BaseManager):
 
     def get_category_item_by_title(self, title):
         """Retrieve the category item by its title."""
-        for item in self.category_items:
-            if item.get("title", "") == title:
-                return item
-        return None
+        try:
+            return self.categories[self.categories.titles.index(title)]
+        except ValueError:
+            return None
 
     def play_station(self, title, uri, albumart_url=None):
         """Play the selected radio station."""
@@ -493,13 +482,14 @@ class RadioManager(BaseManager):
                     }
                     self.logger.debug(f"RadioManager: Payload to send: {payload}")
 
-                    # Send the replaceAndPlay command
-                    self.volumio_listener.socketIO.emit('replaceAndPlay', payload)
+                    # Send the replaceAndPlay command; state changes resume once the station plays
+                    self.volumio_listener.commands.run(
+                        "radio play",
+                        [CommandStep('replaceAndPlay', payload)],
+                        expect=playing(uri, title),
+                        on_settled=self.mode_manager.allow_state_change,
+                    )
                     self.logger.info(f"RadioManager: Sent replaceAndPlay command with URI: {uri}")
-
-                    # Allow state changes after a short delay
-                    threading.Timer(1.0, self.mode_manager.allow_state_change).start()
-                    self.logger.debug("RadioManager: Allowed state changes after delay.")
                 except Exception as e:
                     self.logger.error(f"RadioManager: Failed to emit replaceAndPlay - {e}")
                     self.display_error_message("Playback Error", f"Could not emit play command: {e}")
@@ -1,8 +1,9 @@
 # src/managers/spotify_manager.py
 from managers.menus.base_manager import BaseManager
+from network.browse_list import BrowseList
 import logging
 from PIL import ImageFont
-import threading
+from network.command_pipeline import CommandStep, playing
 
 class SpotifyManager(BaseManager):
     def __init__(self, display_manager, volumio_listener, mode_manager, window_size=4, y_offset=5, line_spacing=15):
@@ -57,6 +58,7 @@ class SpotifyManager(BaseManager):
         self.is_active = False
         self.display_manager.clear_screen()
         self.logger.info("SpotifyManager: Stopped Spotify mode and cleared display.")
+        self.prefetch_highlighted(None)
 
         # Disconnect signals
         self.volumio_listener.navigation_received.disconnect(self.handle_navigation)
@@ -113,11 +115,12 @@ class SpotifyManager(BaseManager):
             self.logger.info("SpotifyManager: State changed, updating display.")
             self.update_song_info(state)
     
-    def handle_track_change(self, sender, track, **kwargs):
+    def handle_track_change(self, sender, changes=None, state=None, **kwargs):
         """Handle track changes from Volumio."""
-        if track.get('service') == 'spop':
+        state = state if state is not None else self.volumio_listener.get_current_state()
+        if state.get('service') == 'spop':
             self.logger.info("SpotifyManager: Track changed, updating display.")
-            self.update_song_info(track)
+            self.update_song_info(state)
 
     def display_loading_screen(self):
         """Display a loading screen."""
@@ -160,19 +163,13 @@ class SpotifyManager(BaseManager):
             self.display_no_items()
             return
 
-        self.current_menu_items = [
-            {
-                "title": item.get("title", "Untitled"),
-                "uri": item.get("uri", ""),
-                "type": item.get("type", "")
-            }
-            for item in combined_items
-        ]
+        self.current_menu_items = BrowseList(combined_items)
 
         self.logger.info(f"SpotifyManager: Updated menu with {len(self.current_menu_items)} items.")
 
         if self.is_active:
             self.display_menu()
+            self.prefetch_selection()
 
     def display_no_items(self):
         """Display a message if no items are available."""
@@ -219,6 +216,10 @@ class SpotifyManager(BaseManager):
         self.current_selection_index = max(0, min(self.current_selection_index, len(self.current_menu_items) - 1))
         self.logger.debug(f"SpotifyManager: Scrolled from {previous_index} to {self.current_selection_index}.")
         self.display_menu()
+        self.prefetch_selection()
+
+    def is_navigable(self, item):
+        return item.get("type", "").lower() not in ["song", "playlist", "album"]
 
     def select_item(self):
         if not self.is_active or not self.current_menu_items:
@@ -249,11 +250,15 @@ class SpotifyManager(BaseManager):
         if self.volumio_listener.is_connected():
             try:
                 self.mode_manager.suppress_state_change()
-                self.volumio_listener.socketIO.emit('replaceAndPlay', {
-                    "service": "spop",
-                    "uri": uri
-                })
-                threading.Timer(1.0, self.mode_manager.allow_state_change).start()
+                self.volumio_listener.commands.run(
+                    "spotify play",
+                    [CommandStep('replaceAndPlay', {
+                        "service": "spop",
+                        "uri": uri
+                    })],
+                    expect=playing(uri),
+                    on_settled=self.mode_manager.allow_state_change,
+                )
             except Exception as e:
                 self.logger.error(f"SpotifyManager: Failed to play item {uri}: {e}")
                 self.display_error_message("Playback Error", f"Could not play item: {e}")
@@ -290,6 +295,7 @@ class SpotifyManager(BaseManager):
         self.window_start_index = previous_context["window_start_index"]
         self.logger.debug("SpotifyManager: Restored previous menu context from stack.")
         self.display_menu()
+        self.prefetch_selection()
 
     def handle_toast_message(self, sender, message):
         """Handle toast messages from Volumio, especially errors."""
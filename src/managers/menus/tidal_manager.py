@@ -1,10 +1,11 @@
 # src/managers/tidal_manager.py
 
 from managers.menus.base_manager import BaseManager
+from network.browse_list import BrowseList
 import logging
 from PIL import ImageFont
-import threading
 import time
+from network.command_pipeline import CommandStep, playing, queue_empty, queue_contains
 
 class TidalManager(BaseManager):
     def __init__(self, display_manager, volumio_listener, mode_manager, window_size=4, y_offset=5, line_spacing=15):
@@ -68,6 +69,7 @@ class TidalManager(BaseManager):
         self.is_active = False
         self.display_manager.clear_screen()
         self.logger.info("TidalManager: Stopped Tidal mode and cleared display.")
+        self.prefetch_highlighted(None)
 
         # Disconnect signals
         self.volumio_listener.tidal_navigation_received.disconnect(self.update_tidal_menu)
@@ -83,11 +85,12 @@ class TidalManager(BaseManager):
             self.logger.info("TidalManager: State changed, updating display.")
             self.update_song_info(state)
     
-    def handle_track_change(self, sender, track, **kwargs):
+    def handle_track_change(self, sender, changes=None, state=None, **kwargs):
         """Handle track changes from Volumio."""
-        if track.get('service') == 'qobuz':
-            self.logger.info("QobuzManager: Track changed, updating display.")
-            self.update_song_info(track)
+        state = state if state is not None else self.volumio_listener.get_current_state()
+        if state.get('service') == 'tidal':
+            self.logger.info("TidalManager: Track changed, updating display.")
+            self.update_song_info(state)
 
     def handle_navigation(self, sender, navigation, service, uri, **kwargs):
             if service != 'tidal':
@@ -175,19 +178,13 @@ class TidalManager(BaseManager):
             self.display_no_items()
             return
 
-        self.current_menu_items = [
-            {
-                "title": item.get("title", "Untitled"),
-                "uri": item.get("uri", ""),
-                "type": item.get("type", "")
-            }
-            for item in combined_items
-        ]
+        self.current_menu_items = BrowseList(combined_items)
 
         self.logger.info(f"TidalManager: Updated menu with {len(self.current_menu_items)} items.")
 
         if self.is_active:
             self.display_menu()
+            self.prefetch_selection()
 
     def display_no_items(self):
         """Display a message if no items are available."""
@@ -234,6 +231,10 @@ class TidalManager(BaseManager):
         self.current_selection_index = max(0, min(self.current_selection_index, len(self.current_menu_items) - 1))
         self.logger.debug(f"TidalManager: Scrolled from {previous_index} to {self.current_selection_index}.")
         self.display_menu()
+        self.prefetch_selection()
+
+    def is_navigable(self, item):
+        return not item["uri"].startswith("tidal://song/") and item.get("type", "").lower() != "song"
 
     def select_item(self):
         """Handle the selection of the current menu item."""
@@ -271,29 +272,28 @@ class TidalManager(BaseManager):
         self.logger.info(f"TidalManager: Sending play commands for URI: {uri}")
         if self.volumio_listener.is_connected():
             try:
-                # Suppress state changes
+                # Suppress state changes until the track is actually playing
                 self.mode_manager.suppress_state_change()
 
-                # Step 1: Clear the current queue
-                self.volumio_listener.socketIO.emit('clearQueue')
-                self.logger.info("TidalManager: Cleared Volumio queue.")
-
-                # Step 2: Add the selected track to the queue
                 selected_item = self.current_menu_items[self.current_selection_index]
                 song_title = selected_item.get("title", "Untitled")
-                self.volumio_listener.socketIO.emit('addToQueue', {
-                    "service": "tidal",
-                    "uri": uri,
-                    "title": song_title
-                })
-                self.logger.info(f"TidalManager: Added '{song_title}' to Volumio queue.")
-
-                # Step 3: Start playback
-                self.volumio_listener.socketIO.emit('play')
-                self.logger.info("TidalManager: Sent play command to Volumio.")
-
-                # Allow state changes after a short delay
-                threading.Timer(1.0, self.mode_manager.allow_state_change).start()
+                # Clear the queue, add the track and play it, each step waiting for
+                # Volumio's queue update before the next one is sent
+                self.volumio_listener.commands.run(
+                    "tidal play",
+                    [
+                        CommandStep('clearQueue', expect_queue=queue_empty),
+                        CommandStep('addToQueue', {
+                            "service": "tidal",
+                            "uri": uri,
+                            "title": song_title
+                        }, expect_queue=queue_contains(uri)),
+                        CommandStep('play'),
+                    ],
+                    expect=playing(uri, song_title),
+                    on_settled=self.mode_manager.allow_state_change,
+                )
+                self.logger.info(f"TidalManager: Queued play commands for '{song_title}'.")
             except Exception as e:
                 self.logger.error(f"TidalManager: Failed to play track {uri}: {e}")
                 self.display_error_message("Playback Error", f"Could not play track: {e}")
@@ -330,6 +330,7 @@ class TidalManager(BaseManager):
         self.window_start_index = previous_context["window_start_index"]
         self.logger.debug("TidalManager: Restored previous menu context from stack.")
         self.display_menu()
+        self.prefetch_selection()
 
     def handle_toast_message(self, sender, message, **kwargs):
         """Handle toast messages from Volumio, especially errors."""
@@ -1,6 +1,7 @@
 # usb_library_manager.py
 
 from managers.menus.base_manager import BaseManager
+from network.browse_list import BrowseList
 import logging
 from PIL import ImageFont
 import threading
@@ -60,6 +61,7 @@ class USBLibraryManager(BaseManager):
         self.is_active = False
         self.display_manager.clear_screen()
         self.logger.info("USBLibraryManager: Stopped USB Library mode and cleared display.")
+        self.prefetch_highlighted(None)
 
     def fetch_navigation(self, uri):
         self.logger.info(f"USBLibraryManager: Fetching navigation data for URI: {uri}")
@@ -107,19 +109,12 @@ class USBLibraryManager(BaseManager):
             self.display_no_items()
             return
 
-        self.current_menu_items = [
-            {
-                "title": item.get("title", "Untitled"),
-                "uri": item.get("uri", ""),
-                "type": item.get("type", ""),
-                "service": item.get("service", "")
-            }
-            for item in combined_items
-        ]
+        self.current_menu_items = BrowseList(combined_items)
 
         self.logger.info(f"USBLibraryManager: Updated menu with {len(self.current_menu_items)} items.")
         if self.is_active:
             self.display_menu()
+            self.prefetch_selection()
 
     def display_menu(self):
         """Display the current menu."""
@@ -165,6 +160,10 @@ class USBLibraryManager(BaseManager):
 
         self.logger.debug(f"USBLibraryManager: Scrolled from {previous_index} to {self.current_selection_index}.")
         self.display_menu()
+        self.prefetch_selection()
+
+    def is_navigable(self, item):
+        return item.get("type") in ["folder", "remdisk"]
 
     def select_item(self):
         """Handle item selection."""
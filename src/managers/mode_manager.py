@@ -63,7 +63,8 @@ class ModeManager:
             model=self,
             states=ModeManager.states,
             initial='clock',
-            send_event=True
+            send_event=True,
+            after_state_change='_record_mode'
         )
 
         # Define transitions
@@ -88,12 +89,14 @@ class ModeManager:
         # Suppression mechanism
         self.suppress_state_changes = False  # Added suppression flag
 
-        # Connect to VolumioListener's state_changed signal
+        # Mode logic only depends on status and service, so listen for those changes only
+        self._last_processed_state = None
         if self.volumio_listener is not None:
-            self.volumio_listener.state_changed.connect(self.process_state_change)
-            self.logger.debug("ModeManager: Connected to VolumioListener's state_changed signal.")
+            self.volumio_listener.status_changed.connect(self.on_playback_change)
+            self.volumio_listener.track_changed.connect(self.on_playback_change)
+            self.logger.debug("ModeManager: Connected to VolumioListener's status_changed and track_changed signals.")
         else:
-            self.logger.warning("ModeManager: VolumioListener is None, cannot connect to state_changed signal.")
+            self.logger.warning("ModeManager: VolumioListener is None, cannot connect to change signals.")
 
         # Explicitly call enter_clock to initialize the clock mode
         self.enter_clock(None)
@@ -188,6 +191,51 @@ class ModeManager:
     def get_mode(self):
         return self.state
 
+    def restore_mode(self, mode):
+        """
+        Go back to `mode`, the mode recorded in the previous run's snapshot,
+        after the current playback state has been applied. Menus are reopened
+        at their root once Volumio is connected, since they fetch their
+        listings from it; if the user has left the boot screen by then, the
+        restore is dropped. A now-playing screen is only restored over a
+        paused player, which the state alone leaves on the clock; while
+        playing or stopped the state already decides the screen.
+        """
+        is_screen = mode in ('playback', 'original', 'modern', 'webradio')
+        with self.lock:
+            if not mode or mode in ('clock', self.state) or mode not in self.machine.states:
+                return False
+            if is_screen and self.current_status != 'pause':
+                return False
+            boot_mode = self.state
+
+        if not is_screen and not self.volumio_listener.is_connected():
+            pending = threading.Lock()
+
+            def on_connected(sender=None, **kwargs):
+                if not pending.acquire(blocking=False):
+                    return  # Already handled
+                self.volumio_listener.connected.disconnect(on_connected)
+                if self.state == boot_mode:
+                    self.restore_mode(mode)
+
+            self.logger.info(f"ModeManager: Restoring '{mode}' mode once Volumio is connected.")
+            self.volumio_listener.connected.connect(on_connected, weak=False)
+            # The connection may have come up before the receiver was connected
+            if self.volumio_listener.is_connected():
+                on_connected()
+            return True
+
+        self.logger.info(f"ModeManager: Restoring '{mode}' mode from the previous run.")
+        self.trigger('to_usb_library' if mode == 'usblibrary' else f'to_{mode}')
+        return True
+
+    def _record_mode(self, event):
+        """Keep the mode in the listener's state snapshot so the next start can restore it."""
+        snapshot = getattr(self.volumio_listener, 'snapshot', None)
+        if snapshot is not None:
+            snapshot.update(mode=self.state)
+
     def enter_clock(self, event):
         self.logger.info("ModeManager: Entering clock mode.")
         
@@ -511,9 +559,25 @@ class ModeManager:
             self.suppress_state_changes = False
             self.logger.debug("ModeManager: State changes are now allowed.")
 
+        # Changes are only signalled once, so catch up on anything dropped while suppressed
+        if self.volumio_listener is not None:
+            current_state = self.volumio_listener.get_current_state()
+            if current_state:
+                # Mark it processed so the push that lifted suppression is not handled twice
+                self._last_processed_state = current_state
+                self.process_state_change(self.volumio_listener, current_state)
+
     def is_state_change_suppressed(self):
         return self.suppress_state_changes
 
+    def on_playback_change(self, sender, changes=None, state=None, **kwargs):
+        """Handle status/track change signals; a push that changes both is processed once."""
+        # Modes follow what Volumio confirms, not local predictions
+        if state is None or state is self._last_processed_state or kwargs.get('predicted') is not None:
+            return
+        self._last_processed_state = state
+        self.process_state_change(sender, state)
+
     def process_state_change(self, sender, state, **kwargs):
         """Process playback state changes from Volumio."""
         with self.lock:
@@ -522,8 +586,8 @@ class ModeManager:
                 return
 
             # Extract current status and service
-            status = state.get("status", "").lower()
-            service = state.get("service", "").lower()
+            status = state.status
+            service = state.service
             self.logger.debug(f"ModeManager: Processing state change, Volumio status: {status}, service: {service}")
 
             # Update status tracking
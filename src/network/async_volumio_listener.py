@@ -0,0 +1,301 @@
+# src/network/async_volumio_listener.py
+#
+# Optional asyncio transport for VolumioListener. Socket.IO and the Volumio
+# REST API share a single event loop running on one background thread, so
+# HTTP calls no longer cost a thread each. Reconnection is handled by the same
+# ConnectionSupervisor as the threaded listener. The blinker signals,
+# volume commands and `socketIO.emit(...)` calls used across the app are the
+# same as with the threaded listener.
+#
+# The loop only does I/O. Socket.IO handlers (and with them every blinker
+# receiver: renders, ModeManager, LEDs) and REST completions run in order on
+# one receiver thread, so a slow redraw never holds up the socket or HTTP.
+#
+# Requires aiohttp (used by socketio.AsyncClient and for REST calls).
+
+import json
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import socketio
+
+from network.volumio_listener import VolumioListener
+from network.browse_stream import BrowseItemScanner
+from network.rest_worker import (
+    USER, BACKGROUND, FIRST_ITEMS, STREAM_CHUNK_SIZE, RequestCancelled, DeadlineExceeded,
+)
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, only needed for this transport
+    aiohttp = None
+
+
+class LoopBoundSocket:
+    """
+    Thread-safe facade over socketio.AsyncClient.
+
+    Mirrors the parts of socketio.Client the app uses (connected, on, emit,
+    disconnect). Calls made from any thread are scheduled on the loop and
+    return a concurrent.futures.Future instead of blocking. Plain (non-async)
+    event handlers are handed to the `receivers` executor rather than run on
+    the loop.
+    """
+
+    def __init__(self, client, loop, receivers):
+        self.client = client
+        self.loop = loop
+        self.receivers = receivers
+        self.logger = logging.getLogger("LoopBoundSocket")
+
+    @property
+    def connected(self):
+        return self.client.connected
+
+    def on(self, event, handler=None):
+        if handler is None or asyncio.iscoroutinefunction(handler):
+            return self.client.on(event, handler)
+
+        async def dispatch(*args):
+            self.receivers.submit(self._run_handler, event, handler, *args)
+
+        return self.client.on(event, dispatch)
+
+    def _run_handler(self, event, handler, *args):
+        try:
+            handler(*args)
+        except Exception as e:
+            self.logger.exception(f"LoopBoundSocket: Handler for '{event}' failed: {e}")
+
+    def emit(self, event, data=None):
+        return self._submit(self.client.emit(event, data))
+
+    def disconnect(self):
+        return self._submit(self.client.disconnect())
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+class AsyncVolumioRestClient:
+    """
+    Volumio REST calls over one pooled keep-alive aiohttp session.
+
+    Drop-in for VolumioRestWorker (browse, post, cancel_pending, stats), so
+    LibraryManager uses it unchanged. Deadlines bound each request,
+    BACKGROUND requests may only use some of the connections so user
+    requests never wait behind prefetches, and cancel_pending() cancels the
+    cancellable requests still on the wire. Futures are resolved, and
+    on_first_items called, on the `receivers` executor, never on the loop.
+    """
+
+    def __init__(self, api_url, loop, receivers, timeout=5, default_deadline=8.0, connections=4):
+        self.api_url = api_url.rstrip('/')
+        self.loop = loop
+        self.receivers = receivers
+        self.timeout = timeout
+        self.default_deadline = default_deadline
+        self.connections = connections
+        self._session = None
+        self._background_slots = None  # asyncio.Semaphore, created on the loop
+        self._tasks = {}  # running asyncio.Task -> generation; loop thread only
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("AsyncVolumioRestClient")
+
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            # The request deadline bounds the whole call; only connecting has its own timeout
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.connections, keepalive_timeout=30),
+            )
+        return self._session
+
+    def browse(self, uri, priority=USER, deadline=None, cancellable=True, on_first_items=None, first_count=FIRST_ITEMS):
+        """GET /browse for `uri`; resolves to the 'navigation' block. See VolumioRestWorker.browse()."""
+        label = f"browse {uri}"
+        return self._submit(lambda: self._browse(uri, on_first_items, first_count, label),
+                            priority, deadline, cancellable, label)
+
+    def post(self, path, payload, priority=USER, deadline=None, cancellable=False):
+        """POST JSON to /<path>; resolves to the response body. Commands are not cancellable by default."""
+        return self._submit(lambda: self._post(path, payload), priority, deadline, cancellable, f"post {path}")
+
+    def cancel_pending(self):
+        """Supersede every cancellable request submitted so far."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self.loop.call_soon_threadsafe(self._cancel_older, generation)
+
+    def is_current(self, future_generation):
+        with self._lock:
+            return future_generation is None or future_generation == self._generation
+
+    def stats(self):
+        return {
+            'queued': len(self._tasks),
+            'completed': self.completed,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+            'cancelled': self.cancelled,
+        }
+
+    def _submit(self, make_call, priority, deadline, cancellable, label):
+        future = Future()
+        with self._lock:
+            generation = self._generation if cancellable else None
+        asyncio.run_coroutine_threadsafe(
+            self._run(make_call, priority, deadline or self.default_deadline, generation, label, future), self.loop
+        )
+        return future
+
+    def _cancel_older(self, generation):
+        for task, task_generation in list(self._tasks.items()):
+            if task_generation is not None and task_generation < generation:
+                task.cancel()
+
+    async def _run(self, make_call, priority, deadline, generation, label, future):
+        if not self.is_current(generation):
+            self.cancelled += 1
+            self.receivers.submit(future.cancel)
+            return
+        if self._background_slots is None:
+            self._background_slots = asyncio.Semaphore(max(1, self.connections // 2))
+
+        task = asyncio.current_task()
+        self._tasks[task] = generation
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(self._call(make_call, priority), deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.receivers.submit(future.set_exception, DeadlineExceeded(f"{label} timed out after {deadline:.1f}s"))
+            return
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            self.receivers.submit(future.set_exception, RequestCancelled(label))
+            return
+        except Exception as e:
+            self.failed += 1
+            self.receivers.submit(future.set_exception, e)
+            return
+        finally:
+            self._tasks.pop(task, None)
+
+        if not self.is_current(generation):
+            self.cancelled += 1
+            self.receivers.submit(future.set_exception, RequestCancelled(label))
+            return
+        self.completed += 1
+        self.logger.debug(f"AsyncVolumioRestClient: {label} took {(time.monotonic() - started) * 1000:.0f} ms")
+        self.receivers.submit(future.set_result, result)
+
+    async def _call(self, make_call, priority):
+        if priority == BACKGROUND:
+            async with self._background_slots:
+                return await make_call()
+        return await make_call()
+
+    async def _browse(self, uri, on_first_items, first_count, label):
+        session = await self._get_session()
+        async with session.get(f"{self.api_url}/browse", params={"uri": uri}) as response:
+            response.raise_for_status()
+            if on_first_items is None:
+                data = await response.json(content_type=None)
+                return data.get("navigation", {})
+
+            scanner = BrowseItemScanner(limit=first_count)
+            chunks = []
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                chunks.append(chunk)
+                if not scanner.done:
+                    scanner.feed(chunk)
+                    if scanner.done and len(scanner.items) >= first_count:
+                        self.receivers.submit(self._first_items, on_first_items, scanner.items, label)
+        return json.loads(b"".join(chunks)).get("navigation", {})
+
+    def _first_items(self, on_first_items, items, label):
+        try:
+            on_first_items(items)
+        except Exception as e:
+            self.logger.error(f"AsyncVolumioRestClient: First items callback for {label} failed: {e}")
+
+    async def _post(self, path, payload):
+        session = await self._get_session()
+        async with session.post(f"{self.api_url}/{path}", json=payload) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+class AsyncVolumioListener(VolumioListener):
+    def __init__(self, host='localhost', port=3000, reconnect_delay=30, api_url=None, http_timeout=5,
+                 request_deadline=8, snapshot=None):
+        """
+        Initialize the asyncio transport. The event loop and receiver threads
+        are started before the base class connects, since connecting is
+        scheduled on the loop.
+        """
+        if aiohttp is None:
+            raise ImportError("The asyncio Volumio transport requires aiohttp (pip install aiohttp).")
+
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self._run_loop, name="VolumioAsyncLoop", daemon=True)
+        self.loop_thread.start()
+        # One thread keeps handlers and REST completions in the order the loop saw them
+        self.receivers = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VolumioReceivers")
+
+        self.rest = AsyncVolumioRestClient(api_url or f"http://{host}:{port}/api/v1", self.loop, self.receivers,
+                                           timeout=http_timeout, default_deadline=request_deadline)
+        super().__init__(host=host, port=port, reconnect_delay=reconnect_delay, snapshot=snapshot)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def create_socketio_client(self):
+        # Reconnection belongs to the supervisor, not to the client
+        client = socketio.AsyncClient(logger=False, engineio_logger=False, reconnection=False)
+        return LoopBoundSocket(client, self.loop, self.receivers)
+
+    def _connect_once(self, transports):
+        """Run one connection attempt on the loop and wait for it from the supervisor thread."""
+        self.logger.info(f"[AsyncVolumioListener] Connecting to Volumio at {self.host}:{self.port} via {'+'.join(transports)}...")
+        attempt = asyncio.run_coroutine_threadsafe(
+            self.socketIO.client.connect(f"http://{self.host}:{self.port}", transports=transports), self.loop
+        )
+        attempt.result()
+
+    def stop(self):
+        """Stop the listener, close the HTTP session and shut down the loop."""
+        self._running = False
+        self.supervisor.stop()
+        if self.snapshot is not None:
+            self.snapshot.flush()
+        shutdown = asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        if threading.current_thread() is not self.loop_thread:
+            try:
+                shutdown.result(timeout=5)
+            except Exception as e:
+                self.logger.warning(f"[AsyncVolumioListener] Error during shutdown: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.receivers.shutdown(wait=False)
+        self.logger.info("[AsyncVolumioListener] Listener stopped.")
+
+    async def _shutdown(self):
+        if self.socketIO.connected:
+            await self.socketIO.client.disconnect()
+        await self.rest.close()
@@ -0,0 +1,129 @@
+# src/network/browse_cache.py
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+# Seconds a cached listing counts as fresh, per service. Streaming catalogues
+# change slowly; playlists are edited from other clients, so keep them short.
+DEFAULT_TTLS = {
+    'tidal': 600,
+    'qobuz': 600,
+    'spotify': 300,
+    'webradio': 3600,
+    'playlists': 60,
+    'library': 600,
+    'usblibrary': 300,
+    None: 120,
+}
+
+FRESH = 'fresh'
+STALE = 'stale'
+
+
+class BrowseCache:
+    """
+    In-memory LRU cache of browseLibrary navigation, keyed by URI.
+
+    An entry is FRESH until its service TTL expires, then STALE for up to
+    `stale_ttl` more seconds: stale entries are still served so a menu can
+    render at once, and the caller revalidates in the background. Beyond
+    that, or once evicted by the LRU cap, a lookup is a miss.
+    """
+
+    def __init__(self, max_entries=200, ttls=None, stale_ttl=86400):
+        self.logger = logging.getLogger("BrowseCache")
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.stale_ttl = stale_ttl
+
+        self._entries = OrderedDict()  # uri -> (navigation, service, stored_at)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, service):
+        return self.ttls.get(service, self.ttls[None])
+
+    def get(self, uri):
+        """Return (navigation, FRESH|STALE) for `uri`, or (None, None) on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is None:
+                self.misses += 1
+                return None, None
+
+            navigation, service, stored_at = entry
+            age = now - stored_at
+            ttl = self.ttl_for(service)
+            if age > ttl + self.stale_ttl:
+                del self._entries[uri]
+                self.misses += 1
+                return None, None
+
+            self._entries.move_to_end(uri)
+            if age <= ttl:
+                self.hits += 1
+                return navigation, FRESH
+            self.stale_hits += 1
+            return navigation, STALE
+
+    def peek(self, uri):
+        """Return FRESH, STALE or None for `uri` without touching LRU order or counters."""
+        with self._lock:
+            entry = self._entries.get(uri)
+        if entry is None:
+            return None
+        _, service, stored_at = entry
+        age = time.monotonic() - stored_at
+        ttl = self.ttl_for(service)
+        if age <= ttl:
+            return FRESH
+        return STALE if age <= ttl + self.stale_ttl else None
+
+    def put(self, uri, navigation, service=None):
+        """Store `navigation` for `uri`, evicting the least recently used entries past the cap."""
+        with self._lock:
+            self._entries[uri] = (navigation, service, time.monotonic())
+            self._entries.move_to_end(uri)
+            while len(self._entries) > self.max_entries:
+                evicted_uri, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                self.logger.debug(f"BrowseCache: Evicted '{evicted_uri}'.")
+
+    def mark_stale(self):
+        """
+        Age every entry past its TTL, e.g. after a reconnect, so the next lookup
+        still renders instantly but triggers a background revalidation.
+        """
+        with self._lock:
+            for uri, (navigation, service, stored_at) in list(self._entries.items()):
+                expired_at = time.monotonic() - self.ttl_for(service) - 1
+                self._entries[uri] = (navigation, service, min(stored_at, expired_at))
+
+    def invalidate(self, uri=None):
+        """Drop one URI, or everything when `uri` is None."""
+        with self._lock:
+            if uri is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(uri, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,167 @@
+# src/network/browse_list.py
+
+import sys
+from bisect import bisect_left, bisect_right
+
+FIELDS = ('title', 'uri', 'type', 'service', 'albumart')
+
+
+def index_letter(title):
+    """The letter a title is filed under: its first letter, or '#' for digits and symbols."""
+    for char in title:
+        if char.isalpha():
+            return char.upper()
+        if char.isdigit():
+            return '#'
+    return '#'
+
+
+class BrowseItem:
+    """
+    One row of a BrowseList. Created on access and only for the rows a
+    screen asks for; supports the dict-style `get()`, `item['title']` and
+    `'uri' in item` used by the menu managers.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, title, uri, type, service, albumart):
+        self.title = title
+        self.uri = uri
+        self.type = type
+        self.service = service
+        self.albumart = albumart
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in FIELDS
+
+    def __eq__(self, other):
+        if not isinstance(other, BrowseItem):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    def __repr__(self):
+        return f"BrowseItem(title={self.title!r}, uri={self.uri!r}, type={self.type!r})"
+
+
+class BrowseList:
+    """
+    Immutable, compact list of browseLibrary items.
+
+    Items are stored column-wise in parallel tuples instead of one dict per
+    row. The few distinct type and service names are interned and album art
+    URLs (repeated across the tracks of an album) are shared, so a 10k item
+    folder costs a fraction of the list-of-dicts it replaces. Indexing and
+    slicing build BrowseItems only for the rows asked for, which keeps
+    drawing a menu window independent of the folder size. Because a
+    BrowseList never changes, pushing it on a menu stack is a reference, not
+    a copy.
+
+    `letter_starts` holds the first row of every run of titles filed under
+    the same letter, built while the list loads, so jump() can skip a whole
+    letter of a sorted artist folder with a binary search.
+    """
+
+    __slots__ = ('titles', 'uris', 'types', 'services', 'albumarts', 'letter_starts')
+
+    def __init__(self, items=(), lower=False):
+        titles, uris, types, services, albumarts = [], [], [], [], []
+        letter_starts = []
+        letter = None
+        art_pool = {}
+        for item in items:
+            item_type = item.get("type") or ""
+            service = item.get("service") or ""
+            if lower:
+                item_type = item_type.lower()
+                service = service.lower()
+            albumart = item.get("albumart") or None
+            if albumart is not None:
+                albumart = art_pool.setdefault(albumart, albumart)
+
+            title = item.get("title") or item.get("name") or "Untitled"
+            title_letter = index_letter(title)
+            if title_letter != letter:
+                letter = title_letter
+                letter_starts.append(len(titles))
+
+            titles.append(title)
+            uris.append(item.get("uri") or item.get("link") or "")
+            types.append(sys.intern(item_type))
+            services.append(sys.intern(service))
+            albumarts.append(albumart)
+
+        self.titles = tuple(titles)
+        self.uris = tuple(uris)
+        self.types = tuple(types)
+        self.services = tuple(services)
+        self.albumarts = tuple(albumarts)
+        self.letter_starts = tuple(letter_starts)
+
+    @classmethod
+    def from_navigation(cls, navigation, lower=False):
+        """Build from a navigation block, joining the items of all its lists."""
+        return cls(
+            (item for lst in (navigation or {}).get("lists") or [] for item in lst.get("items") or []),
+            lower=lower,
+        )
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __bool__(self):
+        return bool(self.titles)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(len(self.titles)))]
+        if index < 0:
+            index += len(self.titles)
+        if not 0 <= index < len(self.titles):
+            raise IndexError("BrowseList index out of range")
+        return self._item(index)
+
+    def __iter__(self):
+        for i in range(len(self.titles)):
+            yield self._item(i)
+
+    def _item(self, i):
+        return BrowseItem(self.titles[i], self.uris[i], self.types[i], self.services[i], self.albumarts[i])
+
+    def window(self, start, size):
+        """The BrowseItems of rows start .. start + size - 1 that exist."""
+        return self[start:start + size]
+
+    def jump(self, index, direction):
+        """
+        Row to land on when skipping a letter from `index`: the first row of
+        the next letter going forward, or going back the first row of the
+        current letter (of the previous one when already there).
+        """
+        starts = self.letter_starts
+        if not starts:
+            return index
+        if direction > 0:
+            position = bisect_right(starts, index)
+            return starts[position] if position < len(starts) else len(self.titles) - 1
+        position = bisect_left(starts, index) - 1
+        return starts[position] if position >= 0 else 0
+
+    def letter_at(self, index):
+        return index_letter(self.titles[index]) if 0 <= index < len(self.titles) else None
+
+    def copy(self):
+        # Immutable: a snapshot is the list itself
+        return self
+
+    def __repr__(self):
+        return f"BrowseList({len(self.titles)} items)"
@@ -0,0 +1,113 @@
+# src/network/browse_prefetcher.py
+
+import logging
+import threading
+
+from network.browse_cache import FRESH
+
+
+class BrowsePrefetcher:
+    """
+    Warms the browse cache with the children of the highlighted menu item.
+
+    Menu managers call hover(uri) whenever the selection moves. Once the
+    selection has rested on the same navigable URI for `dwell_time` seconds,
+    `fetch(uri)` is started in the background; it must return a Future, or
+    None when the backend is busy with user requests. Moving on cancels the
+    dwell timer and any prefetch still in flight for the previous item, and
+    at most `max_concurrent` prefetches run at once. A cancelled request may
+    still be on the wire, so backends that cannot abort one should also
+    count it against `max_concurrent` until it ends (VolumioListener does).
+    """
+
+    def __init__(self, fetch, cache, dwell_time=0.35, max_concurrent=2):
+        self.logger = logging.getLogger("BrowsePrefetcher")
+        self.fetch = fetch
+        self.cache = cache
+        self.dwell_time = dwell_time
+        self.max_concurrent = max_concurrent
+
+        # Re-entrant: cancelling a future runs its done callback, which takes the lock again
+        self._lock = threading.RLock()
+        self._timer = None
+        self._hovered = None
+        self._in_flight = {}  # uri -> Future
+
+        self.issued = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.skipped = 0
+
+    def hover(self, uri):
+        """The selection now rests on `uri`; None means it is on nothing worth prefetching."""
+        with self._lock:
+            if uri == self._hovered and (self._timer or uri in self._in_flight):
+                return
+            self._hovered = uri
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            self._cancel_in_flight(keep=uri)
+
+            if not uri or uri in self._in_flight or self.cache.peek(uri) == FRESH:
+                return
+            self._timer = threading.Timer(self.dwell_time, self._start, args=(uri,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        """Stop everything, e.g. when the owning menu closes."""
+        self.hover(None)
+
+    def claim(self, uri):
+        """
+        Hand over the prefetch of `uri` still in flight, if any, to a caller
+        that now needs the listing; the prefetcher no longer cancels it.
+        """
+        with self._lock:
+            return self._in_flight.pop(uri, None)
+
+    def _start(self, uri):
+        with self._lock:
+            self._timer = None
+            if uri != self._hovered:
+                return
+            if len(self._in_flight) >= self.max_concurrent:
+                self.skipped += 1
+                self.logger.debug(f"BrowsePrefetcher: {len(self._in_flight)} prefetches running, skipping {uri}.")
+                return
+            try:
+                future = self.fetch(uri)
+            except Exception as e:
+                self.logger.debug(f"BrowsePrefetcher: Could not start prefetch for {uri}: {e}")
+                future = None
+            if future is None:
+                self.skipped += 1
+                return
+            self._in_flight[uri] = future
+            self.issued += 1
+        self.logger.debug(f"BrowsePrefetcher: Prefetching {uri}.")
+        future.add_done_callback(lambda done, uri=uri: self._finished(uri, done))
+
+    def _finished(self, uri, future):
+        with self._lock:
+            if self._in_flight.get(uri) is future:
+                del self._in_flight[uri]
+        if not future.cancelled() and future.exception() is None:
+            self.completed += 1
+
+    def _cancel_in_flight(self, keep=None):
+        """Cancel prefetch futures for anything but `keep`. Caller holds the lock."""
+        for uri in [uri for uri in self._in_flight if uri != keep]:
+            if self._in_flight.pop(uri).cancel():
+                self.cancelled += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'issued': self.issued,
+                'completed': self.completed,
+                'cancelled': self.cancelled,
+                'skipped': self.skipped,
+                'in_flight': len(self._in_flight),
+            }
@@ -0,0 +1,72 @@
+# src/network/browse_stream.py
+
+import re
+import json
+import codecs
+
+# Start of an items array. JSON escapes quotes inside strings, so this only
+# ever matches a real "items" key, however the text is split into chunks.
+ITEMS_PATTERN = re.compile(r'"items"\s*:\s*\[')
+# Characters kept between chunks while looking for the key
+KEY_TAIL = 32
+SEPARATORS = ' \t\r\n,'
+
+
+class BrowseItemScanner:
+    """
+    Pulls the items of the first list out of a browse response while it is
+    still arriving.
+
+    feed() takes raw response bytes and returns the items they completed, so
+    a menu can draw its first rows long before a big folder has finished
+    downloading and decoding. Scanning stops after `limit` items; the caller
+    still decodes the complete body once it has arrived.
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.items = []
+        self.done = False
+
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._json = json.JSONDecoder()
+        self._text = ''
+        self._in_items = False
+
+    def feed(self, chunk):
+        """Add the next bytes of the response; returns the items completed by them."""
+        if self.done:
+            return []
+        text = self._text + self._decoder.decode(chunk)
+
+        if not self._in_items:
+            match = ITEMS_PATTERN.search(text)
+            if match is None:
+                self._text = text[-KEY_TAIL:]
+                return []
+            text = text[match.end():]
+            self._in_items = True
+
+        new_items = []
+        pos, length = 0, len(text)
+        while True:
+            while pos < length and text[pos] in SEPARATORS:
+                pos += 1
+            if pos >= length:
+                break
+            if text[pos] == ']':
+                self.done = True
+                break
+            try:
+                item, pos = self._json.raw_decode(text, pos)
+            except ValueError:
+                # The item is cut off at the end of this chunk
+                break
+            new_items.append(item)
+            if self.limit is not None and len(self.items) + len(new_items) >= self.limit:
+                self.done = True
+                break
+
+        self._text = '' if self.done else text[pos:]
+        self.items.extend(new_items)
+        return new_items
@@ -0,0 +1,275 @@
+# src/network/command_pipeline.py
+
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+# Upper bound for a command to show its effect before suppression is lifted anyway
+COMMAND_TIMEOUT = 4.0
+# How long a step waits for its pushQueue acknowledgement before the next step is sent
+STEP_TIMEOUT = 1.0
+# PendingCommand.awaiting once every step is sent and only the expected pushState is missing
+AWAIT_STATE = 'state'
+
+
+class CommandTimeoutError(Exception):
+    """Raised on a command future when the expected state never arrived."""
+
+    def __init__(self, name, timeout):
+        super().__init__(f"'{name}' had no visible effect after {timeout}s")
+        self.name = name
+        self.timeout = timeout
+
+
+class CommandStep:
+    """
+    One Socket.IO emit within a command. With `expect_queue`, the next step
+    waits until a pushQueue satisfies it (or `timeout` passes).
+    """
+
+    __slots__ = ('event', 'payload', 'expect_queue', 'timeout')
+
+    def __init__(self, event, payload=None, expect_queue=None, timeout=STEP_TIMEOUT):
+        self.event = event
+        self.payload = payload
+        self.expect_queue = expect_queue
+        self.timeout = timeout
+
+
+class PendingCommand:
+    __slots__ = ('name', 'steps', 'expect', 'on_settled', 'timeout', 'future',
+                 'baseline', 'index', 'awaiting', 'started_at', 'timer', 'step_timer')
+
+    def __init__(self, name, steps, expect, on_settled, timeout):
+        self.name = name
+        self.steps = steps
+        self.expect = expect
+        self.on_settled = on_settled
+        self.timeout = timeout
+        self.future = Future()
+        self.baseline = None
+        self.index = 0
+        self.awaiting = None  # the CommandStep waiting for pushQueue, or AWAIT_STATE
+        self.started_at = None
+        self.timer = None
+        self.step_timer = None
+
+
+def playing(uri=None, title=None):
+    """
+    Expectation for "this item is now playing". Services sometimes rewrite
+    URIs, so any different track starting to play also counts.
+    """
+    def check(state, baseline):
+        if state.status != 'play':
+            return False
+        if (uri and state.uri == uri) or (title and state.title == title):
+            return True
+        return baseline.status != 'play' or (state.uri, state.title) != (baseline.uri, baseline.title)
+    return check
+
+
+def queue_empty(queue):
+    return not queue
+
+
+def queue_contains(uri):
+    return lambda queue: any(item.get('uri') == uri for item in queue or [])
+
+
+class CommandPipeline:
+    """
+    Sends multi-step Volumio commands in order and watches for their effect.
+
+    run() queues a command made of CommandSteps. Steps are emitted one after
+    the other, each optionally waiting for the pushQueue that acknowledges
+    it. Once all are sent, the command settles on the first pushState that
+    satisfies `expect(state, baseline)`, or after `timeout`. Either way
+    `on_settled` runs, typically ModeManager.allow_state_change. Commands run
+    one at a time, and stats() reports the command-to-effect latency of each
+    command name.
+    """
+
+    def __init__(self, listener, default_timeout=COMMAND_TIMEOUT):
+        self.logger = logging.getLogger("CommandPipeline")
+        self.listener = listener
+        self.default_timeout = default_timeout
+
+        self._lock = threading.RLock()
+        self._active = None
+        self._waiting = deque()
+        self._stats = {}  # name -> counters
+
+        listener.state_changed.connect(self._on_state)
+        listener.queue_changed.connect(self._on_queue)
+        listener.disconnected.connect(self._on_disconnect)
+
+    def run(self, name, steps, expect=None, on_settled=None, timeout=None):
+        """
+        Queue a command; returns a Future resolved with its command-to-effect
+        latency in seconds, or failing with CommandTimeoutError/ConnectionError.
+        """
+        command = PendingCommand(name, list(steps), expect, on_settled, timeout or self.default_timeout)
+        with self._lock:
+            if self._active is not None:
+                self.logger.debug(f"CommandPipeline: '{name}' queued behind '{self._active.name}'.")
+                self._waiting.append(command)
+                return command.future
+            self._active = command
+        self._begin(command)
+        return command.future
+
+    def _begin(self, command):
+        command.baseline = self.listener.get_current_state()
+        command.started_at = time.monotonic()
+        command.timer = threading.Timer(command.timeout, self._expire, args=(command,))
+        command.timer.daemon = True
+        command.timer.start()
+        self._advance(command)
+
+    def _advance(self, command):
+        """Emit steps until one has to wait for an acknowledgement, or all are sent."""
+        while True:
+            with self._lock:
+                if self._active is not command:
+                    return
+                if command.index >= len(command.steps):
+                    break
+                step = command.steps[command.index]
+                command.index += 1
+                # Set before emitting: the acknowledgement or the expected state can
+                # arrive before emit() returns
+                if step.expect_queue is not None:
+                    command.awaiting = step
+                elif command.index == len(command.steps):
+                    command.awaiting = AWAIT_STATE
+                else:
+                    command.awaiting = None
+
+            if not self.listener.is_connected():
+                self._finish(command, ConnectionError("Not connected to Volumio"))
+                return
+            if step.payload is None:
+                self.listener.socketIO.emit(step.event)
+            else:
+                self.listener.socketIO.emit(step.event, step.payload)
+            self.logger.debug(f"CommandPipeline: '{command.name}' sent {step.event}.")
+
+            if step.expect_queue is not None:
+                with self._lock:
+                    if command.awaiting is step:
+                        command.step_timer = threading.Timer(step.timeout, self._step_timeout, args=(command, step))
+                        command.step_timer.daemon = True
+                        command.step_timer.start()
+                        return
+                # Already acknowledged while emitting; carry straight on
+
+        if command.expect is None:
+            self._finish(command, None)
+            return
+        with self._lock:
+            command.awaiting = AWAIT_STATE
+
+    def _on_queue(self, sender, queue=None, **kwargs):
+        with self._lock:
+            command = self._active
+            step = command.awaiting if command else None
+            if not isinstance(step, CommandStep) or not step.expect_queue(queue):
+                return
+            command.awaiting = None
+            if command.step_timer is None:
+                # Acknowledged before emit() returned; the emitting thread carries on
+                return
+            command.step_timer.cancel()
+            command.step_timer = None
+        self._advance(command)
+
+    def _step_timeout(self, command, step):
+        with self._lock:
+            if self._active is not command or command.awaiting is not step:
+                return
+            command.awaiting = None
+            command.step_timer = None
+        self.logger.warning(f"CommandPipeline: No queue update after {step.event}; continuing '{command.name}'.")
+        self._advance(command)
+
+    def _on_state(self, sender, state=None, **kwargs):
+        with self._lock:
+            command = self._active
+            if command is None or command.awaiting != AWAIT_STATE or command.expect is None or state is None:
+                return
+        if command.expect(state, command.baseline):
+            self._finish(command, None)
+
+    def _on_disconnect(self, sender, **kwargs):
+        with self._lock:
+            command = self._active
+        if command is not None:
+            self._finish(command, ConnectionError("Disconnected from Volumio"))
+
+    def _expire(self, command):
+        self._finish(command, CommandTimeoutError(command.name, command.timeout))
+
+    def _finish(self, command, error):
+        with self._lock:
+            if self._active is not command:
+                return
+            for timer in (command.timer, command.step_timer):
+                if timer:
+                    timer.cancel()
+            # A command finished before _begin() ran (e.g. on disconnect) never started
+            latency = time.monotonic() - (command.started_at or time.monotonic())
+            self._record(command.name, latency, error)
+            # Hand over in the same locked section, so a run() arriving now queues
+            # behind the next command instead of slipping in ahead of it
+            next_command = self._waiting.popleft() if self._waiting else None
+            self._active = next_command
+
+        if error is None:
+            self.logger.info(f"CommandPipeline: '{command.name}' took effect in {latency * 1000:.0f} ms.")
+        else:
+            self.logger.warning(f"CommandPipeline: {error}")
+        if command.on_settled:
+            try:
+                command.on_settled()
+            except Exception as e:
+                self.logger.error(f"CommandPipeline: Settle callback for '{command.name}' failed: {e}")
+        if error is None:
+            command.future.set_result(latency)
+        else:
+            command.future.set_exception(error)
+
+        if next_command is not None:
+            self._begin(next_command)
+
+    def _record(self, name, latency, error):
+        """Update per-command counters. Caller holds the lock."""
+        stats = self._stats.setdefault(name, {'count': 0, 'timeouts': 0, 'failures': 0,
+                                              'total': 0.0, 'max': 0.0, 'last': None})
+        stats['count'] += 1
+        if isinstance(error, CommandTimeoutError):
+            stats['timeouts'] += 1
+        elif error is not None:
+            stats['failures'] += 1
+        else:
+            stats['total'] += latency
+            stats['max'] = max(stats['max'], latency)
+            stats['last'] = latency
+
+    def stats(self):
+        """Per command name: count, timeouts, failures and last/avg/max latency of those that took effect."""
+        with self._lock:
+            result = {}
+            for name, stats in self._stats.items():
+                settled = stats['count'] - stats['timeouts'] - stats['failures']
+                result[name] = {
+                    'count': stats['count'],
+                    'timeouts': stats['timeouts'],
+                    'failures': stats['failures'],
+                    'last': stats['last'],
+                    'avg': stats['total'] / settled if settled else None,
+                    'max': stats['max'],
+                }
+            return result
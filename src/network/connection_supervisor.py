@@ -0,0 +1,140 @@
+# src/network/connection_supervisor.py
+
+import time
+import random
+import logging
+import threading
+
+# Tried in order on every attempt: a direct websocket skips the long-polling
+# handshake and upgrade, polling is the fallback for servers without websockets.
+TRANSPORT_PREFERENCE = (['websocket'], ['polling', 'websocket'])
+
+
+class ConnectionSupervisor:
+    """
+    Owns the Socket.IO connection lifecycle from a single thread.
+
+    `connect(transports)` must make one blocking connection attempt and raise
+    on failure. The supervisor calls it until it succeeds, sleeping a capped,
+    fully jittered exponential backoff between attempts, then parks until
+    connection_lost() is reported. Because only this thread ever reconnects,
+    a flapping server cannot pile up reconnect threads.
+    """
+
+    def __init__(self, connect, is_connected, initial_delay=0.5, max_delay=30.0, name="VolumioReconnect"):
+        self.logger = logging.getLogger("ConnectionSupervisor")
+        self.connect = connect
+        self.is_connected = is_connected
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.name = name
+
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.attempt = 0
+        self.offline_since = time.monotonic()
+        self.transport = None
+
+        self.connects = 0
+        self.disconnects = 0
+        self.failed_attempts = 0
+        self.last_reconnect_time = None
+        self.max_reconnect_time = 0.0
+        self._total_reconnect_time = 0.0
+
+    def start(self):
+        """Start supervising; the first connection attempt is made straight away."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._wake.set()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    def connection_lost(self):
+        """Report a dropped connection; the supervisor starts reconnecting at once."""
+        with self._lock:
+            self.disconnects += 1
+            self.offline_since = time.monotonic()
+            self.attempt = 0
+        self._wake.set()
+
+    def connection_made(self, transport=None):
+        """Record a successful connection and how long the client was offline."""
+        with self._lock:
+            # A drop reported before we got here wins; the supervisor will try again
+            if self.offline_since is None or not self.is_connected():
+                return
+            elapsed = time.monotonic() - self.offline_since
+            self.offline_since = None
+            self.attempt = 0
+            self.connects += 1
+            if transport:
+                self.transport = transport
+            # The first connect measures start-up, not a reconnect
+            if self.connects > 1:
+                self.last_reconnect_time = elapsed
+                self.max_reconnect_time = max(self.max_reconnect_time, elapsed)
+                self._total_reconnect_time += elapsed
+        self.logger.info(f"ConnectionSupervisor: Connected via {self.transport} after {elapsed:.2f}s offline.")
+
+    def backoff(self, attempt):
+        """Full jitter: a random delay up to the capped exponential step for `attempt`."""
+        return random.uniform(0, min(self.max_delay, self.initial_delay * (2 ** attempt)))
+
+    def _run(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            while self._running and self.offline_since is not None:
+                if self.is_connected():
+                    # The client reports the drop before it has finished tearing down
+                    time.sleep(0.05)
+                    continue
+                if self._attempt_connect():
+                    break
+                delay = self.backoff(self.attempt)
+                self.attempt += 1
+                self.logger.info(f"ConnectionSupervisor: Retrying in {delay:.1f}s (attempt {self.attempt}).")
+                # A stop() or fresh connection_lost() cuts the wait short
+                if self._wake.wait(delay):
+                    self._wake.clear()
+
+    def _attempt_connect(self):
+        last_error = None
+        # Whatever worked last time goes first, so a polling-only server costs one try, not two
+        order = sorted(TRANSPORT_PREFERENCE, key=lambda transports: '+'.join(transports) != self.transport)
+        for transports in order:
+            try:
+                self.connect(transports)
+            except Exception as e:
+                last_error = e
+                continue
+            self.connection_made('+'.join(transports))
+            return True
+        self.failed_attempts += 1
+        self.logger.warning(f"ConnectionSupervisor: Connection attempt failed: {last_error}")
+        return False
+
+    def stats(self):
+        with self._lock:
+            reconnects = self.connects - 1 if self.connects else 0
+            return {
+                'connected': self.offline_since is None,
+                'transport': self.transport,
+                'connects': self.connects,
+                'disconnects': self.disconnects,
+                'failed_attempts': self.failed_attempts,
+                'offline_for': time.monotonic() - self.offline_since if self.offline_since is not None else 0.0,
+                'last_reconnect_time': self.last_reconnect_time,
+                'max_reconnect_time': self.max_reconnect_time,
+                'avg_reconnect_time': self._total_reconnect_time / reconnects if reconnects else None,
+            }
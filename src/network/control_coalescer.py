@@ -0,0 +1,154 @@
+# src/network/control_coalescer.py
+
+import time
+import logging
+import threading
+
+
+def _start_timer(delay, callback):
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True
+    timer.start()
+
+
+class ControlCoalescer:
+    """
+    Turns a burst of relative nudges (rotary detents) into absolute commands
+    sent at a bounded rate.
+
+    Every nudge moves a local target, starting from the value Volumio last
+    reported. The first change goes out at once; later ones within
+    `interval` seconds are folded into one trailing send of the newest
+    target, so a fast spin costs a handful of commands and always ends on
+    the exact value the knob reached. While the user keeps turning (and for
+    `settle_time` afterwards) nudges build on the local target rather than
+    on pushes still echoing earlier sends.
+
+    `bounds` is a (low, high) tuple, or a callable returning one for limits
+    that change, such as the duration of the current track.
+
+    `send` is called outside the lock, so a slow send (a socket emit, a menu
+    render) never blocks nudges; sends are serialised and one overtaken by
+    a newer value before it could go out is skipped. The first send of a
+    burst runs on the caller's thread; the trailing one is started by
+    `schedule(delay, callback)`, a daemon threading.Timer by default.
+    """
+
+    def __init__(self, send, read_current, bounds=(0, 100), interval=0.05, settle_time=1.0, name="control",
+                 schedule=None):
+        self.logger = logging.getLogger("ControlCoalescer")
+        self.send = send
+        self.read_current = read_current
+        self.bounds = bounds
+        self.interval = interval
+        self.settle_time = settle_time
+        self.name = name
+        self.schedule = schedule or _start_timer
+
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()  # Keeps sends in order; never held with _lock
+        self._target = None
+        self._sent = None
+        self._last_send = 0.0
+        self._last_input = 0.0
+        self._flush_scheduled = False
+
+        self.nudges = 0
+        self.sends = 0
+
+    def nudge(self, delta):
+        """Move the target by `delta`; returns the new target."""
+        with self._lock:
+            now = time.monotonic()
+            if self._target is None or now - self._last_input > self.settle_time:
+                # A new burst: start from what Volumio reports, which may have changed elsewhere
+                base = self.read_current()
+                self._sent = None
+            else:
+                base = self._target
+            target, value = self._update(base + delta, now)
+        self._send(value)
+        return target
+
+    def set(self, value):
+        """Jump the target to an absolute value; returns it after clamping."""
+        with self._lock:
+            target, value = self._update(value, time.monotonic())
+        self._send(value)
+        return target
+
+    @property
+    def target(self):
+        """The value the control is heading to, or None when idle; screens can draw this ahead of Volumio."""
+        with self._lock:
+            if self._target is None or time.monotonic() - self._last_input > self.settle_time:
+                return None
+            return self._target
+
+    def flush(self):
+        """Send the newest target now rather than at the end of the interval."""
+        with self._lock:
+            value = self._take_locked(time.monotonic())
+        self._send(value)
+
+    def reset(self):
+        """Forget the target, so a scheduled send has nothing to send and the next nudge starts afresh."""
+        with self._lock:
+            self._target = None
+            self._sent = None
+
+    def _update(self, value, now):
+        """
+        Clamp, record and schedule a send. Caller holds the lock; returns the
+        target and the value to _send() now (None if the send is deferred).
+        """
+        low, high = self.bounds() if callable(self.bounds) else self.bounds
+        self._target = max(low, min(high, int(value)))
+        self._last_input = now
+        self.nudges += 1
+
+        value = None
+        if not self._flush_scheduled:
+            wait = self._last_send + self.interval - now
+            if wait <= 0:
+                value = self._take_locked(now)
+            else:
+                self._flush_scheduled = True
+                self.schedule(wait, self._scheduled_flush)
+        return self._target, value
+
+    def _scheduled_flush(self):
+        with self._lock:
+            self._flush_scheduled = False
+            value = self._take_locked(time.monotonic())
+        self._send(value)
+
+    def _take_locked(self, now):
+        """Claim the newest target for sending if it differs from the last one sent. Caller holds the lock."""
+        if self._target is None or self._target == self._sent:
+            return None
+        self._sent = self._target
+        self._last_send = now
+        self.sends += 1
+        return self._sent
+
+    def _send(self, value):
+        if value is None:
+            return
+        with self._send_lock:
+            with self._lock:
+                if value != self._sent:
+                    self.sends -= 1  # A newer value has been claimed since; it is the one to send
+                    return
+            try:
+                self.send(value)
+            except Exception as e:
+                self.logger.error(f"ControlCoalescer: Failed to send {self.name} {value}: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'nudges': self.nudges,
+                'sends': self.sends,
+                'coalesced': self.nudges - self.sends,
+            }
@@ -0,0 +1,130 @@
+# src/network/optimistic_state.py
+
+import time
+import logging
+import threading
+
+from network.playback_state import PlaybackState
+
+# Change signal fired when a prediction is made or rolled back, per field
+FIELD_SIGNALS = {
+    'volume': 'volume_changed',
+    'status': 'status_changed',
+    'repeat': 'options_changed',
+    'random': 'options_changed',
+}
+
+
+class Prediction:
+    __slots__ = ('field', 'value', 'made_at', 'timer')
+
+    def __init__(self, field, value):
+        self.field = field
+        self.value = value
+        self.made_at = time.monotonic()
+        self.timer = None
+
+
+class OptimisticState:
+    """
+    Local layer of predicted values on top of Volumio's pushState.
+
+    predict() applies a user intent (volume, status, repeat, random) at once:
+    the matching change signal is sent with the predicted state and
+    `predicted=True`, and apply() overlays every pending prediction onto any
+    state a screen is about to draw. A push carrying the predicted value
+    confirms it. If none does within `confirm_timeout`, the prediction is
+    counted as wrong and rolled back by re-sending the signal with the
+    authoritative state. Pushes with other values in between (e.g. volume
+    steps still on their way) leave the prediction in place.
+    """
+
+    def __init__(self, listener, confirm_timeout=2.0):
+        self.logger = logging.getLogger("OptimisticState")
+        self.listener = listener
+        self.confirm_timeout = confirm_timeout
+
+        self._lock = threading.Lock()
+        self._pending = {}  # field -> Prediction
+
+        self.predictions = 0
+        self.confirmed = 0
+        self.mispredicted = 0
+        self.superseded = 0
+        self._confirm_time_total = 0.0
+
+    def predict(self, field, value):
+        """Show `value` for `field` straight away, until Volumio confirms or contradicts it."""
+        prediction = Prediction(field, value)
+        prediction.timer = threading.Timer(self.confirm_timeout, self._expire, args=(prediction,))
+        prediction.timer.daemon = True
+        with self._lock:
+            previous = self._pending.get(field)
+            if previous is not None:
+                previous.timer.cancel()
+                self.superseded += 1
+            self._pending[field] = prediction
+            self.predictions += 1
+        prediction.timer.start()
+
+        state = self.apply(self.listener.get_current_state())
+        getattr(self.listener, FIELD_SIGNALS[field]).send(
+            self.listener, changes={field: value}, state=state, predicted=True
+        )
+
+    def apply(self, state):
+        """Return `state` with pending predictions overlaid; the same object when nothing is pending."""
+        with self._lock:
+            if not self._pending or state is None:
+                return state
+            overrides = {field: p.value for field, p in self._pending.items()
+                         if getattr(state, field) != p.value}
+        if not overrides:
+            return state
+        data = dict(state.raw)
+        data.update(overrides)
+        return PlaybackState(data)
+
+    def observe(self, state):
+        """Called with every authoritative push; confirms the predictions it matches."""
+        now = time.monotonic()
+        with self._lock:
+            for field, prediction in list(self._pending.items()):
+                if getattr(state, field) == prediction.value:
+                    prediction.timer.cancel()
+                    del self._pending[field]
+                    self.confirmed += 1
+                    self._confirm_time_total += now - prediction.made_at
+
+    def _expire(self, prediction):
+        with self._lock:
+            if self._pending.get(prediction.field) is not prediction:
+                return
+            del self._pending[prediction.field]
+            self.mispredicted += 1
+
+        state = self.listener.get_current_state()
+        actual = getattr(state, prediction.field)
+        self.logger.warning(
+            f"OptimisticState: Predicted {prediction.field}={prediction.value!r} but Volumio reports {actual!r}; rolling back."
+        )
+        getattr(self.listener, FIELD_SIGNALS[prediction.field]).send(
+            self.listener, changes={prediction.field: actual}, state=self.apply(state), predicted=False
+        )
+
+    def is_pending(self, field):
+        with self._lock:
+            return field in self._pending
+
+    def stats(self):
+        with self._lock:
+            decided = self.confirmed + self.mispredicted
+            return {
+                'predictions': self.predictions,
+                'confirmed': self.confirmed,
+                'mispredicted': self.mispredicted,
+                'superseded': self.superseded,
+                'pending': len(self._pending),
+                'misprediction_rate': self.mispredicted / decided if decided else 0.0,
+                'avg_confirm_time': self._confirm_time_total / self.confirmed if self.confirmed else None,
+            }
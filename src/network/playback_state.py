@@ -0,0 +1,107 @@
+# src/network/playback_state.py
+
+import re
+from types import MappingProxyType
+
+SAMPLERATE_PATTERN = re.compile(r"([\d\.]+)\s*(\w+)")
+
+
+def _to_int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_samplerate(samplerate):
+    """Split a Volumio samplerate string ('44.1 kHz', '320 kbps') into (value, display unit)."""
+    match = SAMPLERATE_PATTERN.match(samplerate) if isinstance(samplerate, str) else None
+    if not match:
+        return None, "kHz"
+    try:
+        value = float(match.group(1))
+    except ValueError:
+        return None, "kHz"
+
+    unit = match.group(2).lower()
+    if unit in ["khz", "hz"]:
+        unit = unit.upper()
+    elif unit != "kbps":
+        unit = "kHz"  # default fallback
+    return value, unit
+
+
+class PlaybackState:
+    """
+    Immutable, pre-parsed view of one Volumio pushState payload.
+
+    Built once per push by VolumioListener and shared by reference between
+    threads. The raw payload stays available read-only through `raw` and the
+    dict-style `get()`, so receivers written against plain dicts keep working.
+    """
+
+    __slots__ = (
+        'raw', 'status', 'service', 'track_type',
+        'title', 'artist', 'album', 'albumart', 'uri',
+        'seek', 'seek_seconds', 'duration',
+        'volume', 'mute',
+        'samplerate', 'samplerate_value', 'samplerate_unit', 'bitdepth', 'bitrate',
+        'random', 'repeat',
+    )
+
+    def __init__(self, data=None):
+        data = data if data is not None else {}
+        values = {
+            'raw': MappingProxyType(data),
+            'status': (data.get("status") or "").lower(),
+            'service': (data.get("service") or "").lower(),
+            'track_type': (data.get("trackType") or "").lower(),
+            'title': data.get("title") or "",
+            'artist': data.get("artist") or "",
+            'album': data.get("album") or "",
+            'albumart': data.get("albumart") or "",
+            'uri': data.get("uri") or "",
+            'seek': _to_int(data.get("seek")),
+            'duration': _to_int(data.get("duration")),
+            'volume': max(0, min(_to_int(data.get("volume")), 100)),
+            'mute': bool(data.get("mute", False)),
+            'samplerate': data.get("samplerate") or "",
+            'bitdepth': data.get("bitdepth") or "",
+            'bitrate': data.get("bitrate") or "",
+            'random': bool(data.get("random", False)),
+            'repeat': bool(data.get("repeat", False)),
+        }
+        values['seek_seconds'] = values['seek'] / 1000
+        values['samplerate_value'], values['samplerate_unit'] = _parse_samplerate(values['samplerate'])
+
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PlaybackState is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("PlaybackState is immutable")
+
+    def __bool__(self):
+        return bool(self.raw)
+
+    def __contains__(self, key):
+        return key in self.raw
+
+    def __getitem__(self, key):
+        return self.raw[key]
+
+    def get(self, key, default=None):
+        """Dict-style access to the raw pushState fields."""
+        return self.raw.get(key, default)
+
+    def __repr__(self):
+        return (
+            f"PlaybackState(status={self.status!r}, service={self.service!r}, "
+            f"title={self.title!r}, volume={self.volume}, seek={self.seek})"
+        )
+
+
+# Shared placeholder used before the first pushState arrives
+EMPTY_STATE = PlaybackState()
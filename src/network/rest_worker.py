@@ -0,0 +1,229 @@
+# src/network/rest_worker.py
+
+import json
+import time
+import queue
+import logging
+import itertools
+import threading
+from concurrent.futures import Future
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from network.browse_stream import BrowseItemScanner
+
+# Request priorities: user actions are served before prefetch/revalidation work
+USER = 0
+BACKGROUND = 1
+
+# Items handed to on_first_items: enough for the first screens of a menu
+FIRST_ITEMS = 32
+STREAM_CHUNK_SIZE = 8192
+
+
+class RequestCancelled(Exception):
+    """The request was superseded (the user navigated away) before its result was used."""
+
+
+class DeadlineExceeded(Exception):
+    """The request could not complete before its deadline."""
+
+
+class RestJob:
+    __slots__ = ('future', 'call', 'deadline_at', 'generation', 'label')
+
+    def __init__(self, call, deadline_at, generation, label):
+        self.future = Future()
+        self.call = call
+        self.deadline_at = deadline_at
+        self.generation = generation  # None for requests that must not be cancelled
+        self.label = label
+
+
+class VolumioRestWorker:
+    """
+    Runs blocking Volumio REST calls on worker threads so the input thread never waits.
+
+    Every request gets a deadline that bounds its socket timeouts and how long
+    it may sit in the queue. cancel_pending() supersedes all cancellable
+    requests: queued ones are dropped and results of ones already on the wire
+    are discarded. One keep-alive session is shared by all workers.
+    """
+
+    def __init__(self, base_url, workers=2, default_deadline=8.0, name="VolumioREST"):
+        self.logger = logging.getLogger("VolumioRestWorker")
+        self.base_url = base_url.rstrip('/')
+        self.default_deadline = default_deadline
+
+        # Short retry budget: the deadline, not urllib3, decides when to give up
+        self.session = requests.Session()
+        retries = Retry(total=2, connect=2, read=0, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._running = True
+
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, call, priority=USER, deadline=None, cancellable=True, label=""):
+        """
+        Queue `call(timeout)` and return a Future for its result. `timeout` is the
+        time left before the deadline, to be passed on to requests.
+        """
+        deadline_at = time.monotonic() + (deadline or self.default_deadline)
+        with self._lock:
+            generation = self._generation if cancellable else None
+        job = RestJob(call, deadline_at, generation, label)
+        self._queue.put((priority, next(self._sequence), job))
+        return job.future
+
+    def browse(self, uri, priority=USER, deadline=None, cancellable=True, on_first_items=None, first_count=FIRST_ITEMS):
+        """
+        GET /api/v1/browse for `uri`; resolves to the 'navigation' block.
+
+        With `on_first_items`, the response is streamed and the callback gets the
+        first `first_count` items of the first list (on the worker thread) as soon
+        as they have arrived, while the rest of a large folder is still loading.
+        It is not called when the whole response arrives before that many items.
+        """
+        url = f"{self.base_url}/api/v1/browse?uri={quote(uri)}"
+        label = f"browse {uri}"
+        if on_first_items is None:
+            def call(timeout):
+                response = self.session.get(url, timeout=timeout)
+                response.raise_for_status()
+                return response.json().get("navigation", {})
+        else:
+            with self._lock:
+                generation = self._generation if cancellable else None
+
+            def call(timeout):
+                return self._stream_browse(url, timeout, on_first_items, first_count,
+                                           lambda: self.is_current(generation), label)
+        return self.submit(call, priority, deadline, cancellable, label=label)
+
+    def _stream_browse(self, url, timeout, on_first_items, first_count, is_wanted, label):
+        # The read timeout applies per chunk, so enforce the overall deadline here
+        give_up_at = time.monotonic() + timeout[1]
+        scanner = BrowseItemScanner(limit=first_count)
+        chunks = []
+        with self.session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                chunks.append(chunk)
+                if not scanner.done:
+                    scanner.feed(chunk)
+                    if scanner.done and len(scanner.items) >= first_count:
+                        try:
+                            on_first_items(scanner.items)
+                        except Exception as e:
+                            self.logger.error(f"VolumioRestWorker: First items callback for {label} failed: {e}")
+                # Stop downloading a big folder the user has already left
+                if not is_wanted():
+                    raise RequestCancelled(label)
+                if time.monotonic() > give_up_at:
+                    raise requests.Timeout(f"response still incomplete after {timeout[1]:.1f}s")
+        return json.loads(b"".join(chunks)).get("navigation", {})
+
+    def post(self, path, payload, priority=USER, deadline=None, cancellable=False):
+        """POST JSON to /api/v1/<path>; resolves to the response. Commands are not cancellable by default."""
+        def call(timeout):
+            response = self.session.post(f"{self.base_url}/api/v1/{path}", json=payload, timeout=timeout)
+            response.raise_for_status()
+            return response
+        return self.submit(call, priority, deadline, cancellable, label=f"post {path}")
+
+    def cancel_pending(self):
+        """Supersede every cancellable request submitted so far."""
+        with self._lock:
+            self._generation += 1
+
+    def is_current(self, future_generation):
+        with self._lock:
+            return future_generation is None or future_generation == self._generation
+
+    def stop(self):
+        self._running = False
+        for _ in self._threads:
+            self._queue.put((USER, next(self._sequence), None))
+
+    def _run(self):
+        while self._running:
+            _, _, job = self._queue.get()
+            if job is None:
+                break
+            self._execute(job)
+
+    def _count(self, counter):
+        """Increment a stats counter; several workers finish requests at once."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _execute(self, job):
+        future = job.future
+        if not self.is_current(job.generation):
+            self._count('cancelled')
+            future.cancel()
+            return
+        if not future.set_running_or_notify_cancel():
+            self._count('cancelled')
+            return
+
+        remaining = job.deadline_at - time.monotonic()
+        if remaining <= 0:
+            self._count('timeouts')
+            future.set_exception(DeadlineExceeded(f"{job.label} expired in the queue"))
+            return
+
+        started = time.monotonic()
+        try:
+            # Connect quickly or not at all; the read may use what is left
+            result = job.call((min(3.0, remaining), remaining))
+        except requests.Timeout as e:
+            self._count('timeouts')
+            future.set_exception(DeadlineExceeded(f"{job.label} timed out: {e}"))
+            return
+        except RequestCancelled as e:
+            self._count('cancelled')
+            future.set_exception(e)
+            return
+        except Exception as e:
+            self._count('failed')
+            future.set_exception(e)
+            return
+
+        if not self.is_current(job.generation):
+            self._count('cancelled')
+            future.set_exception(RequestCancelled(job.label))
+            return
+        self._count('completed')
+        self.logger.debug(f"VolumioRestWorker: {job.label} took {(time.monotonic() - started) * 1000:.0f} ms")
+        future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'completed': self.completed,
+                'failed': self.failed,
+                'timeouts': self.timeouts,
+                'cancelled': self.cancelled,
+            }
@@ -0,0 +1,115 @@
+# src/network/state_snapshot.py
+
+import os
+import json
+import time
+import logging
+import threading
+
+from network.playback_state import PlaybackState
+
+# Fields that change on every pushState without changing what a fresh boot
+# should render; they alone never trigger a write.
+VOLATILE_FIELDS = ('seek',)
+
+
+class StateSnapshotStore:
+    """
+    Keeps the last PlaybackState and mode in a small JSON file, so the next
+    start can draw the right screen before Volumio answers.
+
+    update() is cheap and may be called on every push. Seek-only changes are
+    ignored, and at most one write happens per `min_interval` seconds; a
+    change inside that window is written by a trailing timer, so the file
+    always ends up with the latest state. Writes go to a temporary file that
+    is renamed over the old one, so a power cut never leaves half a snapshot.
+    """
+
+    def __init__(self, path, min_interval=10.0):
+        self.logger = logging.getLogger("StateSnapshotStore")
+        self.path = path
+        self.min_interval = min_interval
+
+        self._lock = threading.Lock()
+        self._state = None
+        self._mode = None
+        self._written_key = None
+        self._last_write = 0.0
+        self._timer = None
+
+        self.writes = 0
+        self.skipped = 0
+
+    def load(self):
+        """Return (PlaybackState or None, mode or None, saved_at or None) from the file."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.logger.info("StateSnapshotStore: No snapshot found.")
+            return None, None, None
+        except (IOError, ValueError) as e:
+            self.logger.warning(f"StateSnapshotStore: Ignoring unreadable snapshot: {e}")
+            return None, None, None
+
+        raw_state = data.get("state")
+        state = PlaybackState(raw_state) if raw_state else None
+        mode = data.get("mode")
+        with self._lock:
+            self._state = raw_state
+            self._mode = mode
+            self._written_key = self._key(raw_state, mode)
+        return state, mode, data.get("saved_at")
+
+    def update(self, state=None, mode=None):
+        """Record the latest state and/or mode, writing now or after the throttle window."""
+        with self._lock:
+            if state is not None:
+                self._state = dict(state.raw)
+            if mode is not None:
+                self._mode = mode
+            if self._key(self._state, self._mode) == self._written_key:
+                self.skipped += 1
+                return
+            wait = self._last_write + self.min_interval - time.monotonic()
+            if wait > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """Write the latest state now if it differs from what is on disk."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            key = self._key(self._state, self._mode)
+            if key == self._written_key:
+                return
+            payload = {"state": self._state, "mode": self._mode, "saved_at": time.time()}
+            self._written_key = key
+            self._last_write = time.monotonic()
+
+        temp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(temp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(temp_path, self.path)
+            self.writes += 1
+            self.logger.debug(f"StateSnapshotStore: Saved snapshot (mode: {payload['mode']}).")
+        except (IOError, OSError, TypeError, ValueError) as e:
+            self.logger.error(f"StateSnapshotStore: Failed to save snapshot: {e}")
+
+    @staticmethod
+    def _key(raw_state, mode):
+        if raw_state is None:
+            return (None, mode)
+        stable = {k: v for k, v in raw_state.items() if k not in VOLATILE_FIELDS}
+        return (json.dumps(stable, sort_keys=True, default=str), mode)
+
+    def stats(self):
+        return {'writes': self.writes, 'skipped': self.skipped}
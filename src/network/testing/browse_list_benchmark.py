@@ -0,0 +1,109 @@
+# src/network/testing/browse_list_benchmark.py
+#
+# Compares the list-of-dicts menus the managers used to build with
+# BrowseList: memory per listing, build time, the cost of drawing one menu
+# window and of snapshotting a listing onto the menu stack.
+#
+# Usage (from the src directory):
+#   python -m network.testing.browse_list_benchmark
+#   python -m network.testing.browse_list_benchmark --items 50000 --window 4
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from network.browse_list import BrowseList
+
+
+def make_items(count, tracks_per_album=12):
+    """Synthetic browseLibrary items shaped like a large NAS folder of songs."""
+    items = []
+    for i in range(count):
+        album = i // tracks_per_album
+        items.append({
+            "service": "mpd",
+            "type": "song",
+            "title": f"Track {i % tracks_per_album + 1:02d} - Song {i}",
+            "artist": f"Artist {album % 300}",
+            "album": f"Album {album}",
+            "uri": f"music-library/NAS/Music/Artist {album % 300}/Album {album}/{i:05d}.flac",
+            # Volumio hands out a fresh string per item, even for the same art
+            "albumart": "".join(["/albumart?path=/mnt/NAS/Music/Album ", str(album)]),
+        })
+    return items
+
+
+def as_dicts(items):
+    """The shape LibraryManager.show_navigation built before BrowseList."""
+    return [
+        {
+            "title": item.get("title", "Untitled"),
+            "uri": item.get("uri", ""),
+            "type": item.get("type", "").lower(),
+            "service": item.get("service", "").lower(),
+            "albumart": item.get("albumart", None)
+        }
+        for item in items
+    ]
+
+
+def measure_memory(build, items):
+    """Bytes allocated by `build(items)` that are still held by its result."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(items)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def time_per_call(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+def bench(name, build, items, window, calls):
+    listing, memory = measure_memory(build, items)
+    build_time = time_per_call(lambda: build(items), 5)
+
+    # Both support slicing, which is how the managers' get_visible_window() reads a window
+    positions = iter([random.randrange(max(1, len(listing) - window)) for _ in range(calls)])
+
+    def draw_window():
+        start = next(positions)
+        return [item["title"] for item in listing[start:start + window]]
+
+    window_time = time_per_call(draw_window, calls)
+    snapshot_time = time_per_call(listing.copy, 200)
+
+    per_10k = memory * 10000 / len(items)
+    print(f"{name:<14} {memory / 1024:10.0f} KiB {per_10k / 1024:12.0f} KiB {memory / len(items):9.0f} B "
+          f"{build_time * 1000:10.1f} ms {window_time * 1e6:10.1f} us {snapshot_time * 1e6:11.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and access cost of menu listings.")
+    parser.add_argument("--items", type=int, default=10000, help="Items in the listing")
+    parser.add_argument("--window", type=int, default=4, help="Rows drawn per menu window")
+    parser.add_argument("--calls", type=int, default=2000, help="Window draws to time")
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    print(f"{args.items} items, window of {args.window}")
+    print(f"{'listing':<14} {'memory':>14} {'per 10k':>16} {'per item':>11} "
+          f"{'build':>13} {'window':>13} {'snapshot':>14}")
+    bench("list of dicts", as_dicts, items, args.window, args.calls)
+    bench("BrowseList", lambda source: BrowseList(source, lower=True), items, args.window, args.calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# src/network/testing/browse_stream_benchmark.py
+#
+# Time-to-first-row for large library folders: how long until a menu can draw
+# its first rows when the whole REST browse response is downloaded, decoded
+# and converted first, versus streamed with the first rows handed over as
+# soon as they arrive. Runs against the mock Volumio server, so folder size
+# and link speed are under control, or against a real box with --host.
+#
+# Usage (from the src directory):
+#   python -m network.testing.browse_stream_benchmark
+#   python -m network.testing.browse_stream_benchmark --sizes 1000 10000 --bandwidth 500000
+#   python -m network.testing.browse_stream_benchmark --host volumio.local --uri music-library/NAS/Music
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from network.browse_list import BrowseList
+from network.rest_worker import VolumioRestWorker
+
+
+def measure(worker, uri, streamed):
+    """Return (first row seconds, complete listing seconds, item count) for one browse."""
+    first_rows = {}
+    started = time.perf_counter()
+
+    def on_first_items(items):
+        BrowseList(items, lower=True)
+        first_rows.setdefault('at', time.perf_counter())
+
+    future = worker.browse(uri, on_first_items=on_first_items if streamed else None)
+    navigation = future.result()
+    items = (navigation.get("lists") or [{}])[0].get("items") or []
+    listing = BrowseList(items, lower=True)
+    complete = time.perf_counter() - started
+    # Small folders arrive whole before the first batch is complete
+    first = first_rows['at'] - started if 'at' in first_rows else complete
+    return first, complete, len(listing)
+
+
+def run(worker, uri, samples, label):
+    for streamed in (False, True):
+        firsts, completes, count = [], [], 0
+        for _ in range(samples):
+            first, complete, count = measure(worker, uri, streamed)
+            firsts.append(first)
+            completes.append(complete)
+        mode = "streamed" if streamed else "whole"
+        print(f"{label:>10} {count:>8} {mode:>9} {statistics.median(firsts) * 1000:12.1f} ms "
+              f"{statistics.median(completes) * 1000:12.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-row of large browse listings.")
+    parser.add_argument("--host", help="Benchmark a real Volumio instead of the mock server.")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--uri", help="Folder to browse on --host.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000],
+                        help="Folder sizes served by the mock server.")
+    parser.add_argument("--bandwidth", type=int, default=2000000,
+                        help="Mock server response bandwidth in bytes per second; 0 is unlimited.")
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(f"{'folder':>10} {'items':>8} {'response':>9} {'first row':>15} {'complete':>15}")
+
+    if args.host:
+        worker = VolumioRestWorker(f"http://{args.host}:{args.port}", default_deadline=60)
+        run(worker, args.uri or "music-library", args.samples, "volumio")
+        return
+
+    from network.testing.mock_volumio import MockVolumioServer, MockScenario
+
+    scenario = MockScenario(push_rate=0, rest_bandwidth=args.bandwidth)
+    server = MockVolumioServer(port=args.port, scenario=scenario).start()
+    try:
+        worker = VolumioRestWorker(f"http://127.0.0.1:{args.port}", default_deadline=120)
+        for size in args.sizes:
+            uri = f"music-library/big{size}"
+            scenario.folder_sizes[uri] = size
+            run(worker, uri, args.samples, f"big{size}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
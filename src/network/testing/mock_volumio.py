@@ -0,0 +1,546 @@
+# src/network/testing/mock_volumio.py
+#
+# A local stand-in for a Volumio box speaking the subset of its Socket.IO and
+# REST API that Quadify uses, so listeners, managers and benchmarks can run
+# without hardware. Latency, folder sizes and push rates are scriptable, either
+# from the command line, a JSON scenario file, or by changing
+# `server.scenario` while the server runs.
+#
+# Socket.IO events handled: getState, browseLibrary, volume, seek, toggle,
+# play, pause, next, previous, repeat, random, replaceAndPlay, clearQueue,
+# addToQueue, playPlaylist. Events sent: pushState, pushQueue,
+# pushBrowseLibrary, pushToastMessage.
+# REST: GET /api/v1/browse?uri=..., POST /api/v1/replaceAndPlay, GET /api/v1/getState.
+#
+# The server uses python-socketio's threading mode, so clients talk to it over
+# long-polling; that is slower than a websocket, so compare runs against each
+# other rather than against a real Volumio.
+#
+# Usage (from the src directory):
+#   python -m network.testing.mock_volumio --port 3000 --latency 0.05 --push-rate 2
+#   python -m network.testing.mock_volumio --size music-library/big=10000 --browse-latency 0.3
+#   python -m network.testing.mock_volumio --scenario slow_nas.json
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from urllib.parse import parse_qs
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import make_server, WSGIServer, WSGIRequestHandler
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import socketio
+
+
+# Top-level sources, shaped like Volumio's root browse listing
+ROOT_SOURCES = [
+    ("Music Library", "music-library", "mpd"),
+    ("Web Radio", "radio", "webradio"),
+    ("Playlists", "playlists", "mpd"),
+    ("TIDAL", "tidal://", "tidal"),
+    ("Qobuz", "qobuz://", "qobuz"),
+    ("Spotify", "spotify", "spop"),
+]
+
+
+class MockScenario:
+    """
+    Knobs for the mock server. All delays are in seconds; every delay gets up
+    to `jitter` extra seconds at random.
+    """
+
+    def __init__(self, **settings):
+        self.latency = 0.0           # delay before answering getState and commands
+        self.browse_latency = 0.0    # delay before pushBrowseLibrary / REST browse replies
+        self.rest_latency = 0.0      # extra delay for every REST request
+        self.rest_bandwidth = 0      # bytes per second for REST response bodies; 0 is unlimited
+        self.jitter = 0.0
+        self.default_folder_size = 20
+        self.folder_sizes = {}       # URI prefix -> number of items; longest prefix wins
+        self.depth = 2               # folder levels below a source before albums of songs
+        self.push_rate = 1.0         # pushState per second while playing; 0 disables
+        self.track_duration = 240
+        self.toasts = True
+        self.drop_browse_rate = 0.0  # fraction of browseLibrary requests that never get a reply
+        self.update(**settings)
+
+    def update(self, **settings):
+        for key, value in settings.items():
+            if not hasattr(self, key):
+                raise ValueError(f"Unknown scenario setting '{key}'")
+            setattr(self, key, value)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def delay(self, base):
+        total = base + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if total > 0:
+            time.sleep(total)
+
+    def folder_size(self, uri):
+        best = None
+        for prefix in self.folder_sizes:
+            if uri.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.folder_sizes[best] if best is not None else self.default_folder_size
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class MockVolumioServer:
+    """
+    Socket.IO + REST server emulating Volumio on `host:port`.
+
+    start() serves from a background thread; stop() shuts it down. The
+    request counters in stats() let benchmarks check what the client sent.
+    """
+
+    def __init__(self, host="127.0.0.1", port=3000, scenario=None):
+        self.logger = logging.getLogger("MockVolumioServer")
+        self.host = host
+        self.port = port
+        self.scenario = scenario or MockScenario()
+
+        self.sio = socketio.Server(async_mode='threading', cors_allowed_origins='*')
+        self.app = socketio.WSGIApp(self.sio, self._rest_app)
+        self._register_handlers()
+
+        self.state_lock = threading.Lock()
+        self.state = {
+            'status': 'stop',
+            'title': '',
+            'artist': '',
+            'album': '',
+            'albumart': '/albumart',
+            'uri': '',
+            'trackType': 'flac',
+            'seek': 0,
+            'duration': self.scenario.track_duration,
+            'samplerate': '44.1 kHz',
+            'bitdepth': '16 bit',
+            'volume': 50,
+            'mute': False,
+            'random': False,
+            'repeat': False,
+            'service': 'mpd',
+        }
+        self.queue = []
+        self._playing_since = None
+
+        self._listings = {}  # uri -> generated navigation, so big folders are built once
+        self.counters = {}
+        self.counters_lock = threading.Lock()
+
+        self._httpd = None
+        self._serve_thread = None
+        self._push_thread = None
+        self._running = threading.Event()
+
+    # ------------------------------------------------------------------ lifecycle
+
+    def start(self):
+        self._httpd = make_server(self.host, self.port, self.app,
+                                  server_class=ThreadingWSGIServer, handler_class=QuietRequestHandler)
+        self.port = self._httpd.server_port  # resolves port 0 to the one the OS picked
+        self._running.set()
+        self._serve_thread = threading.Thread(target=self._httpd.serve_forever, name="MockVolumioHTTP", daemon=True)
+        self._serve_thread.start()
+        self._push_thread = threading.Thread(target=self._push_loop, name="MockVolumioPush", daemon=True)
+        self._push_thread.start()
+        self.logger.info(f"MockVolumioServer: Listening on http://{self.host}:{self.port}")
+        return self
+
+    def stop(self):
+        self._running.clear()
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        self.logger.info("MockVolumioServer: Stopped.")
+
+    def stats(self):
+        with self.counters_lock:
+            return dict(self.counters)
+
+    def _count(self, name):
+        with self.counters_lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    # ------------------------------------------------------------------ state
+
+    def current_state(self):
+        with self.state_lock:
+            state = dict(self.state)
+            if self._playing_since is not None:
+                elapsed_ms = int((time.monotonic() - self._playing_since) * 1000)
+                state['seek'] = min(state['seek'] + elapsed_ms, state['duration'] * 1000)
+        return state
+
+    def set_state(self, push=True, **fields):
+        """Change the emulated player state, e.g. set_state(status='play', title='x')."""
+        with self.state_lock:
+            self._freeze_seek()
+            self.state.update(fields)
+            if self.state['status'] == 'play':
+                self._playing_since = time.monotonic()
+        if push:
+            self.push_state()
+
+    def _freeze_seek(self):
+        """Fold playback time into `seek`. Caller holds the state lock."""
+        if self._playing_since is not None:
+            elapsed_ms = int((time.monotonic() - self._playing_since) * 1000)
+            self.state['seek'] = min(self.state['seek'] + elapsed_ms, self.state['duration'] * 1000)
+            self._playing_since = None
+
+    def push_state(self, sid=None):
+        self._count('pushState')
+        self.sio.emit('pushState', self.current_state(), room=sid)
+
+    def push_queue(self):
+        with self.state_lock:
+            queue = list(self.queue)
+        self._count('pushQueue')
+        self.sio.emit('pushQueue', queue)
+
+    def toast(self, title, message, kind='success'):
+        if self.scenario.toasts:
+            self._count('pushToastMessage')
+            self.sio.emit('pushToastMessage', {'type': kind, 'title': title, 'message': message})
+
+    def _push_loop(self):
+        while self._running.is_set():
+            rate = self.scenario.push_rate
+            if rate <= 0:
+                time.sleep(0.2)
+                continue
+            time.sleep(1.0 / rate)
+            if self.current_state()['status'] == 'play':
+                self.push_state()
+
+    def _play_item(self, item):
+        self.set_state(
+            status='play',
+            title=item.get('title') or item.get('name') or 'Untitled',
+            artist=item.get('artist', 'Mock Artist'),
+            album=item.get('album', 'Mock Album'),
+            uri=item.get('uri', ''),
+            service=item.get('service', 'mpd'),
+            seek=0,
+            duration=self.scenario.track_duration,
+        )
+
+    # ------------------------------------------------------------------ browsing
+
+    def navigation(self, uri):
+        """Build (or reuse) the navigation block Volumio would return for `uri`."""
+        uri = (uri or '').strip()
+        size = self.scenario.folder_size(uri)
+        cached = self._listings.get(uri)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+
+        if uri in ('', '/'):
+            items = [{'title': title, 'uri': source_uri, 'service': service, 'type': 'folder'}
+                     for title, source_uri, service in ROOT_SOURCES]
+        else:
+            items = self._generate_items(uri, size)
+        # Like Volumio, the navigation does not name the URI it lists
+        navigation = {
+            'prev': {'uri': uri.rsplit('/', 1)[0] if '/' in uri else ''},
+            'lists': [{'availableListViews': ['list'], 'items': items}],
+        }
+        self._listings[uri] = (size, navigation)
+        return navigation
+
+    def _generate_items(self, uri, size):
+        # "music-library/a/b" and "tidal://a/b" are both two levels below their source
+        if '://' in uri:
+            source, path = uri.split('://', 1)
+            depth = len([part for part in path.split('/') if part])
+        else:
+            source, _, path = uri.partition('/')
+            depth = len([part for part in path.split('/') if part])
+        service = {'radio': 'webradio', 'tidal': 'tidal', 'qobuz': 'qobuz', 'spotify': 'spop'}.get(source, 'mpd')
+        base = uri.rstrip('/')
+
+        if source == 'playlists':
+            return [{'title': f"Playlist {i + 1}", 'uri': f"{base}/{i + 1}", 'service': 'mpd', 'type': 'playlist'}
+                    for i in range(size)]
+        if source == 'radio':
+            if depth == 0:
+                return [{'title': f"Category {i + 1}", 'uri': f"{base}/cat{i + 1}", 'service': service,
+                         'type': 'radio-category'} for i in range(size)]
+            return [{'title': f"Station {i + 1}", 'uri': f"http://127.0.0.1/stream/{i + 1}",
+                     'service': service, 'type': 'webradio', 'albumart': '/albumart'} for i in range(size)]
+
+        if depth < self.scenario.depth:
+            folder_type = 'folder' if service == 'mpd' else 'streaming-folder'
+            return [{'title': f"Folder {depth}.{i + 1}", 'uri': f"{base}/f{i + 1}", 'service': service,
+                     'type': folder_type} for i in range(size)]
+        return [{'title': f"Track {i + 1}", 'artist': 'Mock Artist', 'album': base.rsplit('/', 1)[-1],
+                 'uri': f"{base}/track{i + 1}.flac", 'service': service, 'type': 'song',
+                 'duration': self.scenario.track_duration} for i in range(size)]
+
+    # ------------------------------------------------------------------ socket.io
+
+    def _register_handlers(self):
+        sio = self.sio
+
+        @sio.on('connect')
+        def on_connect(sid, environ):
+            self._count('connect')
+
+        @sio.on('getState')
+        def on_get_state(sid, data=None):
+            self._count('getState')
+            self.scenario.delay(self.scenario.latency)
+            self.push_state(sid)
+
+        @sio.on('browseLibrary')
+        def on_browse_library(sid, data=None):
+            self._count('browseLibrary')
+            if self.scenario.drop_browse_rate and random.random() < self.scenario.drop_browse_rate:
+                self._count('browseLibrary_dropped')
+                return
+            self.scenario.delay(self.scenario.browse_latency)
+            uri = (data or {}).get('uri', '')
+            self._count('pushBrowseLibrary')
+            self.sio.emit('pushBrowseLibrary', {'navigation': self.navigation(uri)}, room=sid)
+
+        @sio.on('volume')
+        def on_volume(sid, value=None):
+            self._count('volume')
+            self.scenario.delay(self.scenario.latency)
+            volume = self.current_state()['volume']
+            if value == '+':
+                volume += 1
+            elif value == '-':
+                volume -= 1
+            else:
+                try:
+                    volume = int(value)
+                except (TypeError, ValueError):
+                    return
+            self.set_state(volume=max(0, min(100, volume)))
+
+        def command(name, **fields):
+            def handler(sid, data=None):
+                self._count(name)
+                self.scenario.delay(self.scenario.latency)
+                self.set_state(**fields)
+            sio.on(name, handler)
+
+        command('play', status='play')
+        command('pause', status='pause')
+        command('stop', status='stop', seek=0)
+
+        @sio.on('toggle')
+        def on_toggle(sid, data=None):
+            self._count('toggle')
+            self.scenario.delay(self.scenario.latency)
+            self.set_state(status='pause' if self.current_state()['status'] == 'play' else 'play')
+
+        @sio.on('seek')
+        def on_seek(sid, value=None):
+            self._count('seek')
+            self.scenario.delay(self.scenario.latency)
+            try:
+                self.set_state(seek=max(0, int(value)) * 1000)
+            except (TypeError, ValueError):
+                return
+
+        @sio.on('next')
+        def on_next(sid, data=None):
+            self._count('next')
+            self.scenario.delay(self.scenario.latency)
+            self._skip(1)
+
+        @sio.on('previous')
+        def on_previous(sid, data=None):
+            self._count('previous')
+            self.scenario.delay(self.scenario.latency)
+            self._skip(-1)
+
+        @sio.on('repeat')
+        def on_repeat(sid, data=None):
+            self._count('repeat')
+            self.scenario.delay(self.scenario.latency)
+            self.set_state(repeat=not self.current_state()['repeat'])
+
+        @sio.on('random')
+        def on_random(sid, data=None):
+            self._count('random')
+            self.scenario.delay(self.scenario.latency)
+            self.set_state(random=not self.current_state()['random'])
+
+        @sio.on('replaceAndPlay')
+        def on_replace_and_play(sid, data=None):
+            self._count('replaceAndPlay')
+            self.scenario.delay(self.scenario.latency)
+            self._replace_and_play(data or {})
+
+        @sio.on('clearQueue')
+        def on_clear_queue(sid, data=None):
+            self._count('clearQueue')
+            self.scenario.delay(self.scenario.latency)
+            with self.state_lock:
+                self.queue = []
+            self.push_queue()
+            self.set_state(status='stop', seek=0)
+
+        @sio.on('addToQueue')
+        def on_add_to_queue(sid, data=None):
+            self._count('addToQueue')
+            self.scenario.delay(self.scenario.latency)
+            with self.state_lock:
+                self.queue.append(data or {})
+            self.push_queue()
+            self.toast("Added", (data or {}).get('title', 'Item') + " added to queue")
+
+        @sio.on('playPlaylist')
+        def on_play_playlist(sid, data=None):
+            self._count('playPlaylist')
+            self.scenario.delay(self.scenario.latency)
+            name = (data or {}).get('name', 'Playlist')
+            self._play_item({'title': f"{name} - Track 1", 'uri': f"playlists/{name}/1"})
+            self.toast("Playing", f"Playlist {name}")
+
+    def _replace_and_play(self, data):
+        item = data.get('item', data)
+        with self.state_lock:
+            self.queue = [item]
+        self.push_queue()
+        self._play_item(item)
+        self.toast("Playing", item.get('title') or item.get('name') or item.get('uri', ''))
+
+    def _skip(self, step):
+        with self.state_lock:
+            queue = list(self.queue)
+            current_uri = self.state['uri']
+        if not queue:
+            self.set_state(seek=0)
+            return
+        uris = [item.get('uri') for item in queue]
+        index = uris.index(current_uri) if current_uri in uris else 0
+        self._play_item(queue[(index + step) % len(queue)])
+
+    # ------------------------------------------------------------------ REST
+
+    def _rest_app(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        method = environ.get('REQUEST_METHOD', 'GET')
+        self._count(f"REST {method} {path}")
+        self.scenario.delay(self.scenario.rest_latency)
+
+        if path == '/api/v1/browse' and method == 'GET':
+            uri = parse_qs(environ.get('QUERY_STRING', '')).get('uri', [''])[0]
+            self.scenario.delay(self.scenario.browse_latency)
+            return self._json(start_response, {'navigation': self.navigation(uri)})
+
+        if path == '/api/v1/getState' and method == 'GET':
+            return self._json(start_response, self.current_state())
+
+        if path == '/api/v1/replaceAndPlay' and method == 'POST':
+            try:
+                length = int(environ.get('CONTENT_LENGTH') or 0)
+                payload = json.loads(environ['wsgi.input'].read(length) or b'{}')
+            except ValueError:
+                return self._json(start_response, {'error': 'invalid JSON'}, '400 Bad Request')
+            self.scenario.delay(self.scenario.latency)
+            self._replace_and_play(payload)
+            return self._json(start_response, {'response': 'success'})
+
+        return self._json(start_response, {'error': f"unknown endpoint {path}"}, '404 Not Found')
+
+    def _json(self, start_response, body, status='200 OK'):
+        payload = json.dumps(body).encode('utf-8')
+        start_response(status, [('Content-Type', 'application/json'), ('Content-Length', str(len(payload)))])
+        if not self.scenario.rest_bandwidth:
+            return [payload]
+        return self._throttled(payload, self.scenario.rest_bandwidth)
+
+    @staticmethod
+    def _throttled(payload, bandwidth, chunk_size=4096):
+        """Yield the body in chunks at `bandwidth` bytes per second, like a slow NAS or Wi-Fi link."""
+        for start in range(0, len(payload), chunk_size):
+            chunk = payload[start:start + chunk_size]
+            time.sleep(len(chunk) / bandwidth)
+            yield chunk
+
+
+def parse_sizes(values):
+    sizes = {}
+    for value in values or []:
+        prefix, _, count = value.rpartition('=')
+        sizes[prefix] = int(count)
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Volumio API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--scenario", help="JSON file with MockScenario settings; flags below override it.")
+    parser.add_argument("--latency", type=float, help="Delay before answering getState and commands.")
+    parser.add_argument("--browse-latency", type=float, help="Delay before browse replies.")
+    parser.add_argument("--rest-latency", type=float, help="Extra delay for REST requests.")
+    parser.add_argument("--rest-bandwidth", type=int, help="Bytes per second for REST response bodies.")
+    parser.add_argument("--jitter", type=float, help="Random extra delay up to this many seconds.")
+    parser.add_argument("--folder-size", type=int, help="Items per generated folder.")
+    parser.add_argument("--size", action="append", metavar="URI_PREFIX=N",
+                        help="Items for folders under a URI prefix, e.g. music-library/big=10000.")
+    parser.add_argument("--push-rate", type=float, help="pushState per second while playing.")
+    parser.add_argument("--play", action="store_true", help="Start in the playing state.")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    scenario = MockScenario.from_file(args.scenario) if args.scenario else MockScenario()
+    overrides = {
+        'latency': args.latency,
+        'browse_latency': args.browse_latency,
+        'rest_latency': args.rest_latency,
+        'rest_bandwidth': args.rest_bandwidth,
+        'jitter': args.jitter,
+        'default_folder_size': args.folder_size,
+        'push_rate': args.push_rate,
+    }
+    scenario.update(**{key: value for key, value in overrides.items() if value is not None})
+    scenario.folder_sizes.update(parse_sizes(args.size))
+
+    server = MockVolumioServer(args.host, args.port, scenario).start()
+    if args.play:
+        server.set_state(status='play', title='Mock Track', artist='Mock Artist', album='Mock Album')
+    try:
+        while True:
+            time.sleep(5)
+            logging.getLogger("MockVolumioServer").debug(f"MockVolumioServer: {server.stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# src/network/testing/transport_benchmark.py
+#
+# Compares the threaded and asyncio VolumioListener transports against a
+# running Volumio (or any server speaking its Socket.IO/REST API): connect
+# time, getState -> pushState round-trip latency, REST browse latency and the
+# number of threads each transport leaves running.
+#
+# Usage (from the src directory):
+#   python -m network.testing.transport_benchmark --host volumio.local --samples 200
+#   python -m network.testing.transport_benchmark --transport asyncio --browse-uri radio
+#   python -m network.testing.transport_benchmark --mock --browse-uri music-library
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+import threading
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import requests
+
+from network.volumio_listener import VolumioListener
+
+
+def build_listener(transport, host, port):
+    if transport == "asyncio":
+        from network.async_volumio_listener import AsyncVolumioListener
+        return AsyncVolumioListener(host=host, port=port)
+    return VolumioListener(host=host, port=port)
+
+
+def wait_connected(listener, timeout):
+    deadline = time.perf_counter() + timeout
+    while not listener.is_connected():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Timed out waiting for the Socket.IO connection.")
+        time.sleep(0.005)
+
+
+def measure_state_latency(listener, samples, timeout=2.0):
+    """Emit getState and time how long the resulting pushState takes to reach a receiver."""
+    received = threading.Event()
+
+    def on_state(sender, **kwargs):
+        received.set()
+
+    listener.state_changed.connect(on_state)
+    latencies = []
+    try:
+        for _ in range(samples):
+            received.clear()
+            t0 = time.perf_counter()
+            listener.socketIO.emit('getState')
+            if received.wait(timeout):
+                latencies.append(time.perf_counter() - t0)
+    finally:
+        listener.state_changed.disconnect(on_state)
+    return latencies
+
+
+def measure_browse_latency(listener, transport, host, port, uri, samples):
+    """Time REST browse calls the way each transport makes them."""
+    latencies = []
+    if transport == "asyncio":
+        for _ in range(samples):
+            t0 = time.perf_counter()
+            listener.rest.browse(uri).result(timeout=10)
+            latencies.append(time.perf_counter() - t0)
+    else:
+        session = requests.Session()
+        for _ in range(samples):
+            t0 = time.perf_counter()
+            session.get(f"http://{host}:{port}/api/v1/browse", params={"uri": uri}, timeout=10).raise_for_status()
+            latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def summarize(label, latencies):
+    if not latencies:
+        return f"{label}: no samples"
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{label}: n={len(ordered)} median {statistics.median(ordered) * 1e3:.2f} ms | "
+        f"p95 {p95 * 1e3:.2f} ms | max {ordered[-1] * 1e3:.2f} ms"
+    )
+
+
+def run(transport, args):
+    threads_before = threading.active_count()
+    t0 = time.perf_counter()
+    listener = build_listener(transport, args.host, args.port)
+    try:
+        wait_connected(listener, args.timeout)
+        connect_time = time.perf_counter() - t0
+        # Let the initial getState settle before sampling
+        time.sleep(0.5)
+        threads_running = threading.active_count() - threads_before
+
+        print(f"[{transport}] connected in {connect_time * 1e3:.1f} ms, {threads_running} extra threads")
+        print(f"[{transport}] " + summarize("getState->pushState", measure_state_latency(listener, args.samples)))
+        if args.browse_uri:
+            browse = measure_browse_latency(listener, transport, args.host, args.port, args.browse_uri, args.browse_samples)
+            print(f"[{transport}] " + summarize(f"REST browse '{args.browse_uri}'", browse))
+        print(f"[{transport}] threads after run: {threading.active_count() - threads_before} extra")
+    finally:
+        listener.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Volumio listener transports.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--transport", choices=["threaded", "asyncio", "all"], default="all")
+    parser.add_argument("--samples", type=int, default=100, help="getState round trips per transport.")
+    parser.add_argument("--browse-uri", help="Also time REST browse calls for this URI.")
+    parser.add_argument("--browse-samples", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for the connection.")
+    parser.add_argument("--mock", action="store_true", help="Run against an in-process mock Volumio on a free port.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    # The listener logs every push at INFO/DEBUG; keep that out of the timings.
+    logging.disable(logging.INFO)
+
+    mock = None
+    if args.mock:
+        from network.testing.mock_volumio import MockVolumioServer
+        mock = MockVolumioServer(host="127.0.0.1", port=0).start()
+        args.host, args.port = mock.host, mock.port
+
+    transports = ["threaded", "asyncio"] if args.transport == "all" else [args.transport]
+    try:
+        for transport in transports:
+            run(transport, args)
+    finally:
+        if mock:
+            mock.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
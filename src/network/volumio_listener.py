@@ -4,12 +4,76 @@ import socketio
 import logging
 import time
 import threading
+import itertools
+from collections import OrderedDict
+from concurrent.futures import Future
 from blinker import Signal
+from network.playback_state import PlaybackState, EMPTY_STATE
+from network.browse_cache import BrowseCache, STALE
+from network.browse_prefetcher import BrowsePrefetcher
+from network.connection_supervisor import ConnectionSupervisor
+from network.command_pipeline import CommandPipeline
+from network.control_coalescer import ControlCoalescer
+from network.optimistic_state import OptimisticState
+
+# pushState fields grouped by the change signal they feed. A push only fires the
+# signals whose fields actually differ from the previous state.
+STATE_CHANGE_GROUPS = {
+    'volume_changed': ('volume', 'mute', 'disableVolumeControl'),
+    'status_changed': ('status',),
+    'track_changed': ('title', 'artist', 'album', 'albumart', 'uri', 'service', 'trackType', 'duration', 'position'),
+    'format_changed': ('samplerate', 'bitdepth', 'bitrate', 'channels'),
+    'seek_changed': ('seek',),
+    'options_changed': ('random', 'repeat'),
+}
+
+# Seconds a browseLibrary request may wait for its pushBrowseLibrary reply
+BROWSE_TIMEOUT = 10
+
+
+class BrowseTimeoutError(Exception):
+    """Raised on a browse future when Volumio does not answer in time."""
+
+    def __init__(self, uri, timeout):
+        super().__init__(f"browseLibrary for '{uri}' timed out after {timeout}s")
+        self.uri = uri
+        self.timeout = timeout
+
+
+def _copy_outcome(source, target):
+    """Settle `target` like the finished `source`, unless it is settled already."""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class PendingBrowse:
+    """One outstanding browseLibrary request."""
+
+    __slots__ = ('request_id', 'uri', 'service', 'future', 'sent_at', 'timer', 'revalidating', 'silent')
+
+    def __init__(self, request_id, uri, service, revalidating=None, silent=False):
+        self.request_id = request_id
+        self.uri = uri
+        self.service = service
+        self.future = Future()
+        self.sent_at = None  # Set when the request goes on the wire
+        self.timer = None
+        self.revalidating = revalidating  # Stale navigation being refreshed, if any
+        self.silent = silent  # Prefetch: fill the cache without notifying the menus
+
 
 class VolumioListener:
-    def __init__(self, host='localhost', port=3000, reconnect_delay=5):
+    def __init__(self, host='localhost', port=3000, reconnect_delay=30, browse_cache=None, snapshot=None):
         """
-        Initialize the VolumioListener.
+        Initialize the VolumioListener. `reconnect_delay` caps the backoff
+        between reconnection attempts, in seconds. With a StateSnapshotStore as
+        `snapshot`, the last saved state is served until Volumio's first push.
         """
         self.logger = logging.getLogger("VolumioListener")
         self.logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs
@@ -18,14 +82,23 @@ class VolumioListener:
         self.host = host
         self.port = port
         self.reconnect_delay = reconnect_delay
-        self.socketIO = socketio.Client(logger=False, engineio_logger=False, reconnection=True)
+        self.socketIO = self.create_socketio_client()
 
         # Define Blinker signals
         self.connected = Signal('connected')
         self.disconnected = Signal('disconnected')
         self.state_changed = Signal('state_changed')
         self.track_changed = Signal('track_changed')
+
+        # Granular change signals, sent as (sender, changes=..., state=...) where
+        # `changes` holds only the fields of that group that differ from the last push
+        self.volume_changed = Signal('volume_changed')
+        self.status_changed = Signal('status_changed')
+        self.format_changed = Signal('format_changed')
+        self.seek_changed = Signal('seek_changed')
+        self.options_changed = Signal('options_changed')
         self.toast_message_received = Signal('toast_message_received')
+        self.queue_changed = Signal('queue_changed')
         self.navigation_received = Signal()
 
         # Navigation signals for managers
@@ -38,19 +111,60 @@ class VolumioListener:
         self.usb_library_navigation_received = Signal('usb_library_navigation_received')
 
         # Internal state
-        self.current_state = {}
+        self.current_state = EMPTY_STATE  # Immutable PlaybackState, replaced wholesale per push
+        self.state_received_at = time.monotonic()  # When current_state arrived; its seek is as of then
         self.state_lock = threading.Lock()
         self._running = True
-        self._reconnect_attempt = 1
 
-        # Tracking browseLibrary requests
+        # Saved state from the previous run; replaced (and diffed against) by the first live push
+        self.snapshot = snapshot
+        self.state_is_live = False
+        self.restored_mode = None
+        if self.snapshot is not None:
+            restored_state, self.restored_mode, saved_at = self.snapshot.load()
+            if restored_state:
+                self.current_state = restored_state
+                self.logger.info(f"[VolumioListener] Restored '{restored_state.status}' state from snapshot saved at {saved_at}.")
+
+        # The only thing that (re)connects the socket; see ConnectionSupervisor
+        self.supervisor = ConnectionSupervisor(self._connect_once, self.is_connected, max_delay=reconnect_delay)
+
+        # Outstanding browseLibrary requests, oldest first, keyed by request id.
+        # Replies carry no request id (and no URI), so only one is on the wire
+        # at a time and the rest wait here until it has been answered.
         self.browse_lock = threading.Lock()
-        self.last_browse_service = None
-        self.last_browse_uri = None
+        self.pending_browses = OrderedDict()
+        self._browse_in_flight = None  # request id of the one sent
+        self._browse_ids = itertools.count(1)
+
+        # Navigation shared by every menu manager, so revisited menus render instantly
+        self.browse_cache = browse_cache or BrowseCache()
+        self.prefetcher = BrowsePrefetcher(self.prefetch, self.browse_cache)
+
+        # Multi-step playback commands, settled by the state they are expected to produce
+        self.commands = CommandPipeline(self)
+
+        # Rotary volume: detents accumulate into absolute values sent at most every 50 ms
+        self.volume_control = ControlCoalescer(
+            self.set_volume, lambda: self.get_current_state().volume, bounds=(0, 100), name="volume"
+        )
+        # Rotary scrubbing: the same coalescing, bounded by the duration of the current track
+        self.seek_control = ControlCoalescer(
+            self.seek_to, self.playback_position,
+            bounds=lambda: (0, max(0, self.get_current_state().duration)), name="seek"
+        )
+
+        # User intents shown before Volumio confirms them; screens draw through optimistic.apply()
+        self.optimistic = OptimisticState(self)
 
         self.register_socketio_events()
         self.connect()
 
+    def create_socketio_client(self):
+        """Create the Socket.IO client; transports override this."""
+        # Reconnection belongs to the supervisor; a second reconnect loop inside the client would race it
+        return socketio.Client(logger=False, engineio_logger=False, reconnection=False)
+
     def register_socketio_events(self):
         """Register events to listen to from the SocketIO server."""
         self.logger.info("[VolumioListener] Registering SocketIO events...")
@@ -60,6 +174,7 @@ class VolumioListener:
         self.socketIO.on('pushBrowseLibrary', self.on_push_browse_library)
         self.socketIO.on('pushTrack', self.on_push_track)
         self.socketIO.on('pushToastMessage', self.on_push_toast_message)
+        self.socketIO.on('pushQueue', self.on_push_queue)
         self.socketIO.on('volume', self.set_volume)
     
     def set_volume(self, value):
@@ -74,6 +189,62 @@ class VolumioListener:
         else:
             self.logger.warning(f"[VolumioListener] Invalid volume value: {value}")
 
+    def change_volume(self, delta):
+        """Nudge the volume by `delta`; shown at once, sent coalesced."""
+        target = self.volume_control.nudge(delta)
+        self.optimistic.predict('volume', target)
+        return target
+
+    def seek_to(self, seconds):
+        """Seek the current track to an absolute position in seconds."""
+        self.logger.info(f"[VolumioListener] Seeking to {seconds}s")
+        self.socketIO.emit('seek', int(seconds))
+
+    def change_seek(self, delta):
+        """Move the playback position by `delta` seconds; returns the target, sent coalesced."""
+        return self.seek_control.nudge(delta)
+
+    def playback_position(self):
+        """Seconds into the current track, advanced from the last push while playing."""
+        with self.state_lock:
+            state, received_at = self.current_state, self.state_received_at
+        position = state.seek_seconds
+        if state.status == 'play':
+            position += time.monotonic() - received_at
+        if state.duration:
+            position = min(position, state.duration)
+        return int(position)
+
+    def toggle_play_pause(self):
+        """Toggle playback, showing the expected status before Volumio confirms it."""
+        state = self.optimistic.apply(self.get_current_state())
+        self.socketIO.emit('toggle', {})
+        if state.status != 'play':
+            self.optimistic.predict('status', 'play')
+        elif 'webradio' in (state.service, state.track_type):
+            # Volumio stops a stream rather than pausing it
+            self.optimistic.predict('status', 'stop')
+        else:
+            self.optimistic.predict('status', 'pause')
+
+    def play(self):
+        self.socketIO.emit('play')
+        self.optimistic.predict('status', 'play')
+
+    def pause(self):
+        self.socketIO.emit('pause')
+        self.optimistic.predict('status', 'pause')
+
+    def toggle_repeat(self):
+        repeat = bool(self.optimistic.apply(self.get_current_state()).repeat)
+        self.socketIO.emit('repeat')
+        self.optimistic.predict('repeat', not repeat)
+
+    def toggle_random(self):
+        random = bool(self.optimistic.apply(self.get_current_state()).random)
+        self.socketIO.emit('random')
+        self.optimistic.predict('random', not random)
+
     def increase_volume(self):
         """Increase the volume by emitting '+'."""
         self.set_volume('+')
@@ -100,55 +271,84 @@ class VolumioListener:
         else:
             self.logger.warning("[VolumioListener] Received empty toast message.")
 
+    def on_push_queue(self, data):
+        """Handle 'pushQueue' events."""
+        self.logger.debug(f"[VolumioListener] Received pushQueue event with {len(data or [])} items.")
+        self.queue_changed.send(self, queue=data or [])
+
     def connect(self):
-        """Connect to the Volumio server."""
-        if self.socketIO.connected:
-            self.logger.info("[VolumioListener] Already connected.")
-            return
-        try:
-            self.logger.info(f"[VolumioListener] Connecting to Volumio at {self.host}:{self.port}...")
-            self.socketIO.connect(f"http://{self.host}:{self.port}")
-            self.logger.info("[VolumioListener] Successfully connected.")
-        except Exception as e:
-            self.logger.error(f"[VolumioListener] Connection error: {e}")
-            self.schedule_reconnect()
+        """Start the supervisor, which connects in the background and keeps reconnecting."""
+        self.supervisor.start()
+
+    def _connect_once(self, transports):
+        """One blocking connection attempt, made from the supervisor thread."""
+        self.logger.info(f"[VolumioListener] Connecting to Volumio at {self.host}:{self.port} via {'+'.join(transports)}...")
+        self.socketIO.connect(f"http://{self.host}:{self.port}", transports=transports)
 
     def on_connect(self):
         """Handle successful connection."""
-        self.connected.send(self)
         self.logger.info("[VolumioListener] Connected to Volumio.")
-        self._reconnect_attempt = 1  # Reset reconnect attempts
+        # Resync at once: the state may have moved on while we were away, and the
+        # menus should revalidate what they show instead of trusting the cache
         self.socketIO.emit('getState')
+        self.browse_cache.mark_stale()
+        self.connected.send(self)
 
     def is_connected(self):
         """Check if the client is connected to Volumio."""
         return self.socketIO.connected
 
     def on_disconnect(self):
-        """Handle disconnection."""
-        self.disconnected.send(self)
+        """Handle disconnection. current_state is kept, so screens go on showing the last known state."""
         self.logger.warning("[VolumioListener] Disconnected from Volumio.")
-        self.schedule_reconnect()
-
-    def schedule_reconnect(self):
-        """Schedule a reconnection attempt."""
-        delay = min(self.reconnect_delay * self._reconnect_attempt, 60)
-        self.logger.info(f"[VolumioListener] Reconnecting in {delay} seconds...")
-        threading.Thread(target=self._reconnect_after_delay, args=(delay,), daemon=True).start()
+        self._fail_pending_browses(ConnectionError("Disconnected from Volumio"))
+        if self._running:
+            self.supervisor.connection_lost()
+        self.disconnected.send(self)
 
-    def _reconnect_after_delay(self, delay):
-        """Reconnect after a specified delay."""
-        time.sleep(delay)
-        if not self.socketIO.connected and self._running:
-            self._reconnect_attempt += 1
-            self.connect()
+    def get_connection_stats(self):
+        """Reconnect counters and time-to-reconnect figures from the supervisor."""
+        return self.supervisor.stats()
 
     def on_push_state(self, data):
         """Handle playback state changes."""
         self.logger.info("[VolumioListener] Received pushState event.")
+        # Parse once here; every receiver shares this same immutable object
+        state = PlaybackState(data)
         with self.state_lock:
-            self.current_state = data  # Store the current state
-        self.state_changed.send(self, state=data)  # Emit the signal with sender and state
+            previous_state = self.current_state
+            self.current_state = state
+            self.state_received_at = time.monotonic()
+            self.state_is_live = True
+        self.optimistic.observe(state)
+        if self.snapshot is not None:
+            self.snapshot.update(state=state)
+        self.state_changed.send(self, state=state)  # Emit the signal with sender and state
+
+        changes = self.diff_state(previous_state, data)
+        if not changes:
+            self.logger.debug("[VolumioListener] pushState carried no field changes.")
+            return
+        self.logger.debug(f"[VolumioListener] Changed groups: {list(changes.keys())}")
+        for signal_name, changed_fields in changes.items():
+            getattr(self, signal_name).send(self, changes=changed_fields, state=state)
+
+    @staticmethod
+    def diff_state(previous, current):
+        """
+        Compare two pushState payloads field by field.
+        Returns {signal_name: {field: new_value}} for every group with at least one change.
+        """
+        changes = {}
+        for signal_name, fields in STATE_CHANGE_GROUPS.items():
+            changed_fields = {
+                field: current.get(field)
+                for field in fields
+                if current.get(field) != previous.get(field)
+            }
+            if changed_fields:
+                changes[signal_name] = changed_fields
+        return changes
 
 
     def on_push_browse_library(self, data):
@@ -159,14 +359,29 @@ class VolumioListener:
             self.logger.warning("[VolumioListener] No navigation data received.")
             return
 
-        with self.browse_lock:
-            service = self.last_browse_service
-            uri = self.last_browse_uri
-            # Reset the tracking after using
-            self.last_browse_service = None
-            self.last_browse_uri = None
-
-        self.logger.debug(f"[VolumioListener] Using URI: {uri}, Service: {service}")
+        pending = self._match_browse_request(navigation, data)
+        if pending:
+            request_id, service, uri = pending.request_id, pending.service, pending.uri
+            self.logger.debug(
+                f"[VolumioListener] Matched browse #{request_id} for URI: {uri}, Service: {service} "
+                f"in {(time.monotonic() - pending.sent_at) * 1000:.0f} ms"
+            )
+        else:
+            request_id, service, uri = None, None, None
+
+        if pending:
+            self.browse_cache.put(uri, navigation, service)
+            if pending.silent:
+                self.logger.debug(f"[VolumioListener] Prefetched '{uri}' into the browse cache.")
+                if not pending.future.done():
+                    pending.future.set_result(navigation)
+                return
+            if pending.revalidating is not None and pending.revalidating == navigation:
+                # Background refresh of a stale entry that turned out unchanged; nothing to redraw
+                self.logger.debug(f"[VolumioListener] Revalidated '{uri}', listing unchanged.")
+                if not pending.future.done():
+                    pending.future.set_result(navigation)
+                return
 
         if not service or not uri:
             # If service or uri was not tracked, attempt to infer
@@ -178,7 +393,69 @@ class VolumioListener:
             self.logger.debug(f"[VolumioListener] Inferred Service: {service}")
 
         # Emit a generic navigation_received signal with service and uri
-        self.navigation_received.send(self, navigation=navigation, service=service, uri=uri)
+        self.navigation_received.send(self, navigation=navigation, service=service, uri=uri, request_id=request_id)
+
+        if pending and not pending.future.done():
+            pending.future.set_result(navigation)
+
+    def _match_browse_request(self, navigation, data):
+        """
+        Pair a pushBrowseLibrary reply with the request that caused it: the one
+        on the wire, since requests are sent one at a time. A reply that names
+        a different URI is not ours (e.g. a late answer to an expired request).
+        The next queued request is sent once this one is answered.
+        """
+        response_uri = (navigation.get('uri') or data.get('uri') or '').strip()
+        with self.browse_lock:
+            pending = self.pending_browses.get(self._browse_in_flight)
+            if pending is None:
+                return None
+            if response_uri and pending.uri.strip().lower() != response_uri.lower():
+                self.logger.debug(f"[VolumioListener] Reply for '{response_uri}' does not match browse #{pending.request_id}.")
+                return None
+            del self.pending_browses[pending.request_id]
+            self._browse_in_flight = None
+        if pending.timer:
+            pending.timer.cancel()
+        self._send_next_browse()
+        return pending
+
+    def _send_next_browse(self):
+        """Put the next queued browse on the wire if none is; user requests go before prefetches."""
+        with self.browse_lock:
+            if self._browse_in_flight is not None:
+                return
+            waiting = [pending for pending in self.pending_browses.values() if pending.sent_at is None]
+            if not waiting:
+                return
+            pending = next((p for p in waiting if not p.silent), waiting[0])
+            pending.sent_at = time.monotonic()
+            self._browse_in_flight = pending.request_id
+        self.socketIO.emit("browseLibrary", {"uri": pending.uri})
+        self.logger.debug(f"[VolumioListener] Emitted 'browseLibrary' #{pending.request_id} for URI: {pending.uri}")
+
+    def _expire_browse(self, request_id):
+        """Fail a browse request whose reply did not arrive within its timeout."""
+        with self.browse_lock:
+            pending = self.pending_browses.pop(request_id, None)
+            if self._browse_in_flight == request_id:
+                self._browse_in_flight = None
+        if pending and not pending.future.done():
+            self.logger.warning(f"[VolumioListener] browseLibrary #{request_id} for '{pending.uri}' timed out.")
+            pending.future.set_exception(BrowseTimeoutError(pending.uri, pending.timer.interval))
+        self._send_next_browse()
+
+    def _fail_pending_browses(self, error):
+        """Fail every outstanding browse request, e.g. when the connection drops."""
+        with self.browse_lock:
+            pending_browses = list(self.pending_browses.values())
+            self.pending_browses.clear()
+            self._browse_in_flight = None
+        for pending in pending_browses:
+            if pending.timer:
+                pending.timer.cancel()
+            if not pending.future.done():
+                pending.future.set_exception(error)
 
 
 
@@ -186,7 +463,7 @@ class VolumioListener:
         """Handle 'pushTrack' events."""
         self.logger.info("[VolumioListener] Received pushTrack event.")
         track_info = self.extract_track_info(data)
-        self.track_changed.send(self, track_info=track_info)
+        self.track_changed.send(self, changes=track_info, state=self.get_current_state())
 
     def extract_track_info(self, data):
         """Extract track info."""
@@ -199,26 +476,114 @@ class VolumioListener:
         }
 
     def get_current_state(self):
+        """
+        Return the latest PlaybackState. It is immutable, so callers share it
+        by reference instead of receiving a copy.
+        """
         with self.state_lock:
-            return self.current_state.copy()  # Return a copy to prevent external modifications
+            return self.current_state
 
     def stop(self):
         """Stop the VolumioListener."""
         self._running = False
+        self.supervisor.stop()
+        if self.snapshot is not None:
+            self.snapshot.flush()
         self.socketIO.disconnect()
         self.logger.info("[VolumioListener] Listener stopped.")
 
-    def fetch_browse_library(self, uri):
-        if self.socketIO.connected:
-            service = self.get_service_from_uri(uri)
-            with self.browse_lock:
-                self.last_browse_service = service
-                self.last_browse_uri = uri
-                self.logger.debug(f"[VolumioListener] Tracking browseLibrary URI: {uri}, Service: {service}")
-            self.socketIO.emit("browseLibrary", {"uri": uri})
-            self.logger.debug(f"[VolumioListener] Emitted 'browseLibrary' for URI: {uri}")
-        else:
+    def browse(self, uri, timeout=BROWSE_TIMEOUT, use_cache=True):
+        """
+        Request `uri` from Volumio and return a Future resolved with its navigation.
+        Several requests may be in flight at once; the future fails with
+        BrowseTimeoutError after `timeout` seconds or ConnectionError on disconnect.
+
+        Cached listings are delivered through navigation_received straight away;
+        a stale one is also refreshed in the background and re-sent if it changed.
+        """
+        if use_cache:
+            navigation, freshness = self.browse_cache.get(uri)
+            if navigation is not None:
+                service = self.get_service_from_uri(uri)
+                self.logger.debug(f"[VolumioListener] Browse cache {freshness} hit for URI: {uri}")
+                self.navigation_received.send(self, navigation=navigation, service=service, uri=uri, request_id=None)
+                if freshness == STALE and self.socketIO.connected:
+                    self._request_browse(uri, timeout, revalidating=navigation)
+                future = Future()
+                future.set_result(navigation)
+                return future
+        return self._request_browse(uri, timeout)
+
+    def prefetch(self, uri, timeout=BROWSE_TIMEOUT):
+        """
+        Low-priority browse used by the prefetcher: the reply only fills the cache.
+        Returns None instead of competing with user-initiated requests in flight,
+        or when the prefetcher's limit of outstanding prefetches is reached.
+        Cancelling the future withdraws the request if it has not been sent yet.
+        """
+        if not self.socketIO.connected:
+            return None
+        with self.browse_lock:
+            if any(not pending.silent for pending in self.pending_browses.values()):
+                return None
+            if sum(1 for pending in self.pending_browses.values() if pending.silent) >= self.prefetcher.max_concurrent:
+                return None
+        future = self._request_browse(uri, timeout, silent=True)
+        future.add_done_callback(self._withdraw_cancelled_browse)
+        return future
+
+    def _withdraw_cancelled_browse(self, future):
+        """Drop a cancelled request that is still queued; one already sent stays to consume its reply."""
+        if not future.cancelled():
+            return
+        with self.browse_lock:
+            for request_id, pending in self.pending_browses.items():
+                if pending.future is future and pending.silent and pending.sent_at is None:
+                    del self.pending_browses[request_id]
+                    break
+            else:
+                return
+        pending.timer.cancel()
+        self.logger.debug(f"[VolumioListener] Withdrew cancelled browse #{pending.request_id} for URI: {pending.uri}")
+
+    def _request_browse(self, uri, timeout, revalidating=None, silent=False):
+        """Queue browseLibrary for `uri` and track it until its reply, timeout or disconnect."""
+        if not self.socketIO.connected:
             self.logger.warning("[VolumioListener] Cannot emit 'browseLibrary' - not connected to Volumio.")
+            future = Future()
+            future.set_exception(ConnectionError("Not connected to Volumio"))
+            return future
+
+        with self.browse_lock:
+            for pending in self.pending_browses.values():
+                if pending.uri == uri and pending.silent:
+                    # Already being prefetched; promote it instead of asking twice
+                    if not silent:
+                        # The user gets a future of their own: the prefetcher may still cancel its one
+                        prefetch_future, pending.future = pending.future, Future()
+                        pending.silent = False
+                        pending.future.add_done_callback(lambda done, target=prefetch_future: _copy_outcome(done, target))
+                        self.logger.debug(f"[VolumioListener] Promoted prefetch #{pending.request_id} for URI: {uri}")
+                    return pending.future
+
+        pending = PendingBrowse(next(self._browse_ids), uri, self.get_service_from_uri(uri), revalidating, silent)
+        pending.timer = threading.Timer(timeout, self._expire_browse, args=(pending.request_id,))
+        pending.timer.daemon = True
+        with self.browse_lock:
+            self.pending_browses[pending.request_id] = pending
+        pending.timer.start()
+
+        self.logger.debug(f"[VolumioListener] Tracking browse #{pending.request_id} URI: {uri}, Service: {pending.service}")
+        self._send_next_browse()
+        return pending.future
+
+    def fetch_browse_library(self, uri):
+        """Fire-and-forget browse; the reply arrives via navigation_received."""
+        return self.browse(uri)
+
+    def get_browse_cache_stats(self):
+        """Hit/miss counters of the shared browse cache."""
+        return self.browse_cache.stats()
 
     def get_service_from_uri(self, uri):
         self.logger.debug(f"Determining service for URI: {uri}")